@@ -0,0 +1 @@
+# Servidor local que imita SalesYs y benchmark de throughput de los scrapers
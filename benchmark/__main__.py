@@ -0,0 +1,5 @@
+import sys
+
+from benchmark.throughput import ejecutar_benchmark
+
+sys.exit(ejecutar_benchmark())
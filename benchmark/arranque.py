@@ -0,0 +1,93 @@
+# ====================================
+# BENCHMARK DE ARRANQUE DE LA CLI
+# ====================================
+# Mide en procesos nuevos cuánto tarda 'import main' y 'python main.py --help'
+# (mediana de varias corridas) y lista los módulos más caros según
+# 'python -X importtime'. Sale con código 1 si se supera el límite: sirve
+# para detectar en CI que alguien volvió a importar Selenium o config.settings
+# al cargar main.py.
+#
+# Uso:
+#   python -m benchmark.arranque
+#   python -m benchmark.arranque --corridas 10 --limite 0.2
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+
+# Módulos que main.py no debe cargar al importarse
+MODULOS_PROHIBIDOS = ("selenium", "config.settings", "scrapers.sites", "sqlalchemy", "pyarrow")
+
+
+def _parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempo de arranque de la CLI (main.py)")
+    parser.add_argument("--corridas", type=int, default=5, help="Corridas por medición (default: 5)")
+    parser.add_argument("--limite", type=float, default=0.3,
+                        help="Segundos máximos de 'main.py --help' (mediana, default: 0.3)")
+    parser.add_argument("--top", type=int, default=10, help="Módulos más caros a listar (default: 10)")
+    return parser.parse_args(argv)
+
+
+def _medir(comando, corridas):
+    """Mediana del tiempo de pared de 'comando' en procesos nuevos."""
+    tiempos = []
+    for _ in range(corridas):
+        inicio = time.perf_counter()
+        subprocess.run(comando, cwd=BASE_DIR, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def _modulos_mas_caros(top):
+    """(microsegundos acumulados, módulo) de 'import main' según -X importtime."""
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BASE_DIR, check=True, capture_output=True, text=True,
+    ).stderr
+    filas = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, modulo = linea.split("|", 2)
+        if acumulado.strip().isdigit():
+            filas.append((int(acumulado), modulo.strip()))
+    return sorted(filas, reverse=True)[:top]
+
+
+def ejecutar_arranque(argv=None):
+    args = _parsear_argumentos(argv)
+
+    base = _medir([sys.executable, "-c", "pass"], args.corridas)
+    importar = _medir([sys.executable, "-c", "import main"], args.corridas)
+    ayuda = _medir([sys.executable, "main.py", "--help"], args.corridas)
+
+    cargados = subprocess.run(
+        [sys.executable, "-c", "import sys, main; print('\\n'.join(sys.modules))"],
+        cwd=BASE_DIR, check=True, capture_output=True, text=True,
+    ).stdout.split()
+    prohibidos = sorted(m for m in cargados if m.startswith(MODULOS_PROHIBIDOS))
+
+    print("=" * 60)
+    print("ARRANQUE DE LA CLI")
+    print("=" * 60)
+    print(f"  python -c pass       {base * 1000:8.0f} ms  (intérprete solo)")
+    print(f"  import main          {importar * 1000:8.0f} ms")
+    print(f"  main.py --help       {ayuda * 1000:8.0f} ms  (límite {args.limite * 1000:.0f} ms)")
+    print(f"\n  Módulos más caros de 'import main':")
+    for microsegundos, modulo in _modulos_mas_caros(args.top):
+        print(f"    {microsegundos / 1000:8.1f} ms  {modulo}")
+
+    if prohibidos:
+        print(f"\n  ✗ 'import main' carga módulos pesados: {prohibidos}")
+    if ayuda > args.limite:
+        print(f"\n  ✗ 'main.py --help' supera el límite")
+    return 1 if prohibidos or ayuda > args.limite else 0
+
+
+if __name__ == "__main__":
+    sys.exit(ejecutar_arranque())
@@ -0,0 +1,530 @@
+# ====================================
+# SERVIDOR LOCAL QUE IMITA SALESYS
+# ====================================
+# Reproduce solo las páginas de las que depende el código:
+#   - Login en dos pasos (extension/deviceName → slt-userName/slt-userPass)
+#   - Formularios de reportes (campos de fecha, Chosen 'product_chosen', select 'usuario')
+#   - Pestaña de resultados con link '.download' y CSV de tamaño/latencia configurables
+#   - Variantes "no data": alert de JS, popup #MGSJE y texto en el body
+# Los formularios se generan a partir de routes.yaml, así que cualquier
+# reporte configurado queda disponible en la misma ruta que en el sitio real.
+#
+# Uso manual:
+#   python -m benchmark.servidor_salesys --puerto 8765 --filas 2000 --latencia 0.5
+
+import argparse
+import hashlib
+import html
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, quote
+
+RUTA_LOGIN = "/SaleSys/index.php/login"
+RUTA_DISPOSITIVO = "/SaleSys/index.php/login/dispositivo"
+RUTA_USUARIO = "/SaleSys/index.php/login/usuario"
+RUTA_INICIO = "/SaleSys/index.php/home"
+RUTA_CONSULTA = "/SaleSys/bench/consulta"
+RUTA_RESULTADOS = "/SaleSys/bench/resultados"
+RUTA_DESCARGA = "/SaleSys/bench/descargar"
+PREFIJO_RECURSOS = "/SaleSys/assets/"
+
+COOKIE_SESION = "ci_session"
+TEXTO_SIN_DATOS = "No data found for the selected parameters"
+VARIANTES_SIN_DATOS = ("alerta", "popup", "body")
+
+
+class EscenarioSalesys:
+    """
+    Parámetros de comportamiento del servidor.
+
+    Args:
+        filas_por_dia: Filas del CSV por cada día del rango consultado
+        latencia: Segundos de espera antes de responder resultados y descargas
+        latencia_recursos: Segundos de espera de CSS/JS/imágenes (para medir el modo lean)
+        tasa_sin_datos: Fracción (0-1) de consultas que responden "no data"
+        variantes_sin_datos: Variantes a usar para "no data" (alerta, popup, body)
+        duracion_sesion: Segundos de validez de la cookie de sesión (None = sin vencimiento)
+        semilla: Semilla para decidir qué consultas no tienen datos (determinista)
+    """
+
+    def __init__(self, filas_por_dia=500, latencia=0.0, latencia_recursos=0.0, tasa_sin_datos=0.0,
+                 variantes_sin_datos=VARIANTES_SIN_DATOS, duracion_sesion=None, semilla=0):
+        self.filas_por_dia = filas_por_dia
+        self.latencia = latencia
+        self.latencia_recursos = latencia_recursos
+        self.tasa_sin_datos = tasa_sin_datos
+        self.variantes_sin_datos = tuple(variantes_sin_datos)
+        self.duracion_sesion = duracion_sesion
+        self.semilla = semilla
+
+    def variante_sin_datos(self, clave_consulta):
+        """Variante "no data" de la consulta, o None si tiene datos (misma consulta → misma respuesta)."""
+        if self.tasa_sin_datos <= 0 or not self.variantes_sin_datos:
+            return None
+        digest = hashlib.sha256(f"{self.semilla}|{clave_consulta}".encode()).digest()
+        fraccion = int.from_bytes(digest[:4], "big") / 2 ** 32
+        if fraccion >= self.tasa_sin_datos:
+            return None
+        return self.variantes_sin_datos[digest[4] % len(self.variantes_sin_datos)]
+
+
+def formularios_desde_routes(routes):
+    """
+    Traduce routes.yaml a la definición de formularios del servidor.
+
+    Returns:
+        Dict {ruta con query: {reporte, date_fields, desplegable, opciones}}
+    """
+    formularios = {}
+    for reporte, config in (routes or {}).items():
+        if not isinstance(config, dict) or not config.get('form_url'):
+            continue
+        partes = urlsplit(config['form_url'])
+        ruta = partes.path + (f"?{partes.query}" if partes.query else "")
+        opciones = list(config.get('usuarios') or config.get('archivos', {}).keys())
+        formularios[ruta] = {
+            'reporte': reporte,
+            'date_fields': tuple(config.get('date_fields', ('from', 'to'))),
+            'desplegable': config.get('desplegable'),
+            'opciones': opciones,
+        }
+    return formularios
+
+
+# ====================================
+# PLANTILLAS HTML
+# ====================================
+
+_RECURSOS = f"""
+    <link rel="stylesheet" href="{PREFIJO_RECURSOS}estilos.css">
+    <script src="{PREFIJO_RECURSOS}analytics.js"></script>
+"""
+
+_PAGINA = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>SaleSys</title>{recursos}</head>
+<body>
+<img src="{prefijo}logo.png" alt="SaleSys">
+{cuerpo}
+</body></html>"""
+
+_LOGIN_DISPOSITIVO = f"""
+<form method="post" action="{RUTA_DISPOSITIVO}">
+  <input type="text" id="extension" name="extension">
+  <input type="text" id="deviceName" name="deviceName">
+  <input type="submit" id="submitButton" value="Continuar">
+</form>"""
+
+_LOGIN_USUARIO = f"""
+<form method="post" action="{RUTA_USUARIO}">
+  <input type="text" id="slt-userName" name="userName">
+  <input type="password" id="slt-userPass" name="userPass">
+  <input type="submit" value="Ingresar">
+</form>"""
+
+# Consulta síncrona antes de enviar: permite responder "no data" con alert/popup
+# sin abrir la pestaña de resultados, igual que el sitio real.
+_JS_FORMULARIO = """
+<script>
+function enviarReporte(form) {
+    var previo = document.getElementById('MGSJE');
+    if (previo) { previo.parentNode.removeChild(previo); }
+    var xhr = new XMLHttpRequest();
+    xhr.open('POST', form.getAttribute('data-consulta'), false);
+    xhr.setRequestHeader('Content-Type', 'application/x-www-form-urlencoded');
+    xhr.send(new URLSearchParams(new FormData(form)).toString());
+    var respuesta = JSON.parse(xhr.responseText);
+    if (respuesta.variante === 'alerta') {
+        setTimeout(function () { alert(respuesta.mensaje); }, 0);
+        return false;
+    }
+    if (respuesta.variante === 'popup') {
+        var popup = document.createElement('div');
+        popup.id = 'MGSJE';
+        popup.textContent = respuesta.mensaje;
+        document.body.appendChild(popup);
+        return false;
+    }
+    return true;
+}
+function mostrarCalendario() {
+    document.getElementById('calendario').style.display = 'block';
+}
+function abrirChosen(id) {
+    var drop = document.querySelector('#' + id + ' .chosen-drop');
+    drop.style.display = drop.style.display === 'block' ? 'none' : 'block';
+}
+function elegirChosen(id, indice, texto) {
+    var select = document.getElementById(id.replace(/_chosen$/, ''));
+    select.selectedIndex = indice;
+    document.querySelector('#' + id + ' .chosen-single span').textContent = texto;
+    document.querySelector('#' + id + ' .chosen-drop').style.display = 'none';
+}
+</script>"""
+
+
+def _html_desplegable(desplegable, opciones):
+    """Select estándar o Chosen (select oculto + contenedor '<id>_chosen')."""
+    if not desplegable:
+        return ""
+    desplegable_id = desplegable.get('id', '')
+    select_id = desplegable_id[:-len('_chosen')] if desplegable_id.endswith('_chosen') else desplegable_id
+    items = "".join(
+        f'<option value="{html.escape(o)}">{html.escape(o)}</option>' for o in opciones
+    )
+
+    if desplegable.get('tipo') != 'chosen':
+        return f'<select id="{select_id}" name="{select_id}">{items}</select>'
+
+    lis = "".join(
+        f'<li class="active-result" onclick="elegirChosen(\'{desplegable_id}\', {i}, this.textContent)">'
+        f'{html.escape(o)}</li>'
+        for i, o in enumerate(opciones)
+    )
+    primera = html.escape(opciones[0]) if opciones else ""
+    return f"""
+  <select id="{select_id}" name="{select_id}" style="display:none">{items}</select>
+  <div id="{desplegable_id}" class="chosen-container" onclick="if (event.target === this || this.querySelector('.chosen-single').contains(event.target)) abrirChosen('{desplegable_id}')">
+    <a class="chosen-single"><span>{primera}</span></a>
+    <div class="chosen-drop" style="display:none"><ul class="chosen-results">{lis}</ul></div>
+  </div>"""
+
+
+def _html_formulario(ruta, definicion):
+    from_id, to_id = definicion['date_fields']
+    reporte = quote(ruta, safe='')
+    return f"""
+<form method="post" action="{RUTA_RESULTADOS}?reporte={reporte}" target="_blank"
+      data-consulta="{RUTA_CONSULTA}?reporte={reporte}" onsubmit="return enviarReporte(this)">
+  <input type="text" id="{from_id}" name="{from_id}" onfocus="mostrarCalendario()">
+  <input type="text" id="{to_id}" name="{to_id}" onfocus="mostrarCalendario()">
+  {_html_desplegable(definicion['desplegable'], definicion['opciones'])}
+  <input type="submit" id="subreport" value="Generar reporte">
+</form>
+<div id="calendario" class="ui-datepicker" style="display:none">calendario</div>
+{_JS_FORMULARIO}"""
+
+
+# ====================================
+# GENERACIÓN DE CSV
+# ====================================
+
+def _parsear_fecha_sistema(valor):
+    return datetime.strptime(valor.strip(), "%Y/%m/%d")
+
+
+def generar_csv(fecha_desde, fecha_hasta, filas_por_dia, valor=None, semilla=0) -> bytes:
+    """CSV con columna 'Fecha' (dd/mm/YYYY) y 'filas_por_dia' filas por día del rango."""
+    aleatorio = random.Random(f"{semilla}|{fecha_desde}|{fecha_hasta}|{valor}")
+    estados = ("ACTIVO", "PENDIENTE", "RECHAZADO", "ENTREGADO")
+    lineas = ["Fecha,Hora,Agente,Producto,Estado,Valor"]
+
+    dia = fecha_desde
+    while dia <= fecha_hasta:
+        fecha_txt = dia.strftime("%d/%m/%Y")
+        for _ in range(filas_por_dia):
+            lineas.append(
+                f"{fecha_txt},{aleatorio.randint(0, 23):02d}:{aleatorio.randint(0, 59):02d},"
+                f"AG{aleatorio.randint(1, 400):04d},{valor or 'GENERAL'},"
+                f"{aleatorio.choice(estados)},{aleatorio.randint(1000, 99999)}"
+            )
+        dia += timedelta(days=1)
+    return ("\r\n".join(lineas) + "\r\n").encode("utf-8")
+
+
+# ====================================
+# SERVIDOR
+# ====================================
+
+class _ManejadorSalesys(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SaleSysLocal/1.0"
+
+    # -- utilidades --------------------------------------------------------
+
+    def log_message(self, formato, *args):
+        pass  # Silencioso: el benchmark mide, no loguea cada request
+
+    @property
+    def estado(self):
+        return self.server.estado
+
+    def _leer_formulario(self):
+        largo = int(self.headers.get('Content-Length') or 0)
+        cuerpo = self.rfile.read(largo).decode('utf-8') if largo else ''
+        return {k: v[-1] for k, v in parse_qs(cuerpo, keep_blank_values=True).items()}
+
+    def _responder(self, cuerpo, codigo=200, tipo="text/html; charset=utf-8", cabeceras=None):
+        datos = cuerpo.encode('utf-8') if isinstance(cuerpo, str) else cuerpo
+        self.send_response(codigo)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(datos)))
+        for nombre, valor in (cabeceras or {}).items():
+            self.send_header(nombre, valor)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(datos)
+
+    def _pagina(self, cuerpo, **kwargs):
+        self._responder(_PAGINA.format(recursos=_RECURSOS, prefijo=PREFIJO_RECURSOS, cuerpo=cuerpo), **kwargs)
+
+    def _redirigir(self, ruta, cabeceras=None):
+        self._responder("", codigo=302, cabeceras={"Location": ruta, **(cabeceras or {})})
+
+    def _sesion_valida(self) -> bool:
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        token = cookie[COOKIE_SESION].value if COOKIE_SESION in cookie else None
+        return self.estado.sesion_valida(token)
+
+    # -- rutas -------------------------------------------------------------
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        partes = urlsplit(self.path)
+        ruta_completa = partes.path + (f"?{partes.query}" if partes.query else "")
+
+        if partes.path.startswith(PREFIJO_RECURSOS):
+            return self._recurso(partes.path)
+        if partes.path == RUTA_LOGIN:
+            return self._pagina(_LOGIN_DISPOSITIVO)
+        if not self._sesion_valida():
+            # Igual que el sitio real: sin sesión se recibe el formulario de login
+            return self._pagina(_LOGIN_USUARIO)
+        if partes.path == RUTA_INICIO:
+            return self._pagina("<h1>Bienvenido a SaleSys</h1>")
+        if partes.path == RUTA_DESCARGA:
+            return self._descarga(parse_qs(partes.query).get('token', [''])[0])
+        if ruta_completa in self.server.formularios:
+            return self._pagina(_html_formulario(ruta_completa, self.server.formularios[ruta_completa]))
+        self._responder("No encontrado", codigo=404, tipo="text/plain")
+
+    def do_POST(self):
+        partes = urlsplit(self.path)
+        datos = self._leer_formulario()
+
+        if partes.path == RUTA_DISPOSITIVO:
+            return self._pagina(_LOGIN_USUARIO)
+        if partes.path == RUTA_USUARIO:
+            if not datos.get('userName'):
+                return self._pagina(_LOGIN_USUARIO)
+            token = self.estado.nueva_sesion()
+            return self._redirigir(RUTA_INICIO, {"Set-Cookie": f"{COOKIE_SESION}={token}; Path=/"})
+        if not self._sesion_valida():
+            return self._pagina(_LOGIN_USUARIO)
+
+        ruta_formulario = parse_qs(partes.query).get('reporte', [''])[0]
+        definicion = self.server.formularios.get(ruta_formulario)
+        if definicion is None:
+            return self._responder("Reporte desconocido", codigo=404, tipo="text/plain")
+        consulta = self._consulta(definicion, datos)
+
+        if partes.path == RUTA_CONSULTA:
+            variante = self.server.escenario.variante_sin_datos(consulta['clave'])
+            return self._responder(
+                json.dumps({'variante': variante, 'mensaje': TEXTO_SIN_DATOS}), tipo="application/json"
+            )
+        if partes.path == RUTA_RESULTADOS:
+            return self._resultados(consulta)
+        self._responder("No encontrado", codigo=404, tipo="text/plain")
+
+    def _consulta(self, definicion, datos):
+        from_id, to_id = definicion['date_fields']
+        desplegable = definicion['desplegable'] or {}
+        desplegable_id = desplegable.get('id', '')
+        select_id = desplegable_id[:-len('_chosen')] if desplegable_id.endswith('_chosen') else desplegable_id
+        consulta = {
+            'reporte': definicion['reporte'],
+            'desde': datos.get(from_id, ''),
+            'hasta': datos.get(to_id, ''),
+            'valor': datos.get(select_id) if select_id else None,
+        }
+        consulta['clave'] = f"{consulta['reporte']}|{consulta['desde']}|{consulta['hasta']}|{consulta['valor']}"
+        return consulta
+
+    def _resultados(self, consulta):
+        time.sleep(self.server.escenario.latencia)
+        if self.server.escenario.variante_sin_datos(consulta['clave']):
+            # Variantes alerta/popup no llegan aquí desde el navegador; el motor HTTP sí
+            return self._pagina(f"<p>{TEXTO_SIN_DATOS}</p>")
+
+        try:
+            desde = _parsear_fecha_sistema(consulta['desde'])
+            hasta = _parsear_fecha_sistema(consulta['hasta'])
+        except ValueError:
+            return self._pagina("<p>Fechas inválidas</p>", codigo=400)
+
+        token = self.estado.registrar_descarga(consulta, desde, hasta)
+        dias = (hasta - desde).days + 1
+        filas = "".join(
+            f"<tr><td>{(desde + timedelta(days=i)).strftime('%d/%m/%Y')}</td><td>{consulta['valor'] or ''}</td></tr>"
+            for i in range(min(dias, 50))
+        )
+        self._pagina(f"""
+<h2>Resultados: {html.escape(consulta['reporte'])}</h2>
+<a class="download" href="{RUTA_DESCARGA}?token={token}">Descargar CSV</a>
+<table id="resultados"><tr><th>Fecha</th><th>Valor</th></tr>{filas}</table>""")
+
+    def _descarga(self, token):
+        consulta = self.estado.obtener_descarga(token)
+        if consulta is None:
+            return self._responder("Descarga inexistente", codigo=404, tipo="text/plain")
+        time.sleep(self.server.escenario.latencia)
+        datos = generar_csv(consulta['desde_dt'], consulta['hasta_dt'], self.server.escenario.filas_por_dia,
+                            valor=consulta['valor'], semilla=self.server.escenario.semilla)
+        nombre = f"{consulta['reporte']}_{consulta['desde_dt']:%Y%m%d}.csv"
+        self._responder(datos, tipo="text/csv; charset=utf-8",
+                        cabeceras={"Content-Disposition": f'attachment; filename="{nombre}"'})
+
+    def _recurso(self, ruta):
+        time.sleep(self.server.escenario.latencia_recursos)
+        if ruta.endswith(".css"):
+            return self._responder("body { font-family: sans-serif; }", tipo="text/css")
+        if ruta.endswith(".js"):
+            return self._responder("window.__analytics = true;", tipo="application/javascript")
+        # PNG transparente de 1x1
+        png = bytes.fromhex(
+            "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+            "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+        )
+        self._responder(png, tipo="image/png")
+
+
+class _EstadoServidor:
+    """Sesiones y descargas pendientes del servidor (compartido entre hilos)."""
+
+    def __init__(self, escenario):
+        self.escenario = escenario
+        self._lock = threading.Lock()
+        self._sesiones = {}
+        self._descargas = {}
+
+    def nueva_sesion(self):
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._sesiones[token] = time.time()
+        return token
+
+    def sesion_valida(self, token):
+        with self._lock:
+            creada = self._sesiones.get(token)
+        if creada is None:
+            return False
+        duracion = self.escenario.duracion_sesion
+        return duracion is None or time.time() - creada < duracion
+
+    def registrar_descarga(self, consulta, desde, hasta):
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._descargas[token] = dict(consulta, desde_dt=desde, hasta_dt=hasta)
+        return token
+
+    def obtener_descarga(self, token):
+        with self._lock:
+            return self._descargas.get(token)
+
+
+class ServidorSalesys:
+    """
+    Servidor HTTP local (en un hilo) que imita SalesYs.
+
+    Uso:
+        with ServidorSalesys(formularios_desde_routes(ROUTES), EscenarioSalesys(latencia=0.5)) as servidor:
+            print(servidor.url_base, servidor.url_login)
+    """
+
+    def __init__(self, formularios, escenario=None, host="127.0.0.1", puerto=0):
+        self.escenario = escenario or EscenarioSalesys()
+        self._httpd = ThreadingHTTPServer((host, puerto), _ManejadorSalesys)
+        self._httpd.daemon_threads = True
+        self._httpd.formularios = formularios
+        self._httpd.escenario = self.escenario
+        self._httpd.estado = _EstadoServidor(self.escenario)
+        self._hilo = None
+
+    @property
+    def url_base(self) -> str:
+        host, puerto = self._httpd.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    @property
+    def url_login(self) -> str:
+        return self.url_base + RUTA_LOGIN
+
+    def iniciar(self):
+        self._hilo = threading.Thread(target=self._httpd.serve_forever, name="servidor-salesys", daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
+
+
+# ====================================
+# PUNTO DE ENTRADA
+# ====================================
+def agregar_argumentos_escenario(parser):
+    """Argumentos de línea de comandos comunes al servidor y al benchmark."""
+    parser.add_argument("--filas", type=int, default=500, help="Filas del CSV por día (default: 500)")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Segundos de latencia de resultados y descargas")
+    parser.add_argument("--latencia-recursos", type=float, default=0.0, help="Segundos de latencia de CSS/JS/imágenes")
+    parser.add_argument("--sin-datos", type=float, default=0.0, help="Fracción de consultas sin datos (0-1)")
+    parser.add_argument("--variantes", default=",".join(VARIANTES_SIN_DATOS),
+                        help="Variantes de 'no data' separadas por coma (alerta,popup,body)")
+    parser.add_argument("--duracion-sesion", type=float, default=None, help="Segundos de validez de la sesión")
+    parser.add_argument("--semilla", type=int, default=0)
+
+
+def escenario_desde_argumentos(args) -> EscenarioSalesys:
+    variantes = [v.strip() for v in args.variantes.split(",") if v.strip()]
+    invalidas = [v for v in variantes if v not in VARIANTES_SIN_DATOS]
+    if invalidas:
+        raise ValueError(f"Variantes inválidas: {invalidas}. Opciones: {list(VARIANTES_SIN_DATOS)}")
+    return EscenarioSalesys(
+        filas_por_dia=args.filas,
+        latencia=args.latencia,
+        latencia_recursos=args.latencia_recursos,
+        tasa_sin_datos=args.sin_datos,
+        variantes_sin_datos=variantes,
+        duracion_sesion=args.duracion_sesion,
+        semilla=args.semilla,
+    )
+
+
+if __name__ == "__main__":
+    import yaml
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Servidor local que imita SalesYs")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--routes", default=str(Path(__file__).parent.parent / "config" / "routes.yaml"))
+    agregar_argumentos_escenario(parser)
+    args = parser.parse_args()
+
+    with open(args.routes, 'r', encoding='utf-8') as f:
+        formularios = formularios_desde_routes(yaml.safe_load(f))
+
+    servidor = ServidorSalesys(formularios, escenario_desde_argumentos(args), puerto=args.puerto)
+    print(f"[Servidor SalesYs] Escuchando en {servidor.url_base}")
+    print(f"  SALESYS_URL={servidor.url_login}")
+    for ruta, definicion in formularios.items():
+        print(f"  {definicion['reporte']}: {servidor.url_base}{ruta}")
+    with servidor:
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,181 @@
+# ====================================
+# BENCHMARK DE THROUGHPUT (ITEMS POR MINUTO)
+# ====================================
+# Ejecuta los scrapers de SalesYs de punta a punta contra el servidor local
+# (benchmark/servidor_salesys.py) en Chrome headless y mide items por minuto
+# de cada uno. No toca el sitio real ni las carpetas de red: los archivos
+# van a una carpeta temporal y el estado a estado/benchmark/.
+#
+# Uso:
+#   python -m benchmark --dias 5 --filas 2000 --latencia 0.3
+#   python -m benchmark --scrapers rga --motor http --workers 2 --sin-datos 0.2
+#   python -m benchmark --lean --latencia-recursos 0.5   (comparar con la misma corrida sin --lean)
+#   python -m benchmark.arranque   (tiempo de arranque de la CLI)
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import yaml
+
+from benchmark.servidor_salesys import (
+    ServidorSalesys, formularios_desde_routes, agregar_argumentos_escenario, escenario_desde_argumentos,
+)
+
+BASE_DIR = Path(__file__).parent.parent
+ROUTES_ORIGINAL = BASE_DIR / "config" / "routes.yaml"
+
+SCRAPERS_DISPONIBLES = ("estado_agente_v2", "rga", "rechazo_delivery", "reprogramacion_delivery")  # Ver scrapers/registro.py
+
+
+def _parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de items/min de los scrapers de SalesYs (servidor local)")
+    parser.add_argument("--scrapers", default=",".join(SCRAPERS_DISPONIBLES),
+                        help=f"Reportes a medir, separados por coma (default: {','.join(SCRAPERS_DISPONIBLES)})")
+    parser.add_argument("--dias", type=int, default=3, help="Días a procesar, terminando ayer (default: 3)")
+    parser.add_argument("--motor", choices=("selenium", "http"), default=None,
+                        help="Fuerza el motor de todos los reportes (default: el de routes.yaml)")
+    parser.add_argument("--rango", type=int, default=None,
+                        help="Activa el modo rango con este máximo de días por envío")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos worker (default: 1)")
+    parser.add_argument("--lean", action="store_true",
+                        help="Navegador lean (CHROME_LEAN) y 'lean: {ocultar_resultados: true}' en todos los reportes")
+    parser.add_argument("--con-ventana", action="store_true", help="Ejecutar Chrome con ventana (no headless)")
+    parser.add_argument("--conservar", action="store_true", help="No borrar la carpeta de salida temporal")
+    agregar_argumentos_escenario(parser)
+    return parser.parse_args(argv)
+
+
+def _routes_para_benchmark(routes, url_base, args):
+    """Copia de routes.yaml con los formularios apuntando al servidor local."""
+    for config in routes.values():
+        if not isinstance(config, dict) or not config.get('form_url'):
+            continue
+        partes = config['form_url'].split("/", 3)
+        config['form_url'] = f"{url_base}/{partes[3] if len(partes) > 3 else ''}"
+        if args.motor:
+            config['motor'] = args.motor
+        if args.rango:
+            config['rango'] = {'columna_fecha': "Fecha", 'max_dias': args.rango, 'formato_fecha': "%d/%m/%Y"}
+        if args.lean:
+            config['lean'] = {'ocultar_resultados': True}
+    return routes
+
+
+def _preparar_entorno(servidor, routes, args, directorio_trabajo):
+    """
+    Configura el entorno ANTES de importar config.settings: los workers
+    (spawn) heredan estas variables y cargan la misma configuración.
+    """
+    ruta_routes = directorio_trabajo / "routes.yaml"
+    with open(ruta_routes, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(routes, f, allow_unicode=True, sort_keys=False)
+
+    os.environ.update({
+        "SALESYS_URL": servidor.url_login,
+        "SALESYS_USER": "benchmark",
+        "SALESYS_PASS": "benchmark",
+        "SALESYS_EXTENSION": "1000",
+        "SALESYS_DEVICE": "benchmark",
+        "BASE_OUTPUT_PATH": str(directorio_trabajo / "salida"),
+        "RPA_ROUTES_PATH": str(ruta_routes),
+        "RPA_ESTADO_DIR": os.getenv("RPA_ESTADO_DIR", str(BASE_DIR / "estado" / "benchmark")),
+        "CHROME_HEADLESS": "0" if args.con_ventana else "1",
+        "CHROME_LEAN": "1" if args.lean else "0",
+        "SALESYS_WORKERS": str(args.workers),
+    })
+
+
+def _crear_scrapers(nombres, routes):
+    """(nombre, clase, kwargs) de cada scraper pedido, con todas sus opciones de desplegable."""
+    from scrapers.registro import obtener_reporte
+
+    scrapers = []
+    for nombre in nombres:
+        entrada = obtener_reporte(nombre)
+        opciones = list(routes.get(entrada.nombre, {}).get('archivos', {}).keys()) \
+            if entrada.argumento_opciones == "productos" else None
+        scrapers.append((entrada.nombre, entrada.cargar_clase(), entrada.kwargs_scraper(opciones)))
+    return scrapers
+
+
+def ejecutar_benchmark(argv=None):
+    args = _parsear_argumentos(argv)
+    nombres = [n.strip() for n in args.scrapers.split(",") if n.strip()]
+    directorio_trabajo = Path(tempfile.mkdtemp(prefix="rpa_benchmark_"))
+
+    with open(ROUTES_ORIGINAL, 'r', encoding='utf-8') as f:
+        routes = yaml.safe_load(f)
+
+    servidor = ServidorSalesys(formularios_desde_routes(routes), escenario_desde_argumentos(args)).iniciar()
+    routes = _routes_para_benchmark(routes, servidor.url_base, args)
+    _preparar_entorno(servidor, routes, args, directorio_trabajo)
+
+    # Imports del proyecto recién ahora: config.settings lee el entorno al importarse
+    from main import ejecutar_scraper
+    from scrapers.sites.salesys.core.session_manager import get_salesys_session
+    from utils.manifest import get_manifiesto
+    from utils.metricas import get_metricas
+    from scrapers.base.resultado import ESTADO_OK, ESTADO_SIN_DATOS, ESTADO_ERROR
+
+    hoy = date.today()
+    fechas = [(hoy - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(args.dias, 0, -1)]
+
+    print("=" * 60)
+    print(f"BENCHMARK SALESYS (servidor local {servidor.url_base})")
+    print(f"  {len(fechas)} días, {args.filas} filas/día, latencia {args.latencia}s, "
+          f"sin datos {args.sin_datos:.0%}, workers {args.workers}{', modo lean' if args.lean else ''}")
+    print("=" * 60)
+
+    manifiesto = get_manifiesto()
+    session = get_salesys_session()
+    mediciones = []
+    try:
+        # El login se mide aparte: no forma parte del throughput de cada reporte
+        if args.workers <= 1:
+            inicio = time.time()
+            session.get_driver()
+            print(f"[Benchmark] Login en {time.time() - inicio:.1f}s")
+
+        for nombre, scraper_cls, kwargs in _crear_scrapers(nombres, routes):
+            print(f"\n[Benchmark] {nombre}")
+            inicio = time.time()
+            resultados = ejecutar_scraper(scraper_cls, fechas, session=session, **kwargs) or []
+            duracion = time.time() - inicio
+
+            conteo = {ESTADO_OK: 0, ESTADO_SIN_DATOS: 0, ESTADO_ERROR: 0}
+            for _, resultado in resultados:
+                conteo[resultado.estado] = conteo.get(resultado.estado, 0) + 1
+            mediciones.append((nombre, len(resultados), conteo, duracion))
+    finally:
+        session.cleanup()
+        manifiesto.finalizar()
+        servidor.detener()
+        if args.conservar:
+            print(f"\n[Benchmark] Archivos en {directorio_trabajo}")
+        else:
+            shutil.rmtree(directorio_trabajo, ignore_errors=True)
+
+    _imprimir_tabla(mediciones, ESTADO_OK, ESTADO_SIN_DATOS, ESTADO_ERROR)
+
+    metricas = get_metricas()
+    print(metricas.resumen())
+    metricas.finalizar()
+
+    # Código de salida != 0 si hubo errores: sirve para detectar regresiones en CI
+    return 1 if any(conteo[ESTADO_ERROR] for _, _, conteo, _ in mediciones) else 0
+
+
+def _imprimir_tabla(mediciones, estado_ok, estado_sin_datos, estado_error):
+    print("\n" + "=" * 60)
+    print("RESULTADOS DEL BENCHMARK")
+    print("=" * 60)
+    print(f"  {'reporte':<20}{'items':>7}{'ok':>6}{'sin d.':>8}{'error':>7}{'seg':>9}{'items/min':>11}")
+    for nombre, items, conteo, duracion in mediciones:
+        items_por_minuto = items / (duracion / 60) if duracion > 0 else 0
+        print(f"  {nombre:<20}{items:>7}{conteo[estado_ok]:>6}{conteo[estado_sin_datos]:>8}"
+              f"{conteo[estado_error]:>7}{duracion:>9.1f}{items_por_minuto:>11.1f}")
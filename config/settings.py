@@ -21,8 +21,17 @@ _hostname = socket.gethostname()
 _timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
 _session_id = f"{_hostname}_{_timestamp}"
 
+# Los workers en paralelo heredan RPA_RUN_ID para compartir el id de ejecución
+SESSION_ID = os.getenv("RPA_RUN_ID") or _session_id
+
 DOWNLOADS_DIR = Path(tempfile.gettempdir()) / "rpa_downloads" / _session_id
 
+# Estado persistente entre ejecuciones (manifiesto de checkpoint/resume)
+ESTADO_DIR = Path(os.getenv("RPA_ESTADO_DIR", BASE_DIR / "estado"))
+MANIFEST_PATH = ESTADO_DIR / "manifiesto.sqlite3"
+METRICAS_PATH = ESTADO_DIR / "metricas.sqlite3"
+CACHE_PATH = ESTADO_DIR / "cache_descargas.sqlite3"
+
 # Ruta base para guardar archivos procesados
 BASE_OUTPUT_PATH = os.getenv("BASE_OUTPUT_PATH", "Z:/DESCARGA INFORMES")
 
@@ -35,23 +44,103 @@ SALESYS_PASS = os.getenv("SALESYS_PASS")
 SALESYS_URL = os.getenv("SALESYS_URL")
 SALESYS_EXTENSION = os.getenv("SALESYS_EXTENSION")
 SALESYS_DEVICE = os.getenv("SALESYS_DEVICE")
+# Página autenticada para verificar una sesión guardada (default: primer form_url de routes.yaml)
+SALESYS_PROBE_URL = os.getenv("SALESYS_PROBE_URL")
 
 # Credenciales de base de datos
 DB_SERVER = os.getenv("DB_SERVER")
 DB_NAME = os.getenv("DB_NAME")
 DB_USER = os.getenv("DB_USER")
 DB_PASS = os.getenv("DB_PASS")
+DB_DRIVER = os.getenv("DB_DRIVER", "ODBC Driver 17 for SQL Server")
+# URL SQLAlchemy alternativa (ej. "sqlite:///estado/bd_local.sqlite3" para pruebas locales)
+DB_URL = os.getenv("DB_URL")
+DB_BATCH_SIZE = int(os.getenv("DB_BATCH_SIZE", "5000"))  # Filas por executemany
 
 # ====================================
 # CONFIGURACIÓN DE CHROME
 # ====================================
-CHROME_OPTIONS = {"headless": False, "download_dir": str(DOWNLOADS_DIR),}
+# CHROME_HEADLESS=1 en el .env fuerza el modo headless (ej. benchmark local)
+# CHROME_LEAN=1 activa el perfil lean: headless, sin imágenes, sin red en segundo
+# plano ni extensiones y carga 'eager' (no espera recursos secundarios)
+CHROME_OPTIONS = {
+    "headless": os.getenv("CHROME_HEADLESS", "0") == "1",
+    "lean": os.getenv("CHROME_LEAN", "0") == "1",
+    "download_dir": str(DOWNLOADS_DIR),
+}
+
+# Patrones de Network.setBlockedURLs por plataforma, aplicados en los reportes con 'lean'
+# (routes.yaml). No se bloquea CSS: los desplegables Chosen dependen de sus estilos.
+BLOCKED_URLS = {
+    "salesys": [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.eot",
+        "*google-analytics.com*", "*googletagmanager.com*", "*analytics*.js*",
+    ],
+}
+
+# Perfil persistente de Chrome (cookies + caché de recursos estáticos entre ejecuciones).
+# Vacío = perfil temporal nuevo en cada ejecución. Cada sesión usa su propia subcarpeta.
+CHROME_PROFILE_DIR = os.getenv("CHROME_PROFILE_DIR") or None
 
 # ====================================
 # CONFIGURACIÓN DE SESSION MANAGERS
 # ====================================
 MAX_LOGIN_ATTEMPTS = 3  # Número de intentos de login antes de fallar
 LOGIN_TIMEOUT = 7  # Segundos de espera para elementos de login
+# Renovaciones de sesión (re-login o navegador nuevo) por scraper durante una ejecución
+SESION_MAX_RENOVACIONES = int(os.getenv("SESION_MAX_RENOVACIONES", "3"))
+SESION_PING_TIMEOUT = 10  # Segundos del ping autenticado que confirma una sesión caída
+
+# ====================================
+# CACHÉ DE DESCARGAS (DÍAS CERRADOS)
+# ====================================
+# Default de 'frescura' en routes.yaml: los días anteriores a hoy - N son finales
+# y, si ya están descargados, no se vuelven a pedir. CACHE_FORZAR=1 (--force) los repite
+FRESCURA_DIAS_FINALES = int(os.getenv("FRESCURA_DIAS_FINALES", "2"))
+CACHE_FORZAR = os.getenv("CACHE_FORZAR") == "1"
+
+# ====================================
+# REINTENTOS DE ITEMS FALLIDOS
+# ====================================
+# Default de la opción 'reintentos' de routes.yaml (ver utils/reintentos.py).
+# Los items con error se reintentan después de la pasada principal
+REINTENTOS_DEFAULT = {
+    "intentos": int(os.getenv("REINTENTOS_INTENTOS", "3")),  # Intentos totales por item
+    "espera_base": 5,                                         # Segundos base del backoff exponencial
+    "espera_max": 60,                                         # Tope de una espera
+    "circuito": {
+        "fallos": 5,    # Fallos consecutivos que abren el circuito (0 = sin circuito)
+        "pausa": 60,    # Segundos sin intentar items del reporte
+    },
+}
+
+# ====================================
+# LÍMITES DE ESPERAS POR CONDICIÓN
+# ====================================
+# Segundos máximos de cada espera; la espera termina antes si se cumple
+# su condición. Se pueden sobrescribir con ESPERA_<NOMBRE> en el .env
+_ESPERAS_DEFAULT = {
+    "formulario_listo": 30,    # Campo de fecha (o login) presente en la pestaña del formulario
+    "respuesta_submit": 2,     # Alert, popup #MGSJE o pestaña de resultados tras enviar
+    "seleccion_chosen": 5,     # Valor del desplegable Chosen confirmado
+    "login_verificacion": 10,  # Formulario de login reemplazado tras enviar credenciales
+    "cookies_sesion": 5,       # Página cargada y cookies de sesión presentes
+}
+ESPERAS = {nombre: float(os.getenv(f"ESPERA_{nombre.upper()}", valor)) for nombre, valor in _ESPERAS_DEFAULT.items()}
+
+# ====================================
+# CONFIGURACIÓN DE EJECUCIÓN PARALELA
+# ====================================
+SALESYS_WORKERS = int(os.getenv("SALESYS_WORKERS", "1"))  # Procesos worker (1 = secuencial)
+# Pestañas de formulario por navegador: cada una envía su item mientras las otras
+# esperan al servidor (1 = un item a la vez). Se puede fijar por reporte en routes.yaml
+SALESYS_PESTANAS = int(os.getenv("SALESYS_PESTANAS", "1"))
+
+# Despacho de archivos (renombrar, BD, Parquet, copia a destinos) en segundo plano
+# mientras el navegador sigue con el próximo item. 0 = despacho en el mismo hilo
+DESPACHO_HILOS = int(os.getenv("DESPACHO_HILOS", "2"))
+DESPACHO_MAX_PENDIENTES = int(os.getenv("DESPACHO_MAX_PENDIENTES", "4"))  # Tope de la cola (contrapresión)
 
 # ====================================
 # CONFIGURACIÓN DE LOGGING
@@ -68,7 +157,8 @@ MESES_ES = { 1: "Enero", 2: "Febrero", 3: "Marzo", 4: "Abril", 5: "Mayo", 6: "Ju
 # ====================================
 # CONFIGURACIÓN DE SCRAPERS (desde YAML)
 # ====================================
-ROUTES_PATH = BASE_DIR / "config" / "routes.yaml"
+# RPA_ROUTES_PATH permite usar otro archivo (ej. el benchmark apunta los reportes al servidor local)
+ROUTES_PATH = Path(os.getenv("RPA_ROUTES_PATH", BASE_DIR / "config" / "routes.yaml"))
 
 def load_routes():
     """Carga configuración completa de scrapers desde YAML"""
@@ -4,168 +4,263 @@
 # ====================================
 # Este archivo ejecuta todos los scrapers de todas las plataformas
 # Usa SessionManager para reutilizar sesiones y optimizar el tiempo
+#
+# Los reportes se eligen por nombre desde el registro (scrapers/registro.py).
+# Selenium, config.settings y las clases de los scrapers se importan recién
+# cuando se van a usar: 'python main.py --help' o un error de argumentos no
+# los cargan (medición: python -m benchmark.arranque).
 
-from scrapers.sites.salesys.core.session_manager import get_salesys_session
-from scrapers.sites.salesys.reports.estado_agente_v2 import EstadoAgenteV2Scraper
-from scrapers.sites.salesys.reports.rga import RGAScraper
-from scrapers.sites.salesys.reports.delivery_rechazo import DeliveryRechazoScraper
+import argparse
+import os
+import sys
+from datetime import date, datetime, timedelta
+from functools import partial
 
-def ejecutar_scrapers_salesys():
+from scrapers.registro import REPORTES, ALIAS, obtener_reporte, reportes_de_plataforma, plataformas, todos_los_reportes
+
+
+def ejecutar_scraper(scraper_cls, fechas, session=None, **scraper_kwargs):
+    """
+    Ejecuta un scraper de SalesYs en la sesión indicada o, si SALESYS_WORKERS > 1,
+    repartiendo sus work items entre procesos worker con sesiones propias.
+    """
+    from config.settings import SALESYS_WORKERS
+
+    if SALESYS_WORKERS > 1:
+        from scrapers.sites.salesys.core.worker_pool import ejecutar_en_paralelo
+        return ejecutar_en_paralelo(scraper_cls, fechas, SALESYS_WORKERS, scraper_kwargs)
+    scraper = scraper_cls(session_manager=session, **scraper_kwargs)
+    return scraper.ejecutar(fechas=fechas)
+
+def ejecutar_pasada_salesys(reportes, fechas, session, opciones=None):
+    """Todos los reportes en una sola pasada sobre la sesión, agrupados por formulario."""
+    from scrapers.sites.salesys.core.pasada import ejecutar_pasada
+
+    scrapers = [e.cargar_clase()(session_manager=session, **e.kwargs_scraper(opciones)) for e in reportes]
+    return ejecutar_pasada(scrapers, fechas)
+
+def registrar_tareas_salesys(orquestador, fechas, reportes=None, opciones=None):
     """
-    Ejecuta todos los scrapers de SalesYs para un rango de fechas.
+    Declara en el orquestador las tareas de SalesYs: login, los reportes y el
+    cierre de sesión. Con una sola sesión los reportes corren en una pasada
+    (cada formulario se abre una vez); con workers, un reporte por tarea.
+
+    Args:
+        reportes: Entradas del registro a ejecutar (default: todos los de SalesYs)
+        opciones: Opciones del desplegable (productos/usuarios) para los reportes que las usan
     """
-    print("=" * 60)
-    print("EJECUTANDO SCRAPERS DE SALESYS")
-    print("=" * 60)
-
-    # --- Definir el rango de fechas a procesar ---
-    # Ejemplo: procesar los últimos 2 días
-    from datetime import date, timedelta
-    hoy = date.today()
-    fechas_a_procesar = [(hoy - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(2)]
-    print(f"Rango de fechas a procesar: {fechas_a_procesar}")
-    # -----------------------------------------
-
-    # Obtener instancia singleton del SessionManager
+    from config.settings import SALESYS_WORKERS
+    from scrapers.sites.salesys.core.session_manager import get_salesys_session
+
+    plataforma = "SalesYs"
     session = get_salesys_session()
 
-    try:
-        # ========================================
-        # SCRAPER 1: ESTADO AGENTE V2
-        # ========================================
-        print("\n[1/2] Iniciando scraper de Estado Agente V2...")
-        estado_agente_v2 = EstadoAgenteV2Scraper(session_manager=session)
-        estado_agente_v2.ejecutar(fechas=fechas_a_procesar)
-        print("✓ Proceso de Estado Agente V2 finalizado.")
-
-        # ========================================
-        # SCRAPER 2: RGA
-        # ========================================)
-        productos_default = ["DELIVERY", "HFC"]
-        rga = RGAScraper(session_manager=session, productos=productos_default)
-        rga.ejecutar(fechas=fechas_a_procesar)
-        print("✓ Proceso de RGA finalizado.")
-           
-        
-        
-        
-        
-        
-        # ========================================
-        # SCRAPER 3: DELIVERY RECHAZO
-        # ========================================)
-        rga = DeliveryRechazoScraper(session_manager=session)
-        rga.ejecutar(fechas=fechas_a_procesar)
-        print("✓ Proceso de DELIVERY RECHAZO finalizado.")
-        
-        print("\n" + "=" * 60)
-        print("✓ TODOS LOS SCRAPERS DE SALESYS COMPLETADOS")
-        print("=" * 60)
+    reportes = reportes or reportes_de_plataforma(plataforma)
 
-    except Exception as e:
-        print(f"\n✗ Error durante ejecución de scrapers de SalesYs: {e}")
-        # No relanzar la excepción para permitir que el cleanup se ejecute
-        # raise
+    if SALESYS_WORKERS <= 1:
+        orquestador.agregar("salesys.login", partial(session.get_driver, log_fn=print), plataforma)
+        orquestador.agregar("salesys.pasada",
+                            partial(ejecutar_pasada_salesys, reportes, fechas, session, opciones),
+                            plataforma, depende_de=["salesys.login"])
+    else:
+        # Con workers en paralelo cada proceso hace su propio login
+        for entrada in reportes:
+            orquestador.agregar(f"salesys.{entrada.nombre}",
+                                partial(ejecutar_scraper, entrada.cargar_clase(), fechas,
+                                        **entrada.kwargs_scraper(opciones)),
+                                plataforma)
+
+    # IMPORTANTE: Cerrar sesión de SalesYs al finalizar TODOS sus reportes
+    orquestador.al_finalizar(plataforma, session.cleanup)
+
+
+# Función que declara las tareas de cada plataforma del registro
+REGISTRADORES = {
+    "SalesYs": registrar_tareas_salesys,
+}
 
-    finally:
-        # IMPORTANTE: Cerrar sesión de SalesYs al finalizar TODOS los scrapers
-        print("\nCerrando sesión de SalesYs...")
-        session.cleanup()
 
+def ejecutar_plataformas(registradores, fechas):
+    """
+    Ejecuta concurrentemente las tareas de las plataformas indicadas.
+
+    Args:
+        registradores: Funciones (orquestador, fechas) que declaran las tareas de cada plataforma
+        fechas: Fechas a procesar
+
+    Returns:
+        True si todas las tareas terminaron bien
+    """
+    from utils.orquestador import Orquestador, TAREA_OK
 
-def ejecutar_proceso_completo():
+    orquestador = Orquestador()
+    for registrar in registradores:
+        registrar(orquestador, fechas)
+    tareas = orquestador.ejecutar()
+    return all(tarea.estado == TAREA_OK for tarea in tareas.values())
+
+
+def ejecutar_reportes(reportes, fechas, opciones=None):
     """
-    Ejecuta el proceso completo de RPA.
+    Ejecuta los reportes indicados, agrupados por plataforma (plataformas en paralelo).
+
+    Args:
+        reportes: Nombres o entradas del registro
+        fechas: Fechas a procesar ("YYYY-MM-DD")
+        opciones: Opciones del desplegable (productos/usuarios), default: las del registro
+
+    Returns:
+        True si todas las tareas terminaron bien
     """
+    entradas = [r if not isinstance(r, str) else obtener_reporte(r) for r in reportes]
+    por_plataforma = {}
+    for entrada in entradas:
+        por_plataforma.setdefault(entrada.plataforma, []).append(entrada)
+
+    registradores = [
+        partial(REGISTRADORES[plataforma], reportes=entradas_plataforma, opciones=opciones)
+        for plataforma, entradas_plataforma in por_plataforma.items()
+    ]
+    return ejecutar_plataformas(registradores, fechas)
+
+
+def rango_fechas(desde, hasta) -> list:
+    """Fechas "YYYY-MM-DD" de 'desde' a 'hasta' (ambas incluidas)."""
+    if desde > hasta:
+        raise ValueError(f"Rango de fechas inválido: {desde} es posterior a {hasta}")
+    return [(desde + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((hasta - desde).days + 1)]
+
+
+# ====================================
+# LÍNEA DE COMANDOS
+# ====================================
+
+def _fecha_argumento(texto):
     try:
-        # ========================================
-        # PLATAFORMA 1: SALESYS
-        # ========================================
-        ejecutar_scrapers_salesys()
+        return datetime.strptime(texto, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida '{texto}' (formato YYYY-MM-DD)")
 
+
+def _lista_argumento(texto):
+    return [v.strip() for v in texto.split(",") if v.strip()]
+
+
+def crear_parser():
+    objetivos = sorted(REPORTES) + sorted(ALIAS) + [p.lower() for p in plataformas()]
+    parser = argparse.ArgumentParser(
+        description="Descarga de reportes RPA",
+        epilog=f"Reportes: {', '.join(sorted(REPORTES))} y cualquier otro definido en config/routes.yaml",
+    )
+    parser.add_argument("objetivos", nargs="*", metavar="OBJETIVO",
+                        help=f"Plataformas o reportes a ejecutar (default: todo). Opciones: {', '.join(objetivos)}")
+    parser.add_argument("--reports", type=_lista_argumento, metavar="R1,R2",
+                        help="Reportes a ejecutar, separados por coma")
+    parser.add_argument("--products", type=_lista_argumento, metavar="P1,P2",
+                        help="Opciones del desplegable (productos o usuarios) de los reportes que las usan")
+    parser.add_argument("--from", dest="desde", type=_fecha_argumento, metavar="YYYY-MM-DD",
+                        help="Primera fecha (default: ayer)")
+    parser.add_argument("--to", dest="hasta", type=_fecha_argumento, metavar="YYYY-MM-DD",
+                        help="Última fecha (default: hoy)")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="Procesos worker por reporte (sobrescribe SALESYS_WORKERS)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reanudar la última ejecución interrumpida")
+    parser.add_argument("--force", action="store_true",
+                        help="Descargar también los días cerrados que ya están en sus destinos")
+    return parser
+
+
+def _seleccionar_reportes(parser, args) -> list:
+    """Entradas del registro según los OBJETIVO / --reports (default: todas)."""
+    nombres = list(args.reports or [])
+    for objetivo in args.objetivos:
+        por_plataforma = reportes_de_plataforma(objetivo)
+        if por_plataforma:
+            nombres += [e.nombre for e in por_plataforma]
+        else:
+            nombres.append(objetivo)
+    try:
+        entradas = [obtener_reporte(n) for n in nombres] if nombres else list(todos_los_reportes().values())
+    except ValueError as e:
+        parser.error(str(e))
+    return list(dict.fromkeys(entradas))
+
+
+def _validar_products(parser, reportes, productos):
+    """--products debe existir en el desplegable de cada reporte elegido que lo usa."""
+    from utils.route_builder import get_plan
+
+    con_desplegable = [e for e in reportes if e.argumento_opciones]
+    if not con_desplegable:
+        parser.error("--products solo aplica a reportes con desplegable: "
+                     f"{[e.nombre for e in todos_los_reportes().values() if e.argumento_opciones]}")
+    for entrada in con_desplegable:
+        disponibles = list(get_plan(entrada.nombre).archivos.keys())
+        invalidas = [p for p in productos if p not in disponibles]
+        if invalidas:
+            parser.error(f"--products {invalidas} no existen en '{entrada.nombre}'. Opciones: {disponibles}")
+
+
+def main(argv=None):
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+
+    hasta = args.hasta or date.today()
+    desde = args.desde or min(hasta, date.today() - timedelta(days=1))
+    try:
+        fechas = rango_fechas(desde, hasta)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Antes de importar config.settings, que lee el entorno una sola vez
+    if args.workers is not None:
+        os.environ["SALESYS_WORKERS"] = str(args.workers)
+    if args.force:
+        os.environ["CACHE_FORZAR"] = "1"
+
+    # routes.yaml se valida completo antes de abrir cualquier navegador
+    from utils.route_builder import get_plan_routes, RoutesInvalidasError
+    try:
+        get_plan_routes()
+    except RoutesInvalidasError as e:
+        print(f"✗ {e}")
+        return 2
+
+    reportes = _seleccionar_reportes(parser, args)
+    if args.products:
+        _validar_products(parser, reportes, args.products)
+
+    from utils.manifest import get_manifiesto
+    from utils.esperas import REGISTRO_ESPERAS
+    from utils.metricas import get_metricas
+
+    # --resume: reanudar la última ejecución interrumpida (manifiesto de items)
+    manifiesto = get_manifiesto(reanudar=args.resume)
+
+    print(f"Reportes: {[e.nombre for e in reportes]}")
+    print(f"Rango de fechas a procesar: {fechas[0]} → {fechas[-1]} ({len(fechas)} días)")
+    try:
+        ok = ejecutar_reportes(reportes, fechas, args.products)
+        if not ok:
+            print("\n✗ PROCESO FINALIZADO CON ERRORES (ver resumen del orquestador)")
     except Exception as e:
         print("\n")
         print("║" + " " * 12 + "✗ PROCESO FINALIZADO CON ERRORES" + " " * 14 + "║")
         print(f"\nError: {e}")
-        # raise
-
-
-def ejecutar_solo_estado_agente_v2():
-    """
-    Ejecuta solo el scraper de Estado Agente V2 para un rango de fechas.
-    """
-    print("Ejecutando solo scraper de Estado Agente V2...")
-    from datetime import date, timedelta
-    hoy = date.today()
-    fechas_a_procesar = [(hoy - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(2)]
-    print(f"Rango de fechas a procesar: {fechas_a_procesar}")
-    
-    estado_agente_v2 = EstadoAgenteV2Scraper()
-    estado_agente_v2.ejecutar(fechas=fechas_a_procesar)
-    print("✓ Proceso de Estado Agente V2 finalizado.")
-
-
-def ejecutar_solo_rga():
-    """
-    Ejecuta solo el scraper de RGA para un rango de fechas.
-    """
-    print("Ejecutando solo scraper de RGA...")
-    from datetime import date, timedelta
-    hoy = date.today()
-    fechas_a_procesar = [(hoy - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(2)]
-    print(f"Rango de fechas a procesar: {fechas_a_procesar}")
-
-    # Default temporal para CLI - La web pasará productos dinámicamente
-    productos_default = ["DELIVERY", "HFC"]
-    print(f"Productos a descargar: {productos_default}")
-
-    rga = RGAScraper(productos=productos_default)
-    rga.ejecutar(fechas=fechas_a_procesar)
-    print("✓ Proceso de RGA finalizado.")
-    
-def ejecutar_solo_DeliveryRechazo():
-    """
-    Ejecuta solo el scraper de DeliveryRechazo para un rango de fechas.
-    """
-    print("Ejecutando solo scraper de DeliveryRechazo...")
-    from datetime import date, timedelta
-    hoy = date.today()
-    fechas_a_procesar = [(hoy - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(2)]
-    print(f"Rango de fechas a procesar: {fechas_a_procesar}")
+        ok = False
 
-    # Default temporal para CLI - La web pasará usuarios dinámicamente
-    usuarios_default = ["Todo"]
-    print(f"Usuarios a descargar: {usuarios_default}")
+    manifiesto.finalizar()
+    print(REGISTRO_ESPERAS.resumen())
 
-    delivery_rechazo = DeliveryRechazoScraper(usuarios=usuarios_default)
-    delivery_rechazo.ejecutar(fechas=fechas_a_procesar)
-    print("✓ Proceso de DeliveryRechazo finalizado.")
+    metricas = get_metricas()
+    print(metricas.resumen())
+    metricas.finalizar()
+    return 0 if ok else 1
 
 
 # ====================================
 # PUNTO DE ENTRADA
 # ====================================
 if __name__ == "__main__":
-    import sys
-
-    # Opciones de ejecución
-    if len(sys.argv) > 1:
-        comando = sys.argv[1].lower()
-
-        if comando == "salesys":
-            ejecutar_scrapers_salesys()
-        elif comando == "estado_agente_v2":
-            ejecutar_solo_estado_agente_v2()
-        elif comando == "rga":
-            ejecutar_solo_rga()
-        elif comando == "deliveryrechazo":
-            ejecutar_solo_DeliveryRechazo()
-        else:
-            print("Comandos disponibles:")
-            print("  python main.py            - Ejecutar proceso completo")
-            print("  python main.py salesys    - Solo scrapers de SalesYs")
-            print("  python main.py estado_agente_v2 - Solo scraper de Estado Agente V2")
-            print("  python main.py rga        - Solo scraper de RGA")
-    else:
-        # Por defecto: ejecutar proceso completo
-        ejecutar_proceso_completo()
+    sys.exit(main())
@@ -1,9 +1,22 @@
 # Scrapers del proyecto
+#
+# Las clases se importan al primer acceso (scrapers.RGAScraper): importar el
+# paquete no carga Selenium ni la configuración de ninguna plataforma.
 
-from .sites.salesys.reports.rga import RGAScraper
-from .sites.salesys.reports.estado_agente_v2 import EstadoAgenteV2Scraper
+import importlib
+
+_CLASES = {
+    'RGAScraper': '.sites.salesys.reports.rga',
+    'EstadoAgenteV2Scraper': '.sites.salesys.reports.estado_agente_v2',
+}
 
 __all__ = [
     'RGAScraper',
     'EstadoAgenteV2Scraper'
 ]
+
+
+def __getattr__(nombre):
+    if nombre in _CLASES:
+        return getattr(importlib.import_module(_CLASES[nombre], __name__), nombre)
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
@@ -2,9 +2,11 @@
 # PASO 3: SCRAPER BASE (Nivel 2 POO)
 # ====================================
 
+import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
-from utils import SeleniumDriver
+from utils.esperas import REGISTRO_ESPERAS
+from utils.metricas import get_metricas
 
 
 class BaseScraper(ABC):
@@ -25,6 +27,17 @@ class BaseScraper(ABC):
         """
         self.platform_name = platform_name
         self.driver = None
+        self._contexto = threading.local()
+
+    @property
+    def _item_actual(self):
+        """Item en proceso (etiqueta de las métricas). Propio de cada hilo: el despacho en
+        segundo plano sigue midiendo su item mientras el navegador avanza al siguiente."""
+        return getattr(self._contexto, 'item', None)
+
+    @_item_actual.setter
+    def _item_actual(self, valor):
+        self._contexto.item = valor
 
     # ====================================
     # MÉTODO PRINCIPAL (Template Method)
@@ -34,15 +47,24 @@ class BaseScraper(ABC):
         Ejecuta el flujo completo del scraper.
         Maneja la configuración y limpieza.
         El flujo principal de trabajo se delega a _run_main_flow.
+
+        Returns:
+            Lo que devuelva _run_main_flow (ej. lista de (work_item, ResultadoItem))
         """
+        esperas_inicio = REGISTRO_ESPERAS.total_segundos
         try:
             print(f"[{self.platform_name}] Iniciando scraper...")
-            self.configurar_driver()
-            self.login()
-            
-            self._run_main_flow(**kwargs)
+            with self._fase("configurar_driver"):
+                self.configurar_driver()
+            with self._fase("login"):
+                self.login()
+
+            with self._fase("flujo_principal"):
+                resultados = self._run_main_flow(**kwargs)
 
             print(f"\n[{self.platform_name}] ✓ Proceso de scraper completado.")
+            print(f"[{self.platform_name}] Tiempo en esperas: {REGISTRO_ESPERAS.total_segundos - esperas_inicio:.1f}s")
+            return resultados
 
         except Exception as e:
             print(f"[{self.platform_name}] ✗ Error crítico durante la ejecución: {e}")
@@ -72,6 +94,11 @@ class BaseScraper(ABC):
             self.driver.quit()
             print(f"[{self.platform_name}] ✓ Navegador cerrado")
 
+    def _fase(self, nombre):
+        """Context manager que mide una fase del scraper en el almacén de métricas."""
+        reporte = getattr(self, 'reporte_nombre', self.platform_name)
+        return get_metricas().fase(nombre, reporte=reporte, item=self._item_actual)
+
     # ====================================
     # MÉTODOS ABSTRACTOS (a implementar en subclases)
     # ====================================
@@ -0,0 +1,28 @@
+# ====================================
+# RESULTADO DE UN WORK ITEM
+# ====================================
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Estados posibles de un work item
+ESTADO_OK = "ok"
+ESTADO_SIN_DATOS = "sin_datos"
+ESTADO_ERROR = "error"
+
+
+@dataclass
+class ResultadoItem:
+    """
+    Resultado de procesar un work item (fecha o fecha+producto/usuario).
+
+    Es serializable (pickle) para poder devolverse desde procesos worker.
+    """
+    estado: str
+    destinos: list = field(default_factory=list)
+    hash: Optional[str] = None
+    error: Optional[str] = None
+    filas: Optional[int] = None  # Filas del CSV validado (ver utils/validacion.py)
+
+    @property
+    def exitoso(self) -> bool:
+        return self.estado in (ESTADO_OK, ESTADO_SIN_DATOS)
@@ -0,0 +1,97 @@
+# ====================================
+# REGISTRO DE REPORTES
+# ====================================
+# Catálogo de reportes por nombre. Solo guarda dónde vive cada clase: el
+# módulo del scraper (y con él Selenium y la configuración de su
+# plataforma) se importa recién cuando se pide ese reporte.
+#
+# Todo reporte de routes.yaml sin clase propia se ejecuta con el scraper
+# genérico (ReporteGenerico): agregar un reporte solo requiere el YAML.
+
+import importlib
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class EntradaRegistro:
+    """Reporte disponible en la CLI."""
+    nombre: str
+    plataforma: str
+    modulo: str
+    clase: str
+    # Argumento del scraper que recibe las opciones del desplegable ("productos" o "usuarios")
+    argumento_opciones: Optional[str] = None
+    opciones_default: tuple = ()
+    # True: la clase es ReporteGenerico y recibe el nombre del reporte
+    generico: bool = False
+
+    def cargar_clase(self):
+        """Importa el módulo del scraper y devuelve su clase."""
+        return getattr(importlib.import_module(self.modulo), self.clase)
+
+    def kwargs_scraper(self, opciones=None) -> dict:
+        """Argumentos de construcción: las opciones pedidas o las de por defecto."""
+        kwargs = {'reporte_nombre': self.nombre} if self.generico else {}
+        opciones = list(opciones or self.opciones_default)
+        if self.argumento_opciones and opciones:
+            kwargs[self.argumento_opciones] = opciones
+        return kwargs
+
+
+REPORTES = {
+    entrada.nombre: entrada
+    for entrada in (
+        EntradaRegistro("estado_agente_v2", "SalesYs",
+                        "scrapers.sites.salesys.reports.estado_agente_v2", "EstadoAgenteV2Scraper"),
+        EntradaRegistro("rga", "SalesYs",
+                        "scrapers.sites.salesys.reports.rga", "RGAScraper",
+                        argumento_opciones="productos", opciones_default=("DELIVERY", "HFC")),
+        EntradaRegistro("rechazo_delivery", "SalesYs",
+                        "scrapers.sites.salesys.reports.delivery_rechazo", "DeliveryRechazoScraper",
+                        argumento_opciones="usuarios"),
+    )
+}
+
+# Nombres de los comandos anteriores de main.py
+ALIAS = {
+    "deliveryrechazo": "rechazo_delivery",
+}
+
+
+def todos_los_reportes() -> dict:
+    """
+    REPORTES más una entrada genérica por cada reporte de routes.yaml sin clase
+    propia (carga la configuración: no usar en --help).
+    """
+    from utils.route_builder import get_plan_routes
+
+    reportes = dict(REPORTES)
+    for nombre, plan in get_plan_routes().items():
+        if nombre not in reportes:
+            reportes[nombre] = EntradaRegistro(
+                nombre, "SalesYs", "scrapers.sites.salesys.reports.generico", "ReporteGenerico",
+                argumento_opciones="opciones" if plan.archivos else None, generico=True,
+            )
+    return reportes
+
+
+def obtener_reporte(nombre) -> EntradaRegistro:
+    """Entrada del registro por nombre (o alias). ValueError si no existe."""
+    clave = ALIAS.get(nombre.lower(), nombre.lower())
+    if clave in REPORTES:
+        return REPORTES[clave]
+    reportes = todos_los_reportes()
+    if clave not in reportes:
+        raise ValueError(f"Reporte desconocido '{nombre}'. Opciones: {sorted(reportes)}")
+    return reportes[clave]
+
+
+def reportes_de_plataforma(plataforma) -> list:
+    """Entradas del registro de una plataforma (sin distinguir mayúsculas)."""
+    return [e for e in todos_los_reportes().values() if e.plataforma.lower() == plataforma.lower()]
+
+
+def plataformas() -> list:
+    """Plataformas con al menos un reporte registrado, en orden de registro."""
+    return list(dict.fromkeys(e.plataforma for e in REPORTES.values()))
@@ -2,15 +2,28 @@ from scrapers.base.base_scraper import BaseScraper
 from abc import ABC, abstractmethod
 from pathlib import Path
 from .session_manager import get_salesys_session
+from .http_engine import SesionExpiradaError
+from scrapers.base.resultado import ResultadoItem, ESTADO_OK, ESTADO_SIN_DATOS, ESTADO_ERROR
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoAlertPresentException
-from config.settings import SALESYS_USER, SALESYS_PASS, ROUTES
+from selenium.common.exceptions import TimeoutException, NoAlertPresentException, NoSuchElementException
+from config.settings import (SALESYS_USER, SALESYS_PASS, ROUTES, BLOCKED_URLS, DESPACHO_HILOS, DESPACHO_MAX_PENDIENTES,
+                             SALESYS_PESTANAS, SESION_MAX_RENOVACIONES, FRESCURA_DIAS_FINALES, CACHE_FORZAR)
+import threading
 import time
-import shutil
-from utils.file_system import renombrar_archivo
-from datetime import datetime
+from concurrent.futures import Future
+from utils.file_system import renombrar_archivo, eliminar_directorio_si_vacio, calcular_hash, distribuir_archivo
+from utils.manifest import get_manifiesto, clave_item
+from utils.cache_descargas import get_cache
+from utils.esperas import esperar_condicion, alguno_presente, alerta_presente
+from utils.metricas import get_metricas, FASE_ITEM
+from utils.csv_tools import dividir_csv_por_fecha
+from utils.despacho import DespachoArchivos
+from utils.route_builder import get_plan
+from utils.reintentos import PoliticaReintentos, ColaReintentos
+from utils.validacion import validar_descarga
+from datetime import datetime, date, timedelta
 
 class BaseSalesys(BaseScraper):
     """
@@ -23,7 +36,50 @@ class BaseSalesys(BaseScraper):
         """
         super().__init__(platform_name="Salesys")
         self.reporte_nombre = reporte_nombre
+        # Plan compilado de routes.yaml: si la configuración es inválida falla acá,
+        # antes de abrir el navegador
+        self.plan = get_plan(reporte_nombre)
+        self.config = ROUTES.get(reporte_nombre, {})
         self.session_manager = session_manager or get_salesys_session()
+        # Motor de descarga: "selenium" (navegador) o "http" (directo con cookies)
+        self.motor = self.config.get('motor', 'selenium')
+        # Modo rango: un solo envío desde/hasta dividido luego en archivos diarios
+        self.rango_config = self.config.get('rango')
+        # Carga opcional del CSV en base de datos (tabla por reporte)
+        self.bd_config = self.config.get('bd')
+        # Copia Parquet opcional junto a cada CSV ('parquet: true' = esquema inferido)
+        parquet = self.config.get('parquet')
+        self.parquet_config = (dict(parquet) if isinstance(parquet, dict) else {}) if parquet else None
+        # Modo lean: bloqueo de recursos no esenciales en las pestañas del reporte
+        self.lean_config = self._normalizar_lean(self.config.get('lean'))
+        # Pool de despacho en segundo plano (se crea con el primer archivo)
+        self._despacho = None
+        # Pestaña del formulario en uso (None = todavía no se abrió o ya se devolvió al pool)
+        self._form_window_handle = None
+        # Pestaña de resultados del último envío (se cierra en return_to_form)
+        self._results_window_handle = None
+        # Modo pestañas: formularios del mismo reporte abiertos a la vez en el navegador
+        self.pestanas = int(self.config.get('pestanas', SALESYS_PESTANAS))
+        self._pestanas_extra = []
+        # Renovaciones de sesión hechas en esta ejecución (tope: SESION_MAX_RENOVACIONES)
+        self._renovaciones = 0
+        # Validación de cada descarga antes de despacharla ('validacion: false' la apaga)
+        validacion = self.config.get('validacion', True)
+        self.validacion_config = (dict(validacion) if isinstance(validacion, dict) else {}) if validacion else None
+        # Días cerrados: anteriores a hoy - dias_finales ('frescura: false' = None, siempre descargar)
+        frescura = self.config.get('frescura', True)
+        self.dias_finales = (int(frescura['dias_finales']) if isinstance(frescura, dict)
+                             else FRESCURA_DIAS_FINALES) if frescura else None
+        # Reintentos diferidos, backoff y circuit breaker del reporte
+        self.politica_reintentos = PoliticaReintentos.desde_config(self.config.get('reintentos'))
+
+    def _normalizar_lean(self, valor):
+        """'lean: true' o 'lean: {...}' de routes.yaml → dict de opciones, o None si está apagado."""
+        if not valor:
+            return None
+        opciones = dict(valor) if isinstance(valor, dict) else {}
+        opciones['bloquear'] = BLOCKED_URLS.get(self.platform_name.lower(), []) + list(opciones.get('bloquear', []))
+        return opciones
 
     def _run_main_flow(self, **kwargs):
         """Flujo principal: navegar a formulario e iterar sobre work items."""
@@ -31,60 +87,748 @@ class BaseSalesys(BaseScraper):
         if not fechas:
             raise ValueError("El método 'ejecutar' debe ser llamado con el argumento 'fechas'.")
 
-        self.navegar_a_reporte()
         kwargs_clean = {k: v for k, v in kwargs.items() if k != 'fechas'}
-        work_items = self._get_work_items(fechas=fechas, **kwargs_clean)
+        work_items = self.planificar_items(self._get_work_items(fechas=fechas, **kwargs_clean))
+        if not work_items:
+            return []
+
+        self.preparar_formulario()
+
+        resultados = []
+        lock = threading.Lock()
+
+        cola = ColaReintentos(self.politica_reintentos)
+
+        def registrar(item, resultado):
+            # Puede llamarse desde un hilo de despacho
+            self.registrar_resultado(item, resultado)
+            with lock:
+                resultados.append((item, resultado))
+
+        def entregar(item, resultado):
+            # Un error con intentos disponibles no es final: el item queda diferido
+            if cola.diferir(item, resultado, exito=resultado.estado != ESTADO_ERROR):
+                print(f"  ↻ [{self.describir_item(item)}] Diferido para reintentar al final")
+            else:
+                registrar(item, resultado)
+
+        try:
+            if self.rango_config:
+                self._run_flujo_por_rangos(work_items, entregar, cola)
+            elif self._usar_modo_pestanas(work_items):
+                self._run_flujo_pestanas(work_items, entregar, cola)
+            else:
+                self._run_flujo_secuencial(work_items, entregar, cola)
+            # Los errores del despacho en segundo plano también se difieren
+            self.drenar_despacho()
+            self._reintentar_diferidos(cola, entregar, registrar)
+        finally:
+            # Ningún archivo queda a medio despachar al terminar el flujo
+            self.drenar_despacho()
+        return resultados
+
+    def procesar_item(self, work_item):
+        """
+        Descarga un work item midiendo su duración total; nunca lanza excepción.
+
+        Returns:
+            ResultadoItem, o un Future[ResultadoItem] si el archivo quedó en el
+            despacho en segundo plano (ver entregar_resultado)
+        """
+        self._item_actual = self.describir_item(work_item)
+        try:
+            with self._fase(FASE_ITEM):
+                return self._descargar_para_item(work_item)
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            return ResultadoItem(ESTADO_ERROR, error=str(e))
+        finally:
+            self._item_actual = None
 
+    def _run_flujo_secuencial(self, work_items, destino, cola):
+        """Un item a la vez. Con el circuito abierto los items se difieren sin intentarlos."""
         for item in work_items:
-            display_item = f"{item[0]} - {item[1]}" if isinstance(item, tuple) else str(item)
-            print(f"\n[{display_item}]")
+            if cola.circuito.abierto:
+                print(f"\n[{self.describir_item(item)}] ⏸ Circuito abierto, se difiere")
+                cola.posponer(item)
+                continue
+            print(f"\n[{self.describir_item(item)}]")
+            self.entregar_resultado(item, self.procesar_con_sesion(item), destino)
+
+    def _reintentar_diferidos(self, cola, destino, registrar):
+        """
+        Rondas de reintento de los items diferidos (un item a la vez), con
+        backoff entre rondas. Lo que siga diferido al final queda con error.
+        """
+        # Una ronda más que reintentos: los items pospuestos por el circuito no gastaron intento
+        for ronda in range(1, cola.politica.intentos + 1):
+            diferidos = cola.tomar_diferidos()
+            if not diferidos:
+                return
+            print(f"\n[{self.reporte_nombre}] Reintentando {len(diferidos)} items diferidos")
+            cola.esperar_ronda(ronda)
+            self._run_flujo_secuencial(diferidos, destino, cola)
+            self.drenar_despacho()
+
+        for item in cola.tomar_diferidos():
+            registrar(item, cola.ultimo_error(item) or
+                      ResultadoItem(ESTADO_ERROR, error="Circuito abierto: el item no se intentó"))
+
+    def procesar_con_sesion(self, work_item):
+        """
+        procesar_item con sonda de sesión: antes del item verifica que la sesión
+        siga sana y, si el item falló porque la sesión se cayó, la renueva y
+        vuelve a encolar el mismo item.
+        """
+        self._verificar_sesion()
+        resultado = self.procesar_item(work_item)
+        while (isinstance(resultado, ResultadoItem) and resultado.estado == ESTADO_ERROR
+               and not self._sesion_sana(profunda=True) and self._renovar_sesion()):
+            print(f"  ↻ Reintentando [{self.describir_item(work_item)}] con la sesión renovada")
+            resultado = self.procesar_item(work_item)
+        return resultado
+
+    # =======================================================================
+    # -- SALUD DE LA SESIÓN --
+    # =======================================================================
+
+    def _sesion_sana(self, profunda=False) -> bool:
+        try:
+            return self.session_manager.sesion_sana(profunda=profunda)
+        except Exception:
+            return False
+
+    def _verificar_sesion(self) -> bool:
+        """Sonda barata entre items. True si hubo que renovar la sesión."""
+        if self._sesion_sana():
+            return False
+        return self._renovar_sesion()
+
+    def _renovar_sesion(self) -> bool:
+        """Re-login (o navegador nuevo) a mitad de ejecución; deja el formulario abierto de nuevo."""
+        if self._renovaciones >= SESION_MAX_RENOVACIONES:
+            print(f"[{self.platform_name}] ✗ Sesión caída y sin renovaciones disponibles ({SESION_MAX_RENOVACIONES})")
+            return False
+        self._renovaciones += 1
+        print(f"[{self.platform_name}] ⚠ Sesión caída, renovando ({self._renovaciones}/{SESION_MAX_RENOVACIONES})...")
+
+        # Las pestañas vuelven al pool: si se reinicia el navegador, el pool se vacía
+        self.cerrar()
+        self._results_window_handle = None
+        try:
+            with self._fase("renovar_sesion"):
+                self.driver = self.session_manager.renovar_sesion(log_fn=print)
+                self.preparar_formulario()
+        except Exception as e:
+            print(f"[{self.platform_name}] ✗ No se pudo renovar la sesión: {e}")
+            return False
+        print(f"[{self.platform_name}] ✓ Sesión renovada")
+        return True
+
+    def planificar_items(self, work_items) -> list:
+        """
+        Cruza los work items con el manifiesto de la ejecución.
+
+        Al reanudar, toma la lista exacta que había quedado registrada para
+        este reporte. En todos los casos omite los items ya completados y
+        los de días cerrados que ya están descargados (caché de descargas).
+        """
+        work_items = self._omitir_dias_cerrados(work_items)
+        manifiesto = get_manifiesto()
+        if manifiesto.reanudando:
+            registrados = manifiesto.items_registrados(self.reporte_nombre)
+            if registrados is not None:
+                work_items = registrados
+
+        manifiesto.registrar_items(self.reporte_nombre, work_items)
+        pendientes = manifiesto.filtrar_completados(self.reporte_nombre, work_items)
+
+        omitidos = len(work_items) - len(pendientes)
+        if omitidos:
+            print(f"[{self.reporte_nombre}] {omitidos} items ya completados, se omiten")
+        return pendientes
+
+    def entregar_resultado(self, work_item, resultado, destino):
+        """
+        Llama destino(work_item, ResultadoItem) con el resultado final del item:
+        en el momento, o al terminar su despacho si 'resultado' es un Future.
+        """
+        if isinstance(resultado, Future):
+            resultado.add_done_callback(lambda futuro: destino(work_item, self._resultado_de_futuro(futuro)))
+        else:
+            destino(work_item, resultado)
+
+    @staticmethod
+    def _resultado_de_futuro(futuro) -> ResultadoItem:
+        try:
+            return futuro.result()
+        except Exception as e:
+            print(f"  ✗ Error en despacho: {e}")
+            return ResultadoItem(ESTADO_ERROR, error=str(e))
+
+    def drenar_despacho(self):
+        """Espera a que terminen los despachos en segundo plano (sus resultados ya quedan entregados)."""
+        despacho, self._despacho = self._despacho, None
+        if despacho is not None:
+            despacho.drenar()
+
+    def registrar_resultado(self, work_item, resultado):
+        """Guarda el resultado del item en el manifiesto (checkpoint) y en la caché de descargas."""
+        try:
+            get_manifiesto().marcar(self.reporte_nombre, work_item, resultado)
+        except Exception as e:
+            print(f"  ⚠ No se pudo actualizar el manifiesto: {e}")
+        try:
+            get_cache().registrar(self.reporte_nombre, work_item, resultado)
+        except Exception as e:
+            print(f"  ⚠ No se pudo actualizar la caché de descargas: {e}")
+
+    def _omitir_dias_cerrados(self, work_items) -> list:
+        """
+        Quita los items de días cerrados (anteriores a hoy - dias_finales) que ya
+        no hace falta pedir: "sin datos" registrado en la caché, o el archivo
+        presente en todos sus destinos, siempre que se haya obtenido con el día
+        ya cerrado. --force (CACHE_FORZAR) no omite nada.
+        """
+        if self.dias_finales is None or CACHE_FORZAR:
+            return work_items
+        limite = date.today() - timedelta(days=self.dias_finales)
+        cerrados = [item for item in work_items if self._desempaquetar_item(item)[0].date() < limite]
+        if not cerrados:
+            return work_items
+
+        try:
+            conocidos = get_cache().consultar(self.reporte_nombre, cerrados)
+        except Exception as e:
+            print(f"  ⚠ No se pudo leer la caché de descargas: {e}")
+            conocidos = {}
+
+        presentes = {repr(item) for item in cerrados if self._ya_descargado(item, conocidos.get(clave_item(item)))}
+        if presentes:
+            print(f"[{self.reporte_nombre}] {len(presentes)} items de días cerrados ya descargados, "
+                  f"se omiten (--force para repetirlos)")
+        return [item for item in work_items if repr(item) not in presentes]
+
+    def _ya_descargado(self, work_item, registro) -> bool:
+        """
+        True si el item respondió "sin datos" o su archivo está en todos sus destinos,
+        registrado (o modificado, si no está en la caché) desde fecha + dias_finales:
+        lo obtenido con el día todavía abierto se vuelve a pedir.
+        """
+        fecha_dt, item_kwargs = self._desempaquetar_item(work_item)
+        cierre = fecha_dt.date() + timedelta(days=self.dias_finales)
+
+        estado, destinos, actualizado = registro or (None, [], None)
+        if actualizado is not None and actualizado.date() < cierre:
+            return False
+        if estado == ESTADO_SIN_DATOS:
+            return True
+        if destinos:
+            return all(Path(destino).exists() for destino in destinos)
+
+        # Sin registro (ej. descargado antes de la caché): destinos según routes.yaml
+        nombre = self.generate_filename(fecha_dt, **item_kwargs)
+        extension = self.config.get('extension', '.csv')
+        if not nombre.endswith(extension):
+            nombre += extension
+        destinos = [Path(destino) for destino in self.get_destination_paths(nombre, fecha_dt, **item_kwargs)]
+        return bool(destinos) and all(
+            destino.exists() and date.fromtimestamp(destino.stat().st_mtime) >= cierre for destino in destinos
+        )
+
+    def _run_flujo_por_rangos(self, work_items, destino, cola):
+        """
+        Modo rango: un solo envío por grupo de días consecutivos, dividido luego por fecha.
+        Cada resultado se entrega a destino(work_item, ResultadoItem). Con el circuito
+        abierto los días del grupo se difieren sin intentarlos.
+        """
+        for grupo in self._agrupar_en_rangos(work_items):
+            primero, ultimo = self.describir_item(grupo[0]), self.describir_item(grupo[-1])
+            etiqueta = primero if len(grupo) == 1 else f"{primero} → {ultimo}"
+            if cola.circuito.abierto:
+                print(f"\n[{etiqueta}] ⏸ Circuito abierto, se difiere")
+                for item in grupo:
+                    cola.posponer(item)
+                continue
+            print(f"\n[{etiqueta}]" if len(grupo) == 1 else f"\n[{etiqueta}] ({len(grupo)} días)")
+            if len(grupo) == 1:
+                self.entregar_resultado(grupo[0], self.procesar_con_sesion(grupo[0]), destino)
+                continue
+
+            self._verificar_sesion()
+            self._item_actual = f"{primero} → {ultimo}"
+            inicio = time.time()
             try:
-                self._descargar_para_item(item)
+                with self._fase("rango"):
+                    resultados_grupo = self._descargar_rango(grupo)
             except Exception as e:
                 print(f"  ✗ Error: {e}")
-                continue
+                resultados_grupo = [(item, ResultadoItem(ESTADO_ERROR, error=str(e))) for item in grupo]
+            finally:
+                self._item_actual = None
 
-    def _descargar_para_item(self, work_item):
-        """Descarga un solo item (fecha o fecha+producto/usuario)."""
-        # Desempaquetar work item
+            # Cada día del rango cuenta como un item (con la duración repartida)
+            duracion_por_item = (time.time() - inicio) / len(grupo)
+            for item in grupo:
+                get_metricas().registrar(FASE_ITEM, duracion_por_item, reporte=self.reporte_nombre,
+                                         item=self.describir_item(item))
+
+            for item, resultado in resultados_grupo:
+                self.entregar_resultado(item, resultado, destino)
+
+    # =======================================================================
+    # -- MODO PESTAÑAS (varios formularios en el mismo navegador) --
+    # =======================================================================
+    # Fase 1: cada pestaña llena y envía su item; el formulario abre los
+    # resultados en una pestaña nueva, que queda anotada en el envío sin
+    # cambiar a ella. Fase 2: en orden, se pasa a cada pestaña de resultados
+    # y se descarga (una descarga a la vez, cada una en su directorio),
+    # mientras el servidor ya generó o sigue generando los siguientes.
+
+    def _usar_modo_pestanas(self, work_items) -> bool:
+        return self.pestanas > 1 and self.motor != 'http' and len(work_items) > 1
+
+    def _run_flujo_pestanas(self, work_items, destino, cola):
+        """
+        Modo pestañas: envía una tanda de items (uno por pestaña) y después los descarga.
+        Cada resultado se entrega a destino(work_item, ResultadoItem).
+        """
+        handles = self._abrir_pestanas_formulario(min(self.pestanas, len(work_items)))
+        print(f"[{self.reporte_nombre}] Modo pestañas: {len(handles)} formularios")
+        try:
+            pendientes = list(work_items)
+            while pendientes:
+                inicio = time.time()
+                self._form_window_handle, self._pestanas_extra = handles[0], handles[1:]
+                if self._verificar_sesion():
+                    # Las pestañas anteriores pueden no existir más: se vuelven a tomar
+                    handles = self._abrir_pestanas_formulario(len(handles))
+                if cola.circuito.abierto:
+                    # Servidor con errores seguidos: el resto queda para las rondas de reintento
+                    print(f"[{self.reporte_nombre}] ⏸ Circuito abierto, se difieren {len(pendientes)} items")
+                    for item in pendientes:
+                        cola.posponer(item)
+                    break
+                tanda, pendientes = pendientes[:len(handles)], pendientes[len(handles):]
+
+                envios = [self._enviar_en_pestana(handles[i], item) for i, item in enumerate(tanda)]
+                resultados_tanda = [self._recoger_de_pestana(envio) for envio in envios]
+                # Una pestaña perdida se reemplaza en return_to_form: seguir con la nueva
+                for i, envio in enumerate(envios):
+                    handles[i] = envio['pestana']
+
+                # Los items de la tanda se solapan: cada uno cuenta con la duración repartida
+                duracion_por_item = (time.time() - inicio) / len(tanda)
+                for item, resultado in zip(tanda, resultados_tanda):
+                    get_metricas().registrar(FASE_ITEM, duracion_por_item, reporte=self.reporte_nombre,
+                                             item=self.describir_item(item))
+                    self.entregar_resultado(item, resultado, destino)
+        finally:
+            self._form_window_handle, self._pestanas_extra = handles[0], handles[1:]
+            self._results_window_handle = None
+            try:
+                self.driver.switch_to.window(self._form_window_handle)
+            except Exception:
+                pass
+
+    def _abrir_pestanas_formulario(self, cantidad) -> list:
+        """
+        Handles de 'cantidad' pestañas del formulario, distintas entre sí: la actual
+        (o una nueva si no hay) más las del pool o nuevas.
+        """
+        handles = []
+        try:
+            if self._form_window_handle is None:
+                self.navegar_a_reporte()
+            handles.append(self._form_window_handle)
+            while len(handles) < cantidad:
+                # Las pestañas ya tomadas no se pueden volver a entregar desde el pool
+                self.navegar_a_reporte(excluir=handles)
+                handles.append(self._form_window_handle)
+        except Exception as e:
+            if not handles:
+                raise
+            print(f"  ⚠ Solo {len(handles)} pestañas de formulario disponibles: {e}")
+        finally:
+            if handles:
+                self._form_window_handle = handles[0]
+        return handles
+
+    def _enviar_en_pestana(self, handle, work_item) -> dict:
+        """Fase 1: llena y envía el formulario en su pestaña y anota la pestaña de resultados."""
+        print(f"\n[{self.describir_item(work_item)}] Enviando...")
+        envio = {'item': work_item, 'pestana': handle, 'resultados': None, 'resultado': None}
+        fecha_dt, item_kwargs = self._desempaquetar_item(work_item)
+        fecha_sistema = fecha_dt.strftime('%Y/%m/%d')
+
+        self._item_actual = self.describir_item(work_item)
+        self._form_window_handle = handle
+        try:
+            self.driver.switch_to.window(handle)
+            if self._enviar_formulario(fecha_sistema, fecha_sistema, **item_kwargs):
+                # Se espera la pestaña antes del próximo envío: así cada una queda con su item
+                with self._fase("wait_for_results_tab"):
+                    self.wait_for_results_tab(activar=False)
+                envio['resultados'], self._results_window_handle = self._results_window_handle, None
+            else:
+                print(f"  ⓘ Sin datos")
+                envio['resultado'] = ResultadoItem(ESTADO_SIN_DATOS)
+        except Exception as e:
+            print(f"  ✗ Error en envío: {e}")
+            envio['resultado'] = ResultadoItem(ESTADO_ERROR, error=str(e))
+            self.return_to_form()
+        finally:
+            envio['pestana'] = self._form_window_handle
+            self._item_actual = None
+        return envio
+
+    def _recoger_de_pestana(self, envio):
+        """
+        Fase 2: descarga desde la pestaña de resultados del envío y la cierra.
+
+        Returns:
+            ResultadoItem, o un Future[ResultadoItem] (ver entregar_resultado)
+        """
+        if envio['resultado'] is not None:
+            return envio['resultado']
+
+        print(f"\n[{self.describir_item(envio['item'])}] Descargando...")
+        fecha_dt, item_kwargs = self._desempaquetar_item(envio['item'])
+        self._item_actual = self.describir_item(envio['item'])
+        self._form_window_handle = envio['pestana']
+        self._results_window_handle = envio['resultados']
+        try:
+            try:
+                # Sin pestaña de resultados, el "no data" se busca en la del formulario
+                self.driver.switch_to.window(envio['resultados'] or envio['pestana'])
+                if envio['resultados'] and self.lean_config:
+                    self.driver.bloquear_urls(self.lean_config['bloquear'])
+                archivo_descargado = self._descargar_desde_resultados()
+            except Exception as e:
+                print(f"  ✗ Error en descarga: {e}")
+                return ResultadoItem(ESTADO_ERROR, error=str(e))
+            finally:
+                with self._fase("return_to_form"):
+                    self.return_to_form()
+                envio['pestana'] = self._form_window_handle
+
+            try:
+                # Una descarga inválida se pide de nuevo desde el formulario de esta pestaña
+                archivo_descargado, validacion = self._validar_o_redescargar(
+                    archivo_descargado, fecha_dt, fecha_dt, **item_kwargs
+                )
+            except Exception as e:
+                print(f"  ✗ Error en descarga: {e}")
+                return ResultadoItem(ESTADO_ERROR, error=str(e))
+            finally:
+                envio['pestana'] = self._form_window_handle
+
+            if archivo_descargado is None:
+                print(f"  ⓘ Sin datos")
+                return ResultadoItem(ESTADO_SIN_DATOS)
+            return self._resultado_de_archivo(archivo_descargado, fecha_dt, validacion=validacion, **item_kwargs)
+        finally:
+            self._item_actual = None
+
+    def _agrupar_en_rangos(self, work_items):
+        """
+        Agrupa work items del mismo producto/usuario en rangos de días consecutivos,
+        de a lo sumo 'max_dias' días cada uno.
+        """
+        max_dias = int(self.rango_config.get('max_dias', 31))
+
+        por_valor = {}
+        for item in work_items:
+            valor = item[1] if isinstance(item, tuple) else None
+            por_valor.setdefault(valor, []).append(item)
+
+        grupos = []
+        for items in por_valor.values():
+            items = sorted(items, key=lambda it: self._desempaquetar_item(it)[0])
+            grupo, anterior = [], None
+            for item in items:
+                fecha_dt = self._desempaquetar_item(item)[0]
+                consecutivo = anterior is not None and (fecha_dt - anterior).days == 1
+                if grupo and (not consecutivo or len(grupo) >= max_dias):
+                    grupos.append(grupo)
+                    grupo = []
+                grupo.append(item)
+                anterior = fecha_dt
+            if grupo:
+                grupos.append(grupo)
+        return grupos
+
+    def _descargar_rango(self, grupo) -> list:
+        """
+        Descarga todo el rango del grupo con un solo envío y lo divide en archivos diarios.
+
+        Returns:
+            Lista de tuplas (work_item, ResultadoItem o Future), una por día del grupo
+        """
+        fechas = [self._desempaquetar_item(item)[0] for item in grupo]
+        _, item_kwargs = self._desempaquetar_item(grupo[0])
+
+        try:
+            archivo, _ = self._obtener_archivo_validado(fechas[0], fechas[-1], **item_kwargs)
+        except SesionExpiradaError:
+            raise
+        except Exception as e:
+            print(f"  ✗ Error en descarga: {e}")
+            return [(item, ResultadoItem(ESTADO_ERROR, error=str(e))) for item in grupo]
+
+        if archivo is None:
+            print(f"  ⓘ Sin datos")
+            return [(item, ResultadoItem(ESTADO_SIN_DATOS)) for item in grupo]
+
+        with self._fase("dividir_csv"):
+            partes = dividir_csv_por_fecha(
+                archivo,
+                self.rango_config['columna_fecha'],
+                [f.date() for f in fechas],
+                separador=self.rango_config.get('separador', ','),
+                formato_fecha=self.rango_config.get('formato_fecha'),
+            )
+        archivo.unlink()
+        if not partes and archivo.parent != self.driver.download_dir:
+            eliminar_directorio_si_vacio(archivo.parent)
+
+        resultados = []
+        for item, fecha_dt in zip(grupo, fechas):
+            parte = partes.get(fecha_dt.date())
+            if parte is None:
+                print(f"  ⓘ {fecha_dt:%Y-%m-%d}: sin datos")
+                resultados.append((item, ResultadoItem(ESTADO_SIN_DATOS)))
+            else:
+                resultados.append((item, self._resultado_de_archivo(parte, fecha_dt, **item_kwargs)))
+        return resultados
+
+    def preparar_formulario(self):
+        """Deja el scraper listo para procesar items (abre el formulario si el motor lo requiere)."""
+        # Con motor HTTP el formulario solo se abre si hace falta el fallback
+        if self.motor != 'http' and not self._usar_formulario_abierto():
+            with self._fase("navegar_a_reporte"):
+                self.navegar_a_reporte()
+
+    def _usar_formulario_abierto(self) -> bool:
+        """True si la pestaña del formulario (propia o adoptada) sigue abierta; la activa."""
+        handle = self._form_window_handle
+        if handle is None or handle not in self.driver.window_handles:
+            return False
+        self.driver.switch_to.window(handle)
+        return True
+
+    @staticmethod
+    def describir_item(work_item) -> str:
+        """Texto legible de un work item para los logs."""
+        return f"{work_item[0]} - {work_item[1]}" if isinstance(work_item, tuple) else str(work_item)
+
+    def _desempaquetar_item(self, work_item):
+        """Convierte un work item en (fecha_dt, item_kwargs)."""
         if isinstance(work_item, tuple):
             fecha = work_item[0]
-            config = ROUTES.get(self.reporte_nombre, {})
-            item_kwargs = {'usuario': work_item[1]} if 'usuarios' in config else {'producto': work_item[1]}
+            item_kwargs = {'usuario': work_item[1]} if 'usuarios' in self.config else {'producto': work_item[1]}
         else:
             fecha, item_kwargs = work_item, {}
 
         fecha_dt = datetime.strptime(fecha, "%Y-%m-%d") if isinstance(fecha, str) else fecha
-        fecha_sistema = fecha_dt.strftime('%Y/%m/%d')
+        return fecha_dt, item_kwargs
+
+    def _descargar_para_item(self, work_item):
+        """Descarga un solo item (fecha o fecha+producto/usuario)."""
+        fecha_dt, item_kwargs = self._desempaquetar_item(work_item)
 
         try:
-            self.fill_dates(fecha_sistema)
+            archivo_descargado, validacion = self._obtener_archivo_validado(fecha_dt, fecha_dt, **item_kwargs)
+        except SesionExpiradaError:
+            raise
+        except Exception as e:
+            print(f"  ✗ Error en descarga: {e}")
+            return ResultadoItem(ESTADO_ERROR, error=str(e))
+
+        if archivo_descargado is None:
+            print(f"  ⓘ Sin datos")
+            return ResultadoItem(ESTADO_SIN_DATOS)
+
+        return self._resultado_de_archivo(archivo_descargado, fecha_dt, validacion=validacion, **item_kwargs)
+
+    def _obtener_archivo_validado(self, fecha_desde, fecha_hasta, **item_kwargs):
+        """
+        _obtener_archivo + validación de la descarga.
+
+        Returns:
+            (Path o None, ValidacionDescarga o None si la validación está apagada)
+        """
+        archivo = self._obtener_archivo(fecha_desde, fecha_hasta, **item_kwargs)
+        return self._validar_o_redescargar(archivo, fecha_desde, fecha_hasta, **item_kwargs)
+
+    def _validar_o_redescargar(self, archivo, fecha_desde, fecha_hasta, **item_kwargs):
+        """
+        Valida la descarga; si es inválida la borra y la pide de nuevo en el
+        momento (validacion.reintentos veces), antes de que llegue a los destinos.
+
+        Raises:
+            ValueError: si la descarga sigue inválida tras los reintentos
+        """
+        if archivo is None or self.validacion_config is None:
+            return archivo, None
+
+        reintentos = int(self.validacion_config.get('reintentos', 1))
+        for intento in range(reintentos + 1):
+            with self._fase("validar_descarga"):
+                validacion = self._validar_archivo(archivo, fecha_desde, fecha_hasta)
+            if validacion.valida:
+                print(f"  ✓ Descarga válida: {validacion.resumen()}")
+                return archivo, validacion
+
+            print(f"  ✗ Descarga inválida ({archivo.name}): {'; '.join(validacion.errores)}")
+            archivo.unlink(missing_ok=True)
+            if archivo.parent != self.driver.download_dir:
+                eliminar_directorio_si_vacio(archivo.parent)
+            if intento == reintentos:
+                break
+
+            print(f"  ↻ Descargando de nuevo ({intento + 1}/{reintentos})...")
+            archivo = self._obtener_archivo(fecha_desde, fecha_hasta, **item_kwargs)
+            if archivo is None:
+                return None, None
+
+        raise ValueError(f"Descarga inválida: {'; '.join(validacion.errores)}")
+
+    def _validar_archivo(self, archivo, fecha_desde, fecha_hasta):
+        config = self.validacion_config
+        columna_fecha = config.get('columna_fecha') or (self.rango_config or {}).get('columna_fecha')
+        return validar_descarga(
+            archivo,
+            columnas=config.get('columnas'),
+            columna_fecha=columna_fecha,
+            desde=fecha_desde.date(),
+            hasta=fecha_hasta.date(),
+            separador=config.get('separador', (self.rango_config or {}).get('separador', ',')),
+            formato_fecha=config.get('formato_fecha') or (self.rango_config or {}).get('formato_fecha'),
+        )
+
+    def _obtener_archivo(self, fecha_desde, fecha_hasta, **item_kwargs):
+        """
+        Envía el formulario para el rango indicado y descarga el resultado.
+
+        Returns:
+            Path del archivo descargado, o None si el reporte no tiene datos
+        """
+        desde_sistema = fecha_desde.strftime('%Y/%m/%d')
+        hasta_sistema = fecha_hasta.strftime('%Y/%m/%d')
+
+        if self.motor == 'http':
+            try:
+                return self._descargar_http(desde_sistema, hasta_sistema, **item_kwargs)
+            except SesionExpiradaError:
+                raise
+            except Exception as e:
+                print(f"  ⚠ Motor HTTP falló ({e}), usando navegador...")
+                self._asegurar_formulario()
+
+        return self._descargar_navegador(desde_sistema, hasta_sistema, **item_kwargs)
+
+    def _descargar_navegador(self, desde_sistema, hasta_sistema, **item_kwargs):
+        """Descarga con el navegador: llenar formulario → resultados → click en descarga."""
+        try:
+            if not self._enviar_formulario(desde_sistema, hasta_sistema, **item_kwargs):
+                return None
+
+            with self._fase("wait_for_results_tab"):
+                self.wait_for_results_tab()
+
+            return self._descargar_desde_resultados()
+
+        finally:
+            with self._fase("return_to_form"):
+                self.return_to_form()
+
+    def _enviar_formulario(self, desde_sistema, hasta_sistema, **item_kwargs) -> bool:
+        """Llena y envía el formulario de la pestaña activa. False si respondió "no data" (alert/popup)."""
+        with self._fase("fill_dates"):
+            self.fill_dates(desde_sistema, hasta_sistema)
+        with self._fase("fill_additional_fields"):
             self.fill_additional_fields(**item_kwargs)
+        with self._fase("submit_form"):
             self.submit_form()
 
-            if self.check_no_data_conditions_fast():
-                print(f"  ⓘ Sin datos")
-                return
-
-            self.wait_for_results_tab()
+        with self._fase("no_data_rapido"):
+            return not self.check_no_data_conditions_fast()
 
+    def _descargar_desde_resultados(self):
+        """Descarga desde la pestaña activa (resultados). Devuelve el Path, o None si "no data"."""
+        with self._fase("no_data_resultados"):
             if self.check_no_data_conditions():
-                print(f"  ⓘ Sin datos")
-                self.return_to_form()
-                return
+                return None
 
+        with self._fase("esperar_descarga"):
             download_elem = self.driver.esperar(By.CLASS_NAME, "download", timeout=20)
+            if self.lean_config and self.lean_config.get('ocultar_resultados'):
+                # El link ya está: no seguir cargando ni dibujando la tabla de resultados
+                self.driver.detener_carga(ocultar_selector="table")
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", download_elem)
+            # Directorio propio del item: el archivo queda ligado a este item sin ambigüedad
+            directorio_item = self.driver.preparar_descarga(self.driver.nuevo_directorio_descarga())
             download_elem.click()
 
-            archivo_descargado = self.driver.esperar_descarga(extension=".csv", timeout=60)
-            self._process_file(archivo_descargado, fecha_dt, **item_kwargs)
-            self.return_to_form()
+            return self.driver.esperar_descarga(extension=".csv", timeout=60, directorio=directorio_item)
 
+    def _descargar_http(self, desde_sistema, hasta_sistema, **item_kwargs):
+        """Descarga con el motor HTTP directo, sin usar el navegador."""
+        config = self.config
+        engine = self.session_manager.get_http_engine(log_fn=print)
+
+        with self._fase("descarga_http"):
+            return engine.descargar(
+                self.form_url,
+                self.get_date_field_ids(),
+                desde_sistema,
+                hasta_sistema,
+                self.driver.nuevo_directorio_descarga(),
+                desplegable=config.get('desplegable'),
+                valor=item_kwargs.get('producto') or item_kwargs.get('usuario'),
+            )
+
+    def _resultado_de_archivo(self, archivo_descargado, fecha_dt, validacion=None, **item_kwargs):
+        """
+        Despacha el archivo descargado. Con DESPACHO_HILOS > 0 el despacho corre en
+        segundo plano y se devuelve un Future[ResultadoItem]; si no, el ResultadoItem.
+        """
+        if DESPACHO_HILOS <= 0:
+            return self._despachar_archivo(archivo_descargado, fecha_dt, self._item_actual,
+                                           validacion=validacion, **item_kwargs)
+
+        if self._despacho is None:
+            self._despacho = DespachoArchivos(DESPACHO_HILOS, DESPACHO_MAX_PENDIENTES)
+        return self._despacho.enviar(
+            self._despachar_archivo, archivo_descargado, fecha_dt, self._item_actual,
+            validacion=validacion, **item_kwargs
+        )
+
+    def _despachar_archivo(self, archivo_descargado, fecha_dt, etiqueta_item, validacion=None,
+                           **item_kwargs) -> ResultadoItem:
+        """Procesa el archivo descargado y traduce el resultado a un ResultadoItem."""
+        # En un hilo de despacho, las fases se miden con la etiqueta del item original
+        self._item_actual = etiqueta_item
+        filas = validacion.filas if validacion else None
+        try:
+            # La validación ya calculó el hash en su pasada por el archivo
+            hash_archivo = validacion.hash if validacion else calcular_hash(archivo_descargado)
+            with self._fase("_process_file"):
+                destinos = self._process_file(archivo_descargado, fecha_dt, **item_kwargs)
         except Exception as e:
-            print(f"  ✗ Error en descarga: {e}")
-            self.return_to_form()
-    
+            print(f"  ✗ Error procesando {archivo_descargado.name}: {e}")
+            return ResultadoItem(ESTADO_ERROR, error=str(e))
+        if not destinos:
+            return ResultadoItem(ESTADO_ERROR, hash=hash_archivo, filas=filas,
+                                 error="El archivo no llegó a ningún destino")
+        return ResultadoItem(ESTADO_OK, destinos=destinos, hash=hash_archivo, filas=filas)
+
+    def _asegurar_formulario(self):
+        """Abre la pestaña del formulario si aún no está abierta (fallback del motor HTTP)."""
+        if self._form_window_handle is None:
+            self.navegar_a_reporte()
+
     def configurar_driver(self):
         """Obtiene driver con sesión activa del SessionManager."""
         self.driver = self.session_manager.get_driver(log_fn=print)
@@ -93,38 +837,71 @@ class BaseSalesys(BaseScraper):
         if not self.session_manager.is_logged_in():
             raise Exception(f"[{self.platform_name}] Sesión no establecida")
 
-    def navegar_a_reporte(self):
-        self._open_form_tab()
-        time.sleep(3)
+    def navegar_a_reporte(self, excluir=()):
+        """
+        Toma la pestaña del formulario del pool de la sesión o, si no hay, abre una.
 
-        # Si no tiene sesión, cerrar y reabrir
-        try:
-            self.driver.find_element(By.ID, "slt-userName")
-            print(f"[{self.platform_name}] [WARNING] Nueva pestaña sin sesión, reabriendo...")
-            self.driver.close()
-            self.driver.switch_to.window(self.driver.window_handles[0])
-            time.sleep(2)
+        Args:
+            excluir: Handles ya en uso por este scraper (además de sus pestañas extra)
+        """
+        en_uso = set(excluir) | set(self._pestanas_extra)
+        handle = self.session_manager.tomar_pestana(self.form_url, excluir=en_uso)
+        if handle is not None:
+            self.driver.switch_to.window(handle)
+            if self.lean_config:
+                self.driver.bloquear_urls(self.lean_config['bloquear'])
+            if self._formulario_visible():
+                self._form_window_handle = handle
+                return
+            # Pestaña del pool en otro estado: se reinicia navegando, no se cierra
+            self.driver.get(self.form_url)
+        else:
             self._open_form_tab()
-            time.sleep(2)
-        except:
-            pass
+
+        # Si no tiene sesión, recargar el formulario en la misma pestaña
+        if self._pestana_sin_sesion():
+            print(f"[{self.platform_name}] [WARNING] Pestaña sin sesión, recargando...")
+            self.driver.get(self.form_url)
+            self._pestana_sin_sesion()
 
         self._form_window_handle = self.driver.current_window_handle
 
+    def _formulario_visible(self) -> bool:
+        """True si la pestaña actual ya muestra el formulario del reporte (sin esperar)."""
+        from_id, _ = self.get_date_field_ids()
+        return bool(self.driver.find_elements(By.ID, from_id))
+
+    def _pestana_sin_sesion(self) -> bool:
+        """
+        Espera a que la pestaña muestre el formulario (campo de fecha) o el login.
+        Retorna True si cargó la página de login.
+        """
+        from_id, _ = self.get_date_field_ids()
+        encontrado = esperar_condicion(
+            self.driver,
+            alguno_presente((By.ID, from_id), (By.ID, "slt-userName")),
+            "formulario_listo",
+            ignorar_timeout=True,
+        )
+        return bool(encontrado) and encontrado[0][1] == "slt-userName"
+
     def _open_form_tab(self):
-        """Abre nueva pestaña con el formulario."""
-        self.driver.execute_script(f"window.open('{self.form_url}');")
-        WebDriverWait(self.driver, 30).until(lambda d: len(d.window_handles) >= 2)
-        self.driver.switch_to.window(self.driver.window_handles[-1])
+        """Abre nueva pestaña con el formulario (queda activa)."""
+        self.driver.switch_to.new_window('tab')
+        if self.lean_config:
+            # Pestaña vacía primero: el bloqueo de URLs debe estar activo antes de cargar
+            self.driver.bloquear_urls(self.lean_config['bloquear'])
+        self.driver.get(self.form_url)
 
-    def fill_dates(self, fecha_sistema):
+    def fill_dates(self, fecha_desde, fecha_hasta=None):
+        """Llena los campos desde/hasta (el mismo día si no se indica fecha_hasta)."""
         from_id, to_id = self.get_date_field_ids()
         fecha_from = self.driver.esperar(By.ID, from_id, timeout=30)
         fecha_from.clear()
-        fecha_from.send_keys(fecha_sistema)
+        fecha_from.send_keys(fecha_desde)
         fecha_to = self.driver.esperar(By.ID, to_id, timeout=30)
         fecha_to.clear()
-        fecha_to.send_keys(fecha_sistema)
+        fecha_to.send_keys(fecha_hasta or fecha_desde)
         self._hide_datepicker()
     
     def _hide_datepicker(self):
@@ -135,26 +912,61 @@ class BaseSalesys(BaseScraper):
             pass
     
     def submit_form(self):
+        self._handles_antes_submit = set(self.driver.window_handles)
         self.driver.click(By.ID, "subreport", timeout=30)
 
-    def wait_for_results_tab(self):
+    def wait_for_results_tab(self, activar=True):
         """
         Espera a que se abra la pestaña de resultados.
         Si aparece popup de "no data", no se abre pestaña nueva.
+
+        Args:
+            activar: False = solo registrar su handle, sin cambiar a ella (modo pestañas)
         """
+        antes = getattr(self, '_handles_antes_submit', set())
         try:
-            # Esperar a que haya 3 pestañas: original, formulario, y resultados
-            WebDriverWait(self.driver, 10).until(lambda d: len(d.window_handles) >= 3)
-            self.driver.switch_to.window(self.driver.window_handles[-1])
+            # La pestaña de resultados es la que no existía antes del submit
+            nuevas = WebDriverWait(self.driver, 10).until(lambda d: set(d.window_handles) - antes)
         except TimeoutException:
             # No se abrió pestaña nueva, probablemente "no data"
             # Permanecer en la pestaña actual del formulario
-            pass
+            return
+
+        self._results_window_handle = next(iter(nuevas))
+        if not activar:
+            return
+        self.driver.switch_to.window(self._results_window_handle)
+        if self.lean_config:
+            # La pestaña ya empezó a cargar: el bloqueo corta los recursos que faltan
+            self.driver.bloquear_urls(self.lean_config['bloquear'])
     
     def check_no_data_conditions_fast(self):
-        """Verificación rápida de "no data" después de submit (1-2s)."""
-        time.sleep(0.5)
-        return self._check_no_data(timeout=1.5, check_body=False)
+        """
+        Verificación rápida de "no data" después de submit.
+        Termina apenas aparece un alert, el popup #MGSJE con "no data" o la pestaña de resultados.
+        """
+        respuesta = esperar_condicion(self.driver, self._respuesta_submit, "respuesta_submit", ignorar_timeout=True)
+        if respuesta in ("alerta", "popup"):
+            return self._check_no_data(timeout=0, check_body=False)
+        return False
+
+    def _respuesta_submit(self, driver):
+        """Condición: tipo de respuesta visible tras el submit, o False si aún no hay ninguna."""
+        if alerta_presente(driver):
+            return "alerta"
+        if set(driver.window_handles) - getattr(self, '_handles_antes_submit', set()):
+            return "pestana"
+        try:
+            if self._es_texto_sin_datos(driver.find_element(By.ID, "MGSJE").text):
+                return "popup"
+        except NoSuchElementException:
+            pass
+        return False
+
+    @staticmethod
+    def _es_texto_sin_datos(texto) -> bool:
+        texto = texto.lower()
+        return "no data" in texto or "sin datos" in texto
 
     def check_no_data_conditions(self):
         """Verifica "no data" en página de resultados (2s)."""
@@ -193,49 +1005,148 @@ class BaseSalesys(BaseScraper):
         return False
     
     def return_to_form(self):
-        """Vuelve a la pestaña del formulario, cierra resultados si existen."""
+        """Vuelve a la pestaña del formulario, cierra la de resultados si se abrió."""
+        resultados, self._results_window_handle = self._results_window_handle, None
         try:
-            if len(self.driver.window_handles) > 2:
+            abiertas = self.driver.window_handles
+            if resultados is not None and resultados in abiertas:
+                self.driver.switch_to.window(resultados)
                 self.driver.close()
-            self.driver.switch_to.window(self._form_window_handle)
-        except:
-            if len(self.driver.window_handles) >= 2:
-                self.driver.switch_to.window(self.driver.window_handles[1])
+            if self._form_window_handle in abiertas:
+                self.driver.switch_to.window(self._form_window_handle)
+            else:
+                self.navegar_a_reporte()
+        except Exception as e:
+            print(f"  ⚠ No se pudo volver al formulario: {e}")
 
-    def _process_file(self, archivo_descargado, fecha_dt, **kwargs):
+    def _process_file(self, archivo_descargado, fecha_dt, **kwargs) -> list:
+        """
+        Renombra el archivo descargado y lo distribuye a sus destinos.
+
+        Returns:
+            Lista de destinos escritos (todos), o vacía si no se pudo renombrar
+
+        Raises:
+            OSError: si algún destino no se escribió (la copia local se conserva)
+        """
         if not archivo_descargado:
             print(f"[WARNING] No se detectó ninguna descarga.")
-            return
+            return []
         nuevo_nombre = self.generate_filename(fecha_dt, **kwargs)
         if not nuevo_nombre.endswith(archivo_descargado.suffix):
              nuevo_nombre += archivo_descargado.suffix
-        new_path = self.driver.download_dir / nuevo_nombre
+        new_path = archivo_descargado.parent / nuevo_nombre
         if not renombrar_archivo(archivo_descargado, new_path, log_fn=print):
              print(f"[ERROR] No se pudo renombrar el archivo '{archivo_descargado.name}'.")
-             return
-        destinos = self.get_destination_paths(nuevo_nombre, fecha_dt, **kwargs)
-        for i, dest in enumerate(destinos):
+             return []
+
+        # Carga en BD desde la copia local, antes de moverla a la carpeta de red
+        if self.bd_config:
             try:
-                dest.parent.mkdir(parents=True, exist_ok=True)
-                if i == 0:
-                    shutil.move(new_path, dest)
-                else:
-                    shutil.copy2(destinos[0], dest)
+                self._cargar_en_bd(new_path, fecha_dt, **kwargs)
+            except Exception as e:
+                print(f"  ✗ Error cargando en BD: {e}")
+                if self.bd_config.get('requerido'):
+                    raise
+
+        parquet_local = self._generar_parquet(new_path) if self.parquet_config is not None else None
+
+        # Todos los destinos se escriben en paralelo desde la copia local (nunca desde
+        # otro destino en la red), cada uno de forma atómica
+        destinos = self.get_destination_paths(nuevo_nombre, fecha_dt, **kwargs)
+        escritos = []
+        for dest, error in distribuir_archivo(new_path, destinos).items():
+            if error is None:
+                escritos.append(dest)
                 # Mostrar solo el nombre del archivo, no la ruta completa
                 print(f"  ✓ {nuevo_nombre}")
-            except Exception as e:
-                print(f"  ✗ Error moviendo archivo: {e}")
+            else:
+                print(f"  ✗ Error moviendo archivo: {error}")
+
+        if parquet_local is not None:
+            self._distribuir_parquet(parquet_local, escritos)
+
+        # La copia local es la única completa mientras falte algún destino: se conserva
+        # y el item queda con error (se reintenta y no entra en la caché de descargas)
+        if not destinos or len(escritos) < len(destinos):
+            print(f"  ⚠ Copia local conservada: {new_path}")
+            raise OSError(f"El archivo llegó a {len(escritos)} de {len(destinos)} destinos")
+
+        new_path.unlink(missing_ok=True)
+        # Borrar el directorio propio del item una vez vacío
+        if archivo_descargado.parent != self.driver.download_dir:
+            eliminar_directorio_si_vacio(archivo_descargado.parent)
+        return escritos
     
+    def _cargar_en_bd(self, archivo, fecha_dt, producto=None, usuario=None, **kwargs):
+        """Carga el CSV en la tabla del reporte (routes.yaml: bd) e informa el rendimiento."""
+        # Import local: SQLAlchemy/pyodbc solo hacen falta si algún reporte usa 'bd'
+        from utils.db_loader import get_cargador_bd
+
+        tabla = self.bd_config.get('tabla', self.reporte_nombre)
+        with self._fase("carga_bd"):
+            stats = get_cargador_bd().cargar(
+                archivo,
+                tabla,
+                fecha_reporte=fecha_dt,
+                clave=producto or usuario or '',
+                separador=self.bd_config.get('separador', ','),
+                encoding=self.bd_config.get('encoding', 'utf-8-sig'),
+                esquema=self.bd_config.get('esquema'),
+                tamano_lote=self.bd_config.get('tamano_lote'),
+            )
+        print(f"  ✓ BD {tabla}: {stats['filas']:,} filas en {stats['lotes']} lotes de {stats['tamano_lote']:,} "
+              f"({stats['segundos']:.1f}s, {stats['filas_por_segundo']:,.0f} filas/s)")
+
+    def _generar_parquet(self, archivo_csv):
+        """Convierte el CSV local a Parquet (routes.yaml: parquet). Devuelve el Path o None si falla."""
+        # Import local: pyarrow solo hace falta si algún reporte usa 'parquet'
+        from utils.parquet_tools import csv_a_parquet
+
+        destino = archivo_csv.with_suffix('.parquet')
+        try:
+            with self._fase("parquet"):
+                stats = csv_a_parquet(
+                    archivo_csv,
+                    destino,
+                    columnas=self.parquet_config.get('columnas'),
+                    separador=self.parquet_config.get('separador', ','),
+                    formato_fecha=self.parquet_config.get('formato_fecha'),
+                    compresion=self.parquet_config.get('compresion', 'zstd'),
+                    encoding=self.parquet_config.get('encoding', 'utf8'),
+                )
+        except Exception as e:
+            print(f"  ✗ Error generando Parquet: {e}")
+            return None
+
+        print(f"  ✓ Parquet: {stats['filas']:,} filas, {stats['bytes'] / 1024:,.0f} KB ({stats['segundos']:.1f}s)")
+        return destino
+
+    def _distribuir_parquet(self, parquet_local, destinos_csv):
+        """Escribe el Parquet junto a cada CSV escrito y borra la copia local."""
+        try:
+            destinos = [destino_csv.with_suffix('.parquet') for destino_csv in destinos_csv]
+            for destino, error in distribuir_archivo(parquet_local, destinos).items():
+                if error is not None:
+                    print(f"  ✗ Error copiando Parquet a {destino.parent}: {error}")
+        finally:
+            parquet_local.unlink(missing_ok=True)
+
     def cerrar(self):
-        """Cierra solo la pestaña del formulario, NO la sesión completa."""
-        if hasattr(self, '_form_window_handle'):
-            try:
-                self.driver.switch_to.window(self._form_window_handle)
-                self.driver.close()
-                if len(self.driver.window_handles) > 0:
-                    self.driver.switch_to.window(self.driver.window_handles[0])
-            except Exception as e:
-                print(f"[{self.platform_name}] [WARNING] No se pudo cerrar pestaña: {e}")
+        """Devuelve las pestañas del formulario al pool de la sesión (quedan abiertas), NO cierra la sesión."""
+        handles, self._pestanas_extra = self._pestanas_extra, []
+        if self._form_window_handle is not None:
+            handles.insert(0, self._form_window_handle)
+            self._form_window_handle = None
+        if not handles:
+            return
+        try:
+            abiertas = self.driver.window_handles
+            for handle in handles:
+                if handle in abiertas:
+                    self.session_manager.devolver_pestana(self.form_url, handle)
+        except Exception as e:
+            print(f"[{self.platform_name}] [WARNING] No se pudo devolver la pestaña: {e}")
 
     # =======================================================================
     # -- MÉTODOSABSTRACTOS (a ser implementados por los scrapers hijos) --
@@ -263,6 +1174,15 @@ class BaseSalesys(BaseScraper):
         """
         pass
     
+    # Texto de la opción seleccionada de un desplegable Chosen (o de su select original)
+    _JS_TEXTO_CHOSEN = """
+        var contenedor = document.getElementById(arguments[0]);
+        var span = contenedor && contenedor.querySelector('.chosen-single span');
+        if (span && span.textContent) { return span.textContent; }
+        var select = document.getElementById(arguments[0].replace(/_chosen$/, ''));
+        return (select && select.selectedIndex >= 0) ? select.options[select.selectedIndex].text : null;
+    """
+
     def fill_additional_fields(self, producto=None, usuario=None, **kwargs):
         """
         Implementación por defecto para llenar campos adicionales.
@@ -273,7 +1193,7 @@ class BaseSalesys(BaseScraper):
             return  # Sin desplegable que llenar
 
         # Leer configuración del desplegable desde YAML
-        desplegable_config = ROUTES.get(self.reporte_nombre, {}).get('desplegable')
+        desplegable_config = self.config.get('desplegable')
         if not desplegable_config:
             return  # No hay desplegable configurado
 
@@ -292,7 +1212,13 @@ class BaseSalesys(BaseScraper):
                 EC.element_to_be_clickable((By.XPATH, f"//li[contains(text(), '{valor}')]"))
             ).click()
 
-            time.sleep(0.5)  # Breve pausa para que se registre la selección
+            # Esperar a que la selección quede registrada en el select subyacente
+            esperar_condicion(
+                self.driver,
+                lambda d: valor in (d.execute_script(self._JS_TEXTO_CHOSEN, desplegable_id) or ''),
+                "seleccion_chosen",
+                ignorar_timeout=True,
+            )
 
         elif desplegable_tipo == 'select':
             # Select estándar HTML
@@ -0,0 +1,332 @@
+# ====================================
+# MOTOR DE DESCARGA HTTP DIRECTO (SALESYS)
+# ====================================
+# Reutiliza las cookies de la sesión Selenium para enviar los formularios
+# de reportes con un cliente HTTP keep-alive y guardar el CSV directo a disco,
+# sin pasar por pestañas, clicks ni esperas del navegador.
+
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urljoin
+import re
+import uuid
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class SesionExpiradaError(Exception):
+    """La respuesta del servidor es la página de login: la sesión ya no es válida."""
+
+
+# Elementos cuyo contenido no se muestra (no cuentan como texto visible)
+_TAGS_NO_VISIBLES = frozenset({'script', 'style', 'template', 'noscript'})
+# Elementos sin etiqueta de cierre
+_TAGS_VACIOS = frozenset({'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                          'link', 'meta', 'source', 'track', 'wbr'})
+
+
+class _FormularioParser(HTMLParser):
+    """
+    Extrae de una página HTML los formularios (action, method, campos,
+    selects con sus opciones), los links con clase 'download' y el texto
+    visible (sin scripts, estilos, plantillas ni elementos ocultos).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.formularios = []
+        self.links_descarga = []
+        self.ids = set()
+        self.texto_visible = []
+        self._form = None
+        self._select = None
+        self._option = None
+        self._oculto = None  # [tag, profundidad] del elemento no visible abierto
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: ('' if v is None else v) for k, v in attrs}
+        if self._oculto is not None:
+            if tag == self._oculto[0]:
+                self._oculto[1] += 1
+        elif tag not in _TAGS_VACIOS and (tag in _TAGS_NO_VISIBLES or 'hidden' in attrs
+                                          or 'display:none' in attrs.get('style', '').replace(' ', '')):
+            self._oculto = [tag, 1]
+
+        if attrs.get('id'):
+            self.ids.add(attrs['id'])
+
+        if tag == 'form':
+            self._form = {
+                'action': attrs.get('action', ''),
+                'method': attrs.get('method', 'get').lower(),
+                'campos': {},
+                'ids': {},
+                'selects': {},
+            }
+            self.formularios.append(self._form)
+
+        elif tag == 'a' and 'download' in attrs.get('class', '').split():
+            self.links_descarga.append(attrs.get('href', ''))
+
+        if self._form is None:
+            return
+
+        nombre = attrs.get('name')
+        if tag == 'input' and nombre:
+            tipo = attrs.get('type', 'text').lower()
+            marcado = tipo not in ('checkbox', 'radio') or 'checked' in attrs
+            if marcado and tipo not in ('button', 'image', 'reset', 'file'):
+                self._form['campos'][nombre] = attrs.get('value', '')
+            if attrs.get('id'):
+                self._form['ids'][attrs['id']] = nombre
+
+        elif tag == 'select' and nombre:
+            self._select = {'name': nombre, 'opciones': []}
+            self._form['selects'][attrs.get('id') or nombre] = self._select
+            if attrs.get('id'):
+                self._form['ids'][attrs['id']] = nombre
+
+        elif tag == 'option' and self._select is not None:
+            self._option = {'value': attrs.get('value'), 'text': '', 'selected': 'selected' in attrs}
+            self._select['opciones'].append(self._option)
+
+        elif tag == 'textarea' and nombre:
+            self._form['campos'][nombre] = ''
+
+    def handle_endtag(self, tag):
+        if self._oculto is not None and tag == self._oculto[0]:
+            self._oculto[1] -= 1
+            if not self._oculto[1]:
+                self._oculto = None
+        if tag == 'form':
+            self._form = None
+        elif tag == 'select':
+            self._select = None
+        elif tag == 'option':
+            self._option = None
+
+    def handle_data(self, data):
+        if self._option is not None:
+            self._option['text'] += data
+        if self._oculto is None:
+            self.texto_visible.append(data)
+
+    def close(self):
+        super().close()
+        # Valor por defecto de cada select: opción marcada o la primera
+        for form in self.formularios:
+            for select in form['selects'].values():
+                opciones = select['opciones']
+                if not opciones:
+                    continue
+                elegida = next((o for o in opciones if o['selected']), opciones[0])
+                form['campos'].setdefault(select['name'], self._valor_opcion(elegida))
+
+    @staticmethod
+    def _valor_opcion(opcion):
+        return opcion['value'] if opcion['value'] is not None else opcion['text'].strip()
+
+
+class SalesysHttpEngine:
+    """
+    Cliente HTTP con pool de conexiones keep-alive que reproduce el envío
+    de formularios de reportes de SalesYs.
+
+    Uso:
+        engine = SalesysHttpEngine(cookies)
+        archivo = engine.descargar(form_url, ("from", "to"), "2025/01/01", "2025/01/01", destino_dir)
+        # archivo es None si el servidor respondió "no data"
+    """
+
+    CHUNK_SIZE = 1024 * 64
+
+    def __init__(self, cookies, user_agent=None, pool_size=4, timeout=60):
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+            )
+
+        self._formularios = {}
+
+    # ====================================
+    # API PÚBLICA
+    # ====================================
+
+    def descargar(self, form_url, date_fields, fecha_desde, fecha_hasta, destino_dir,
+                  desplegable=None, valor=None):
+        """
+        Envía el formulario del reporte y guarda el CSV resultante en destino_dir.
+
+        Args:
+            form_url: URL del formulario (routes.yaml: form_url)
+            date_fields: Tupla con los IDs de los campos desde/hasta
+            fecha_desde, fecha_hasta: Fechas en formato del sistema ('%Y/%m/%d')
+            destino_dir: Directorio local donde guardar el archivo
+            desplegable: Configuración del desplegable (routes.yaml: desplegable)
+            valor: Producto/usuario a seleccionar en el desplegable
+
+        Returns:
+            Path del archivo descargado, o None si el reporte no tiene datos
+
+        Raises:
+            SesionExpiradaError: Si el servidor devolvió la página de login
+        """
+        form = self._obtener_formulario(form_url, date_fields)
+
+        datos = dict(form['campos'])
+        from_id, to_id = date_fields
+        datos[form['ids'].get(from_id, from_id)] = fecha_desde
+        datos[form['ids'].get(to_id, to_id)] = fecha_hasta
+
+        if desplegable and valor:
+            nombre, valor_form = self._resolver_desplegable(form, desplegable, valor)
+            datos[nombre] = valor_form
+
+        action = urljoin(form['url'], form['action'] or form['url'])
+        if form['method'] == 'post':
+            respuesta = self.session.post(action, data=datos, timeout=self.timeout, stream=True)
+        else:
+            respuesta = self.session.get(action, params=datos, timeout=self.timeout, stream=True)
+
+        with respuesta:
+            respuesta.raise_for_status()
+            if self._es_archivo(respuesta):
+                return self._guardar_stream(respuesta, Path(destino_dir))
+            html = respuesta.text
+            url_resultados = respuesta.url
+
+        self._verificar_sesion(html)
+        parser = self._parsear(html)
+        if self._es_sin_datos(parser):
+            return None
+
+        links = [href for href in parser.links_descarga if href and not href.startswith('javascript:')]
+        if not links:
+            raise Exception("La página de resultados no contiene un link de descarga utilizable")
+
+        with self.session.get(urljoin(url_resultados, links[0]), timeout=self.timeout, stream=True) as descarga:
+            descarga.raise_for_status()
+            if not self._es_archivo(descarga):
+                texto = descarga.text
+                self._verificar_sesion(texto)
+                if self._es_sin_datos(self._parsear(texto)):
+                    return None
+                raise Exception("El link de descarga no devolvió un archivo")
+            return self._guardar_stream(descarga, Path(destino_dir))
+
+    def close(self):
+        """Cierra el pool de conexiones."""
+        self.session.close()
+
+    # ====================================
+    # MÉTODOS INTERNOS
+    # ====================================
+
+    def _obtener_formulario(self, form_url, date_fields):
+        """Descarga y parsea el formulario una sola vez por URL."""
+        if form_url in self._formularios:
+            return self._formularios[form_url]
+
+        respuesta = self.session.get(form_url, timeout=self.timeout)
+        respuesta.raise_for_status()
+        self._verificar_sesion(respuesta.text)
+
+        parser = self._parsear(respuesta.text)
+
+        from_id = date_fields[0]
+        form = next((f for f in parser.formularios if from_id in f['ids'] or from_id in f['campos']), None)
+        if form is None:
+            raise Exception(f"No se encontró el formulario con el campo '{from_id}' en {form_url}")
+
+        form['url'] = respuesta.url
+        self._formularios[form_url] = form
+        return form
+
+    def _resolver_desplegable(self, form, desplegable, valor):
+        """
+        Traduce la selección del desplegable al par (name, value) del formulario.
+        Los desplegables Chosen envuelven un select cuyo id es el del contenedor sin '_chosen'.
+        """
+        desplegable_id = desplegable.get('id', '')
+        tipo = desplegable.get('tipo', 'select')
+        metodo = desplegable.get('metodo', 'value')
+
+        select_id = desplegable_id[:-len('_chosen')] if desplegable_id.endswith('_chosen') else desplegable_id
+        select = form['selects'].get(select_id)
+        if select is None:
+            raise Exception(f"No se encontró el desplegable '{select_id}' en el formulario")
+
+        opciones = select['opciones']
+        valor_opcion = _FormularioParser._valor_opcion
+        if tipo == 'chosen' or metodo == 'text':
+            # Mismo criterio que el flujo Selenium: texto que contiene el valor
+            elegida = next((o for o in opciones if valor in o['text']), None)
+        elif metodo == 'index':
+            indice = int(valor)
+            elegida = opciones[indice] if 0 <= indice < len(opciones) else None
+        else:
+            elegida = next((o for o in opciones if valor_opcion(o) == valor), None)
+
+        if elegida is None:
+            raise Exception(f"Opción '{valor}' no disponible en el desplegable '{select_id}'")
+        return select['name'], valor_opcion(elegida)
+
+    @staticmethod
+    def _es_archivo(respuesta):
+        disposition = respuesta.headers.get('Content-Disposition', '')
+        content_type = respuesta.headers.get('Content-Type', '').lower()
+        return 'attachment' in disposition.lower() or 'csv' in content_type or 'octet-stream' in content_type
+
+    @staticmethod
+    def _parsear(html):
+        parser = _FormularioParser()
+        parser.feed(html)
+        parser.close()
+        return parser
+
+    @staticmethod
+    def _es_sin_datos(parser):
+        """
+        Mismo criterio que el flujo Selenium (popup #MGSJE o texto de la página),
+        solo sobre el texto visible y si la página no trae links de descarga.
+        """
+        if parser.links_descarga:
+            return False
+        texto = ' '.join(parser.texto_visible).lower()
+        return 'no data' in texto or 'sin datos' in texto
+
+    @staticmethod
+    def _verificar_sesion(html):
+        if 'slt-userName' in html or 'id="extension"' in html:
+            raise SesionExpiradaError("La sesión de SalesYs expiró (se recibió la página de login)")
+
+    def _guardar_stream(self, respuesta, destino_dir):
+        """Escribe el cuerpo de la respuesta a disco por bloques."""
+        destino_dir.mkdir(parents=True, exist_ok=True)
+
+        nombre = None
+        match = re.search(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', respuesta.headers.get('Content-Disposition', ''))
+        if match:
+            nombre = Path(match.group(1)).name
+        nombre = nombre or f"descarga_{uuid.uuid4().hex[:8]}.csv"
+
+        destino = destino_dir / nombre
+        temporal = destino.with_name(destino.name + ".part")
+        with open(temporal, 'wb') as f:
+            for bloque in respuesta.iter_content(chunk_size=self.CHUNK_SIZE):
+                if bloque:
+                    f.write(bloque)
+        temporal.replace(destino)
+        return destino
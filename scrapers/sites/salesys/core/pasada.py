@@ -0,0 +1,47 @@
+# ====================================
+# PASADA ÚNICA DE REPORTES (SALESYS)
+# ====================================
+# Ejecuta varios reportes sobre la misma sesión, uno detrás de otro,
+# agrupados por formulario: los reportes con el mismo form_url corren
+# seguidos y toman la misma pestaña del pool de la sesión, que se abre una
+# sola vez. Un reporte que falla no detiene a los demás; el error se
+# informa al final.
+
+import time
+
+
+def ejecutar_pasada(scrapers, fechas, log_fn=print) -> dict:
+    """
+    Ejecuta los scrapers (misma sesión) agrupados por form_url.
+
+    Args:
+        scrapers: Instancias de BaseSalesys ya construidas
+        fechas: Fechas a procesar
+
+    Returns:
+        Dict {reporte_nombre: lista de (work_item, ResultadoItem)}
+
+    Raises:
+        Exception: al terminar la pasada, si algún reporte falló
+    """
+    grupos = {}
+    for scraper in scrapers:
+        grupos.setdefault(scraper.form_url, []).append(scraper)
+
+    log_fn(f"[Pasada] {len(scrapers)} reportes en {len(grupos)} formularios")
+    inicio = time.time()
+    resultados, fallidos = {}, {}
+
+    for grupo in grupos.values():
+        for scraper in grupo:
+            try:
+                resultados[scraper.reporte_nombre] = scraper.ejecutar(fechas=fechas) or []
+            except Exception as e:
+                fallidos[scraper.reporte_nombre] = e
+
+    items = sum(len(r) for r in resultados.values())
+    log_fn(f"[Pasada] ✓ {len(resultados)} reportes, {items} items en {time.time() - inicio:.1f}s")
+    if fallidos:
+        raise Exception("Reportes con error en la pasada: " +
+                        "; ".join(f"{nombre}: {error}" for nombre, error in fallidos.items()))
+    return resultados
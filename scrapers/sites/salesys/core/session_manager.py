@@ -3,8 +3,11 @@
 # ====================================
 
 from utils.base_session_manager import BaseSessionManager
-from utils.selenium_driver import SeleniumDriver
-from config.settings import (SALESYS_URL, SALESYS_USER, SALESYS_PASS, SALESYS_EXTENSION, SALESYS_DEVICE, MAX_LOGIN_ATTEMPTS, LOGIN_TIMEOUT)
+from .http_engine import SalesysHttpEngine
+from utils.esperas import esperar_condicion, documento_listo
+from utils.reintentos import espera_backoff
+from config.settings import (SALESYS_URL, SALESYS_USER, SALESYS_PASS, SALESYS_EXTENSION, SALESYS_DEVICE, MAX_LOGIN_ATTEMPTS, LOGIN_TIMEOUT,
+                             SALESYS_PROBE_URL, SESION_PING_TIMEOUT, ROUTES)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -15,6 +18,8 @@ class SalesYsSessionManager(BaseSessionManager):
     Gestor de sesión para plataforma SalesYs.
     """
 
+    _http_engine = None
+
     @property
     def platform_name(self) -> str:
         """Nombre de la plataforma"""
@@ -25,72 +30,167 @@ class SalesYsSessionManager(BaseSessionManager):
         Login específico de SalesYs con reintentos y verificación.
         """
         try:
-            # Crear driver
-            self._driver = SeleniumDriver()
+            # Crear driver (con perfil persistente si está configurado)
+            self._driver = self._crear_driver()
             self._log(f"[{self.platform_name}] Driver creado correctamente")
 
-            # Intentar login con reintentos
-            for attempt in range(MAX_LOGIN_ATTEMPTS):
-                self._log(f"[{self.platform_name}] Intento de login #{attempt + 1}/{MAX_LOGIN_ATTEMPTS}")
-
-                try:
-                    # Navegar a página de login
-                    self._driver.get(SALESYS_URL)
-                    
-                    # Implementación de login de Salesys
-                    self._driver.find_element(By.ID, "extension").clear()
-                    self._driver.find_element(By.ID, "extension").send_keys(SALESYS_EXTENSION)
-                    self._driver.find_element(By.ID, "deviceName").clear()
-                    self._driver.find_element(By.ID, "deviceName").send_keys(SALESYS_DEVICE)
-                    self._driver.find_element(By.ID, "submitButton").click()
-                    
-                    # Esperar a que aparezca el formulario de usuario/pass
-                    WebDriverWait(self._driver, LOGIN_TIMEOUT).until(
-                        EC.visibility_of_element_located((By.ID, "slt-userName"))
-                    )
-
-                    self._driver.find_element(By.ID, "slt-userName").clear()
-                    self._driver.find_element(By.ID, "slt-userName").send_keys(SALESYS_USER)
-                    self._driver.find_element(By.ID, "slt-userPass").clear()
-                    self._driver.find_element(By.ID, "slt-userPass").send_keys(SALESYS_PASS)
-                    self._driver.find_element(By.XPATH, "//input[@type='submit']").click()
-                    
-                    # --- VERIFICACIÓN DE LOGIN ---
-                    # Esperar un momento para que la página reaccione
-                    time.sleep(3)
-
-                    # Verificar si el login fue exitoso. Si el campo de usuario aún existe, falló.
-                    try:
-                        self._driver.find_element(By.ID, "slt-userName")
-                        # Si encuentra el elemento, el login falló. Forzamos un error para reintentar.
-                        raise Exception("Credenciales inválidas o la página de login no cambió.")
-                    except:
-                        # Si NO encuentra el elemento, el login fue exitoso.
-                        self._logged_in = True
-                        self._log(f"[{self.platform_name}] ✓ Login verificado y exitoso")
-
-                        # Esperar adicional para que las cookies/sesión se establezcan completamente
-                        time.sleep(2)
-                        return True
-
-                except Exception as e:
-                    self._log(f"[{self.platform_name}] ⚠ Intento #{attempt + 1} fallido: {e}")
-                    if attempt < MAX_LOGIN_ATTEMPTS - 1:
-                        time.sleep(2)  # Esperar antes de reintentar
-                    else:
-                        self._log(f"[{self.platform_name}] ✗ Todos los intentos de login fallaron")
+            # Sesión guardada en el perfil: si sigue vigente no hace falta el login
+            if self._restaurar_sesion():
+                self._logged_in = True
+                self._log(f"[{self.platform_name}] ✓ Sesión guardada vigente, se omite el login")
+                return True
 
-            return False
+            return self._login_con_reintentos()
 
         except Exception as e:
             self._log(f"[{self.platform_name}] ✗ Error crítico durante login: {e}")
             return False
 
+    def _relogin(self) -> bool:
+        """Login de nuevo en el navegador actual; el motor HTTP se recrea con las cookies nuevas."""
+        if self._http_engine is not None:
+            self._http_engine.close()
+            self._http_engine = None
+        try:
+            return self._login_con_reintentos()
+        except Exception as e:
+            self._log(f"[{self.platform_name}] ✗ Error durante el re-login: {e}")
+            return False
+
+    def _login_con_reintentos(self) -> bool:
+        """Completa el formulario de login de SalesYs en self._driver, con reintentos."""
+        for attempt in range(MAX_LOGIN_ATTEMPTS):
+            self._log(f"[{self.platform_name}] Intento de login #{attempt + 1}/{MAX_LOGIN_ATTEMPTS}")
+
+            try:
+                # Navegar a página de login
+                self._driver.get(SALESYS_URL)
+                
+                # Implementación de login de Salesys
+                self._driver.find_element(By.ID, "extension").clear()
+                self._driver.find_element(By.ID, "extension").send_keys(SALESYS_EXTENSION)
+                self._driver.find_element(By.ID, "deviceName").clear()
+                self._driver.find_element(By.ID, "deviceName").send_keys(SALESYS_DEVICE)
+                self._driver.find_element(By.ID, "submitButton").click()
+                
+                # Esperar a que aparezca el formulario de usuario/pass
+                WebDriverWait(self._driver, LOGIN_TIMEOUT).until(
+                    EC.visibility_of_element_located((By.ID, "slt-userName"))
+                )
+
+                self._driver.find_element(By.ID, "slt-userName").clear()
+                self._driver.find_element(By.ID, "slt-userName").send_keys(SALESYS_USER)
+                self._driver.find_element(By.ID, "slt-userPass").clear()
+                self._driver.find_element(By.ID, "slt-userPass").send_keys(SALESYS_PASS)
+                self._driver.find_element(By.XPATH, "//input[@type='submit']").click()
+                
+                # --- VERIFICACIÓN DE LOGIN ---
+                # El login fue exitoso cuando el campo de usuario desaparece de la página
+                login_aceptado = esperar_condicion(
+                    self._driver,
+                    EC.invisibility_of_element_located((By.ID, "slt-userName")),
+                    "login_verificacion",
+                    ignorar_timeout=True,
+                )
+                if not login_aceptado:
+                    raise Exception("Credenciales inválidas o la página de login no cambió.")
+
+                self._logged_in = True
+                self._log(f"[{self.platform_name}] ✓ Login verificado y exitoso")
+
+                # Esperar a que la página cargue y las cookies de sesión estén establecidas
+                esperar_condicion(
+                    self._driver,
+                    lambda d: documento_listo(d) and len(d.get_cookies()) > 0,
+                    "cookies_sesion",
+                    ignorar_timeout=True,
+                )
+                self._guardar_sesion()
+                return True
+
+            except Exception as e:
+                self._log(f"[{self.platform_name}] ⚠ Intento #{attempt + 1} fallido: {e}")
+                if attempt < MAX_LOGIN_ATTEMPTS - 1:
+                    time.sleep(espera_backoff(attempt + 1, base=2, maximo=15))  # Esperar antes de reintentar
+                else:
+                    self._log(f"[{self.platform_name}] ✗ Todos los intentos de login fallaron")
+
+        return False
+
+    def sesion_activa(self) -> bool:
+        """
+        Abre una página que requiere login: la sesión es válida si SalesYs
+        no responde con el formulario de login.
+        """
+        url = self._url_sonda()
+        if not url:
+            return False
+
+        self._driver.get(url)
+        return not (self._driver.find_elements(By.ID, "slt-userName") or self._driver.find_elements(By.ID, "extension"))
+
+    def sesion_sana(self, profunda=False) -> bool:
+        """
+        Sonda entre items, sin navegar: la pestaña actual no muestra el login.
+        Con profunda=True además hace un GET autenticado (cookies de la sesión).
+        """
+        if not super().sesion_sana():
+            return False
+        try:
+            if self._driver.find_elements(By.ID, "slt-userName") or self._driver.find_elements(By.ID, "extension"):
+                return False
+        except Exception:
+            return False
+        return self._ping_autenticado() if profunda else True
+
+    def _ping_autenticado(self) -> bool:
+        """GET a la página de sonda con las cookies actuales. Un error de red no cuenta como sesión caída."""
+        url = self._url_sonda()
+        if not url:
+            return True
+        try:
+            import requests
+            cookies = {c['name']: c['value'] for c in self.exportar_cookies()}
+            html = requests.get(url, cookies=cookies, timeout=SESION_PING_TIMEOUT).text
+        except Exception as e:
+            self._log(f"[{self.platform_name}] ⚠ Ping de sesión sin respuesta: {e}")
+            return True
+        return 'slt-userName' not in html and 'id="extension"' not in html
+
+    @staticmethod
+    def _url_sonda():
+        """Página que requiere login: SALESYS_PROBE_URL o el primer formulario de routes.yaml."""
+        return SALESYS_PROBE_URL or next(
+            (c['form_url'] for c in ROUTES.values() if isinstance(c, dict) and c.get('form_url')), None
+        )
+
+    def get_http_engine(self, log_fn=None) -> SalesysHttpEngine:
+        """
+        Obtiene el motor HTTP directo con las cookies de la sesión activa.
+
+        El login se hace una sola vez a través del navegador; el motor se crea
+        al primer uso y se reutiliza hasta el cleanup.
+        """
+        if self._http_engine is None:
+            driver = self.get_driver(log_fn=log_fn)
+            self._http_engine = SalesysHttpEngine(self.exportar_cookies(), user_agent=driver.user_agent)
+            self._log(f"[{self.platform_name}] ✓ Motor HTTP listo (cookies exportadas)")
+        return self._http_engine
+
+    def cleanup(self):
+        """Cierra el motor HTTP (si existe) y la sesión del navegador."""
+        if self._http_engine is not None:
+            self._http_engine.close()
+            self._http_engine = None
+        super().cleanup()
+
 # ====================================
 # HELPER FUNCTION
 # ====================================
-def get_salesys_session():
+def get_salesys_session(clave=None, download_dir=None):
     """
     Función helper para obtener la instancia singleton del SessionManager de SalesYs.
+
+    Con 'clave' se obtiene una sesión independiente (ej. un worker del pool paralelo).
     """
-    return SalesYsSessionManager()
+    return SalesYsSessionManager(clave=clave, download_dir=download_dir)
@@ -0,0 +1,239 @@
+# ====================================
+# POOL DE WORKERS PARALELOS (SALESYS)
+# ====================================
+# Reparte los work items de un scraper entre N procesos. Cada proceso tiene
+# su propio SeleniumDriver, su propia subcarpeta de descargas y su propia
+# sesión logueada; todos consumen de una única cola compartida, que el
+# proceso padre llena de a poco para poder aplicar reintentos y circuito.
+
+import multiprocessing
+import os
+import queue
+import time
+from pathlib import Path
+
+from config.settings import DOWNLOADS_DIR, SESSION_ID
+from scrapers.base.resultado import ResultadoItem, ESTADO_OK, ESTADO_SIN_DATOS, ESTADO_ERROR
+from utils.reintentos import ColaReintentos
+
+# Items enviados a la cola por worker sin resultado todavía: uno extra permite que el
+# despacho en segundo plano de un archivo se solape con la descarga del siguiente
+ITEMS_EN_VUELO_POR_WORKER = 2
+
+
+def ejecutar_en_paralelo(scraper_cls, fechas, workers, scraper_kwargs=None, log_fn=print):
+    """
+    Ejecuta un scraper de SalesYs repartiendo sus work items entre varios procesos.
+
+    El proceso padre reparte los items de a poco (a lo sumo ITEMS_EN_VUELO_POR_WORKER
+    por worker) y aplica la misma política de reintentos que el flujo de una sola
+    sesión: los items con error se difieren a rondas con backoff y, con el circuito
+    del reporte abierto, los items siguientes se difieren sin enviarlos a los workers.
+
+    Args:
+        scraper_cls: Clase del scraper (ej: RGAScraper)
+        fechas: Lista de fechas a procesar
+        workers: Número de procesos worker
+        scraper_kwargs: Argumentos de construcción del scraper (ej: {'productos': [...]})
+        log_fn: Función de logging
+
+    Returns:
+        Lista de tuplas (work_item, ResultadoItem)
+    """
+    scraper_kwargs = scraper_kwargs or {}
+
+    # Instancia "plantilla" solo para generar los work items (no abre navegador)
+    plantilla = scraper_cls(**scraper_kwargs)
+    work_items = plantilla.planificar_items(plantilla._get_work_items(fechas=fechas))
+    if not work_items:
+        return []
+    workers = max(1, min(workers, len(work_items)))
+
+    log_fn(f"[{plantilla.reporte_nombre}] {len(work_items)} items repartidos en {workers} workers")
+
+    # Los workers registran sus métricas bajo el mismo id de ejecución
+    os.environ.setdefault("RPA_RUN_ID", SESSION_ID)
+
+    # 'spawn' en todas las plataformas: Chrome/Selenium no son seguros tras un fork
+    ctx = multiprocessing.get_context("spawn")
+    cola_items = ctx.Queue()
+    cola_resultados = ctx.Queue()
+
+    procesos = [
+        ctx.Process(
+            target=_worker,
+            args=(numero, scraper_cls, scraper_kwargs, str(DOWNLOADS_DIR), cola_items, cola_resultados),
+            name=f"salesys-worker-{numero}",
+        )
+        for numero in range(1, workers + 1)
+    ]
+
+    inicio = time.time()
+    for proceso in procesos:
+        proceso.start()
+
+    # El manifiesto se actualiza solo en el proceso padre (un único escritor SQLite)
+    resultados = []
+    cola = ColaReintentos(plantilla.politica_reintentos, log_fn=log_fn)
+    listos = set()  # Workers con la sesión lista (avisan una sola vez, al terminar el login)
+
+    def registrar(item, resultado):
+        plantilla.registrar_resultado(item, resultado)
+        resultados.append((item, resultado))
+
+    def entregar(item, resultado):
+        # Un error con intentos disponibles no es final: el item queda diferido
+        if cola.diferir(item, resultado, exito=resultado.estado != ESTADO_ERROR):
+            log_fn(f"  ↻ [{plantilla.describir_item(item)}] Diferido para reintentar al final")
+        else:
+            registrar(item, resultado)
+
+    try:
+        activos = _repartir(work_items, workers, procesos, listos, cola_items, cola_resultados, cola, entregar,
+                            plantilla.describir_item, log_fn)
+
+        # Rondas de reintento de los items diferidos, repartidas igual que la pasada principal
+        for ronda in range(1, cola.politica.intentos + 1):
+            diferidos = cola.tomar_diferidos() if activos else []
+            if not diferidos:
+                break
+            log_fn(f"\n[{plantilla.reporte_nombre}] Reintentando {len(diferidos)} items diferidos")
+            cola.esperar_ronda(ronda)
+            activos = _repartir(diferidos, workers, procesos, listos, cola_items, cola_resultados, cola, entregar,
+                                plantilla.describir_item, log_fn)
+
+        for item in cola.tomar_diferidos():
+            registrar(item, cola.ultimo_error(item) or
+                      ResultadoItem(ESTADO_ERROR, error="Circuito abierto: el item no se intentó"))
+    finally:
+        for _ in procesos:
+            cola_items.put(None)  # Señal de fin, una por worker
+        for proceso in procesos:
+            proceso.join()
+
+    procesados = {repr(item) for item, _ in resultados}
+    for item in work_items:
+        if repr(item) not in procesados:
+            registrar(item, ResultadoItem(ESTADO_ERROR, error="No procesado (todos los workers terminaron)"))
+
+    _imprimir_resumen(plantilla.reporte_nombre, resultados, time.time() - inicio, log_fn)
+    return resultados
+
+
+def _repartir(items, workers, procesos, listos, cola_items, cola_resultados, cola, entregar, describir,
+              log_fn) -> bool:
+    """
+    Envía los items a los workers sin superar ITEMS_EN_VUELO_POR_WORKER por worker
+    y entrega cada resultado a entregar(item, resultado) hasta recibirlos todos.
+    Con el circuito abierto los items que faltan enviar se difieren; los items de
+    un worker que muere se entregan con error (y pasan a los reintentos).
+
+    Returns:
+        False si todos los workers terminaron antes de devolver los resultados
+    """
+    pendientes = list(items)
+    en_vuelo = {}     # repr(item) -> item enviado sin resultado todavía
+    tomados = {}      # número de worker -> repr de los items que está procesando
+    limite = workers * ITEMS_EN_VUELO_POR_WORKER
+
+    while pendientes or en_vuelo:
+        while pendientes and len(en_vuelo) < limite:
+            item = pendientes.pop(0)
+            if cola.circuito.abierto:
+                log_fn(f"\n[{describir(item)}] ⏸ Circuito abierto, se difiere")
+                cola.posponer(item)
+                continue
+            cola_items.put(item)
+            en_vuelo[repr(item)] = item
+        if not en_vuelo:
+            continue
+
+        try:
+            numero, item, resultado = cola_resultados.get(timeout=5)
+        except queue.Empty:
+            vivos = {numero for numero, proceso in enumerate(procesos, start=1) if proceso.is_alive()}
+            if not vivos:
+                return False
+            if len(vivos) == len(procesos):
+                continue
+            for numero in set(tomados) - vivos:
+                for clave in tomados.pop(numero) & en_vuelo.keys():
+                    entregar(en_vuelo.pop(clave),
+                             ResultadoItem(ESTADO_ERROR, error="El worker terminó durante el item"))
+            # Un worker que muere puede perder el aviso de que tomó un item: si hay un
+            # worker vivo esperando en la cola, los items sin dueño ya no están en ella
+            if any(numero in listos and not tomados.get(numero) for numero in vivos):
+                reclamados = set().union(*tomados.values())
+                for clave in en_vuelo.keys() - reclamados:
+                    entregar(en_vuelo.pop(clave),
+                             ResultadoItem(ESTADO_ERROR, error="El worker terminó durante el item"))
+            continue
+
+        if item is None:
+            listos.add(numero)
+            continue
+        if resultado is None:
+            # Aviso de que el worker tomó el item de la cola
+            tomados.setdefault(numero, set()).add(repr(item))
+            continue
+        tomados.get(numero, set()).discard(repr(item))
+        if en_vuelo.pop(repr(item), None) is not None:
+            entregar(item, resultado)
+    return True
+
+
+def _worker(numero, scraper_cls, scraper_kwargs, downloads_root, cola_items, cola_resultados):
+    """
+    Proceso worker: abre su propia sesión y procesa items hasta recibir None.
+    """
+    # Import local: el proceso hijo (spawn) carga el módulo de sesión por su cuenta
+    from .session_manager import get_salesys_session
+    from utils.metricas import get_metricas
+
+    etiqueta = f"worker-{numero}"
+    session = get_salesys_session(clave=etiqueta, download_dir=Path(downloads_root) / f"worker_{numero}")
+    scraper = scraper_cls(session_manager=session, **scraper_kwargs)
+
+    def enviar_resultado(item, resultado):
+        # Puede llamarse desde un hilo de despacho: Queue.put es seguro entre hilos
+        cola_resultados.put((numero, item, resultado))
+
+    try:
+        scraper.configurar_driver()
+        scraper.login()
+        scraper.preparar_formulario()
+        cola_resultados.put((numero, None, None))  # Sesión lista
+
+        while True:
+            item = cola_items.get()
+            if item is None:
+                break
+            # Sin resultado: avisa al padre qué item tiene este worker (por si el proceso muere)
+            cola_resultados.put((numero, item, None))
+
+            print(f"\n[{etiqueta}] [{scraper.describir_item(item)}]")
+            scraper.entregar_resultado(item, scraper.procesar_con_sesion(item), enviar_resultado)
+
+    except Exception as e:
+        # Sin sesión este worker no puede procesar nada; los items quedan para los demás
+        print(f"[{etiqueta}] ✗ Worker detenido: {e}")
+
+    finally:
+        # Los archivos ya descargados terminan de despacharse antes de salir
+        scraper.drenar_despacho()
+        scraper.cerrar()
+        session.cleanup()
+        get_metricas().flush()
+
+
+def _imprimir_resumen(reporte_nombre, resultados, duracion, log_fn):
+    """Imprime conteo por estado y throughput del pool."""
+    conteo = {ESTADO_OK: 0, ESTADO_SIN_DATOS: 0, ESTADO_ERROR: 0}
+    for _, resultado in resultados:
+        conteo[resultado.estado] = conteo.get(resultado.estado, 0) + 1
+
+    items_por_minuto = len(resultados) / (duracion / 60) if duracion > 0 else 0
+    log_fn(
+        f"[{reporte_nombre}] ✓ {conteo[ESTADO_OK]} ok, {conteo[ESTADO_SIN_DATOS]} sin datos, "
+        f"{conteo[ESTADO_ERROR]} con error en {duracion:.1f}s ({items_por_minuto:.1f} items/min)"
+    )
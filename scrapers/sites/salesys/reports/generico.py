@@ -0,0 +1,57 @@
+from scrapers.sites.salesys.core.base_salesys import BaseSalesys
+
+
+class ReporteGenerico(BaseSalesys):
+    """
+    Scraper de SalesYs armado solo desde routes.yaml.
+
+    Los work items salen directo de la entrada del reporte: fechas, o
+    fechas × opciones del desplegable ('usuarios' o las claves de 'archivos').
+    Un reporte nuevo solo necesita su bloque en routes.yaml.
+    """
+
+    def __init__(self, reporte_nombre, opciones=None, session_manager=None):
+        super().__init__(reporte_nombre=reporte_nombre, session_manager=session_manager)
+        if self.plan is None:
+            raise ValueError(f"[{reporte_nombre}] No hay configuración en routes.yaml")
+        self.opciones = self._validar_opciones(opciones)
+
+    def _opciones_disponibles(self) -> list:
+        return list(self.plan.archivos.keys())
+
+    def _opciones_default(self) -> list:
+        """Sin opciones explícitas: los 'usuarios' del YAML o todas las de 'archivos'."""
+        if self.plan.por_usuario:
+            return list(self.config.get('usuarios', []))
+        return self._opciones_disponibles()
+
+    def _validar_opciones(self, opciones) -> list:
+        if self.plan.simple is not None:
+            return []
+        opciones = list(opciones or self._opciones_default())
+        disponibles = self._opciones_disponibles()
+        invalidas = [o for o in opciones if o not in disponibles]
+        if invalidas:
+            raise ValueError(
+                f"[{self.reporte_nombre}] Opciones inválidas: {invalidas}. "
+                f"Opciones disponibles: {disponibles}"
+            )
+        return opciones
+
+    @property
+    def form_url(self) -> str:
+        return self.plan.form_url
+
+    def get_date_field_ids(self):
+        return self.plan.date_fields
+
+    def generate_filename(self, fecha_dt, producto=None, usuario=None, **kwargs):
+        return self.plan.plan_archivo(producto, usuario).nombre_archivo(fecha_dt, producto, usuario)
+
+    def get_destination_paths(self, nuevo_nombre, fecha_dt, producto=None, usuario=None, **kwargs):
+        return self.plan.plan_archivo(producto, usuario).destinos(fecha_dt, producto, usuario)
+
+    def _get_work_items(self, fechas, **kwargs) -> list:
+        if not self.opciones:
+            return list(fechas)
+        return [(fecha, opcion) for fecha in fechas for opcion in self.opciones]
@@ -0,0 +1,111 @@
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from scrapers.base.resultado import ResultadoItem, ESTADO_OK, ESTADO_SIN_DATOS, ESTADO_ERROR
+from utils.cache_descargas import CacheDescargas
+
+
+def test_guarda_ok_y_sin_datos_pero_no_errores(tmp_path):
+    cache = CacheDescargas(tmp_path / "c.sqlite3")
+    items = [("2026-03-01", "HFC"), ("2026-03-02", "HFC"), ("2026-03-03", "HFC")]
+
+    cache.registrar("rga", items[0], ResultadoItem(ESTADO_OK, destinos=[tmp_path / "hfc01.csv"], hash="abc"))
+    cache.registrar("rga", items[1], ResultadoItem(ESTADO_SIN_DATOS))
+    cache.registrar("rga", items[2], ResultadoItem(ESTADO_ERROR, error="falló"))
+
+    conocidos = cache.consultar("rga", items)
+    assert {clave: registro[:2] for clave, registro in conocidos.items()} == {
+        ("2026-03-01", "HFC"): (ESTADO_OK, [tmp_path / "hfc01.csv"]),
+        ("2026-03-02", "HFC"): (ESTADO_SIN_DATOS, []),
+    }
+    assert all(isinstance(registro[2], datetime) for registro in conocidos.values())
+    cache.close()
+
+
+def test_consulta_solo_los_items_pedidos_del_reporte(tmp_path):
+    cache = CacheDescargas(tmp_path / "c.sqlite3")
+    cache.registrar("rga", ("2026-03-01", "HFC"), ResultadoItem(ESTADO_OK, destinos=["a.csv"]))
+    cache.registrar("rga", ("2026-03-01", "FTTH"), ResultadoItem(ESTADO_OK, destinos=["b.csv"]))
+    cache.registrar("estado_agente_v2", "2026-03-01", ResultadoItem(ESTADO_OK, destinos=["c.csv"]))
+
+    # Mismo rango de fechas, pero solo el producto pedido y solo del reporte indicado
+    assert [r[:2] for r in cache.consultar("rga", [("2026-03-01", "FTTH")]).values()] == [(ESTADO_OK, [Path("b.csv")])]
+    assert list(cache.consultar("estado_agente_v2", ["2026-03-01", "2026-03-02"])) == [("2026-03-01", '')]
+    assert cache.consultar("rga", []) == {}
+    cache.close()
+
+
+def test_persiste_entre_ejecuciones_y_se_actualiza(tmp_path):
+    ruta = tmp_path / "c.sqlite3"
+    cache = CacheDescargas(ruta)
+    cache.registrar("rga", ("2026-03-01", "HFC"), ResultadoItem(ESTADO_SIN_DATOS))
+    cache.close()
+
+    cache = CacheDescargas(ruta)
+    cache.registrar("rga", ("2026-03-01", "HFC"), ResultadoItem(ESTADO_OK, destinos=["hfc01.csv"], hash="def"))
+    estado, destinos, _ = cache.consultar("rga", [("2026-03-01", "HFC")])[("2026-03-01", "HFC")]
+    assert (estado, destinos) == (ESTADO_OK, [Path("hfc01.csv")])
+    cache.close()
+
+
+# ====================================
+# DÍAS CERRADOS (BaseSalesys._omitir_dias_cerrados)
+# ====================================
+
+def _scraper_con_cache(tmp_path, monkeypatch, cache):
+    from scrapers.sites.salesys.core import base_salesys
+    from scrapers.sites.salesys.reports.estado_agente_v2 import EstadoAgenteV2Scraper
+
+    monkeypatch.setattr(base_salesys, "get_cache", lambda: cache)
+    monkeypatch.setattr(base_salesys, "CACHE_FORZAR", False)
+    scraper = EstadoAgenteV2Scraper(session_manager=object())
+    scraper.dias_finales = 2
+    scraper.get_destination_paths = lambda nombre, fecha_dt, **_: [tmp_path / "destino" / f"{fecha_dt:%Y%m%d}.csv"]
+    return scraper
+
+
+def _fechar_registro(cache, fecha, momento):
+    with cache._conn:
+        cache._conn.execute("UPDATE descargas SET actualizado = ? WHERE fecha = ?", (momento.isoformat(), fecha))
+
+
+def test_registro_del_dia_abierto_no_omite_el_dia_cerrado(tmp_path, monkeypatch):
+    cache = CacheDescargas(tmp_path / "c.sqlite3")
+    scraper = _scraper_con_cache(tmp_path, monkeypatch, cache)
+    dia = date.today() - timedelta(days=10)
+    abierto, cerrado = dia.isoformat(), (dia + timedelta(days=1)).isoformat()
+    (tmp_path / "destino").mkdir()
+    (tmp_path / "destino" / "ok.csv").write_text("Fecha\n")
+
+    # Registrados el mismo día del item: el servidor todavía podía cambiar los datos
+    cache.registrar("estado_agente_v2", abierto, ResultadoItem(ESTADO_SIN_DATOS))
+    cache.registrar("estado_agente_v2", cerrado, ResultadoItem(ESTADO_OK, destinos=[tmp_path / "destino" / "ok.csv"]))
+    _fechar_registro(cache, abierto, datetime.combine(dia, datetime.min.time()).replace(hour=23))
+    _fechar_registro(cache, cerrado, datetime.combine(dia + timedelta(days=1), datetime.min.time()))
+
+    assert scraper._omitir_dias_cerrados([abierto, cerrado]) == [abierto, cerrado]
+
+    # Registrados desde fecha + dias_finales: ya son definitivos
+    _fechar_registro(cache, abierto, datetime.combine(dia + timedelta(days=2), datetime.min.time()))
+    _fechar_registro(cache, cerrado, datetime.combine(dia + timedelta(days=3), datetime.min.time()))
+    assert scraper._omitir_dias_cerrados([abierto, cerrado]) == []
+    cache.close()
+
+
+def test_archivo_sin_registro_cuenta_segun_su_fecha_de_modificacion(tmp_path, monkeypatch):
+    cache = CacheDescargas(tmp_path / "c.sqlite3")
+    scraper = _scraper_con_cache(tmp_path, monkeypatch, cache)
+    dia = date.today() - timedelta(days=10)
+    destino = tmp_path / "destino" / f"{dia:%Y%m%d}.csv"
+    destino.parent.mkdir()
+    destino.write_text("Fecha\n")
+
+    # Copiado el día siguiente al item (antes del cierre): se vuelve a pedir
+    copiado = datetime.combine(dia + timedelta(days=1), datetime.min.time()).timestamp()
+    os.utime(destino, (copiado, copiado))
+    assert scraper._omitir_dias_cerrados([dia.isoformat()]) == [dia.isoformat()]
+
+    os.utime(destino, None)
+    assert scraper._omitir_dias_cerrados([dia.isoformat()]) == []
+    cache.close()
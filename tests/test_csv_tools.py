@@ -0,0 +1,94 @@
+from datetime import date
+
+import pytest
+
+from utils.csv_tools import dividir_csv_por_fecha, parsear_fecha
+
+
+def _escribir(ruta, texto, fin_de_linea='\n'):
+    ruta.write_bytes(texto.replace('\n', fin_de_linea).encode('latin-1'))
+    return ruta
+
+
+def test_parsear_fecha_formatos():
+    assert parsear_fecha("2026-03-05") == date(2026, 3, 5)
+    assert parsear_fecha("2026/03/05 10:20:30") == date(2026, 3, 5)
+    assert parsear_fecha("05/03/2026") == date(2026, 3, 5)
+    assert parsear_fecha("05.03.2026", formato="%d.%m.%Y") == date(2026, 3, 5)
+    assert parsear_fecha("") is None
+    assert parsear_fecha("no es fecha") is None
+
+
+def test_divide_por_dia_con_encabezado(tmp_path):
+    archivo = _escribir(tmp_path / "rango.csv", (
+        "id,Fecha,monto\n"
+        "1,2026-03-01 08:00:00,10\n"
+        "2,2026-03-02 09:00:00,20\n"
+        "3,2026-03-01 23:59:59,30\n"
+    ))
+
+    partes = dividir_csv_por_fecha(archivo, "fecha", [date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 3)])
+
+    assert set(partes) == {date(2026, 3, 1), date(2026, 3, 2)}
+    assert partes[date(2026, 3, 1)].name == "rango_20260301.csv"
+    assert partes[date(2026, 3, 1)].read_text() == (
+        "id,Fecha,monto\n1,2026-03-01 08:00:00,10\n3,2026-03-01 23:59:59,30\n"
+    )
+    assert partes[date(2026, 3, 2)].read_text() == "id,Fecha,monto\n2,2026-03-02 09:00:00,20\n"
+
+
+def test_descarta_filas_fuera_de_rango(tmp_path, capsys):
+    archivo = _escribir(tmp_path / "rango.csv", (
+        "id;fecha\n"
+        "1;2026-03-01\n"
+        "2;2026-02-28\n"
+        "3;ilegible\n"
+    ))
+
+    partes = dividir_csv_por_fecha(archivo, "fecha", [date(2026, 3, 1)], separador=';')
+
+    assert list(partes) == [date(2026, 3, 1)]
+    assert "2 filas fuera del rango" in capsys.readouterr().out
+
+
+def test_conserva_bytes_y_fin_de_linea(tmp_path):
+    # BOM UTF-8, acentos y CRLF salen tal cual en el archivo diario
+    contenido = '\ufefffecha,nombre\r\n2026-03-01,José\r\n'.encode('utf-8')
+    archivo = tmp_path / "rango.csv"
+    archivo.write_bytes(contenido)
+    salida = tmp_path / "salida"
+    salida.mkdir()
+
+    partes = dividir_csv_por_fecha(archivo, "fecha", [date(2026, 3, 1)], destino_dir=salida)
+
+    assert partes[date(2026, 3, 1)].parent == salida
+    assert partes[date(2026, 3, 1)].read_bytes() == contenido
+
+
+def test_filas_salen_con_los_bytes_del_origen(tmp_path):
+    # Comillas innecesarias, campo con salto de línea y fin de línea mezclado: nada se re-serializa
+    encabezado = '"id";"Fecha";"nota"\r\n'
+    filas = [
+        '"1";"2026-03-01";"texto"\r\n',
+        '2;2026-03-02;"con ""comillas"" y\nsalto"\r\n',
+        '"3";"2026-03-01";\n',
+        '4;2026-03-02;sin fin de línea',
+    ]
+    archivo = tmp_path / "rango.csv"
+    archivo.write_bytes((encabezado + ''.join(filas)).encode('latin-1'))
+
+    partes = dividir_csv_por_fecha(archivo, "fecha", [date(2026, 3, 1), date(2026, 3, 2)], separador=';')
+
+    assert partes[date(2026, 3, 1)].read_bytes() == (encabezado + filas[0] + filas[2]).encode('latin-1')
+    assert partes[date(2026, 3, 2)].read_bytes() == (encabezado + filas[1] + filas[3]).encode('latin-1')
+
+
+def test_columna_inexistente(tmp_path):
+    archivo = _escribir(tmp_path / "rango.csv", "id,monto\n1,10\n")
+    with pytest.raises(ValueError, match="columna de fecha"):
+        dividir_csv_por_fecha(archivo, "fecha", [date(2026, 3, 1)])
+
+
+def test_archivo_vacio(tmp_path):
+    archivo = _escribir(tmp_path / "vacio.csv", "")
+    assert dividir_csv_por_fecha(archivo, "fecha", [date(2026, 3, 1)]) == {}
@@ -0,0 +1,63 @@
+import threading
+import time
+
+import pytest
+
+from utils.despacho import DespachoArchivos
+
+
+def test_resultados_y_callbacks_antes_de_drenar():
+    despacho = DespachoArchivos(hilos=2, log_fn=lambda *_: None)
+    entregados = []
+    lock = threading.Lock()
+
+    def entregar(futuro):
+        with lock:
+            entregados.append(futuro.result())
+
+    futuros = [despacho.enviar(lambda x: x * 2, i) for i in range(10)]
+    for futuro in futuros:
+        futuro.add_done_callback(entregar)
+    despacho.drenar()
+
+    assert sorted(entregados) == [i * 2 for i in range(10)]
+    assert despacho.pendientes == 0
+
+
+def test_contrapresion_bloquea_con_la_cola_llena():
+    despacho = DespachoArchivos(hilos=1, max_pendientes=2, log_fn=lambda *_: None)
+    liberar = threading.Event()
+    despacho.enviar(liberar.wait)
+    despacho.enviar(liberar.wait)
+
+    enviado = threading.Event()
+    hilo = threading.Thread(target=lambda: (despacho.enviar(lambda: None), enviado.set()))
+    hilo.start()
+    assert not enviado.wait(0.2)
+    assert despacho.pendientes == 2
+
+    liberar.set()
+    assert enviado.wait(2)
+    hilo.join()
+    despacho.drenar()
+
+
+def test_excepcion_queda_en_el_futuro():
+    despacho = DespachoArchivos(hilos=1, log_fn=lambda *_: None)
+
+    def fallar():
+        raise OSError("share no disponible")
+
+    futuro = despacho.enviar(fallar)
+    despacho.drenar()
+    with pytest.raises(OSError, match="share no disponible"):
+        futuro.result()
+
+
+def test_drenar_espera_lo_encolado():
+    despacho = DespachoArchivos(hilos=1, log_fn=lambda *_: None)
+    terminados = []
+    for i in range(3):
+        despacho.enviar(lambda i=i: (time.sleep(0.05), terminados.append(i)))
+    despacho.drenar()
+    assert terminados == [0, 1, 2]
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+import utils.file_system as file_system
+from utils.file_system import escribir_atomico, distribuir_archivo
+
+
+@pytest.fixture
+def origen(tmp_path):
+    ruta = tmp_path / "local" / "reporte.csv"
+    ruta.parent.mkdir()
+    ruta.write_bytes(b"id,fecha\n1,2026-03-01\n")
+    return ruta
+
+
+def _sin_temporales(carpeta):
+    return not [f for f in carpeta.iterdir() if f.name.endswith(".tmp")]
+
+
+def test_hardlink_en_el_mismo_filesystem(origen, tmp_path):
+    destino = tmp_path / "red" / "sub" / "reporte.csv"
+
+    assert escribir_atomico(origen, destino) == "hardlink"
+    assert destino.read_bytes() == origen.read_bytes()
+    assert os.stat(destino).st_ino == os.stat(origen).st_ino
+    assert _sin_temporales(destino.parent)
+
+
+def test_reflink_si_el_hardlink_falla(origen, tmp_path, monkeypatch):
+    def link_falla(*_):
+        raise OSError("cross-device link")
+
+    def reflink_copia(a, b):
+        b.write_bytes(a.read_bytes())
+
+    monkeypatch.setattr(file_system.os, "link", link_falla)
+    monkeypatch.setattr(file_system.sys, "platform", "linux")
+    monkeypatch.setattr(file_system, "_reflink", reflink_copia)
+    destino = tmp_path / "red" / "reporte.csv"
+
+    assert escribir_atomico(origen, destino) == "reflink"
+    assert destino.read_bytes() == origen.read_bytes()
+
+
+def test_copia_como_ultimo_recurso(origen, tmp_path, monkeypatch):
+    def falla(*_):
+        raise OSError("no soportado")
+
+    monkeypatch.setattr(file_system.os, "link", falla)
+    monkeypatch.setattr(file_system, "_reflink", falla)
+    destino = tmp_path / "red" / "reporte.csv"
+    destino.parent.mkdir()
+    destino.write_bytes(b"version anterior")
+
+    assert escribir_atomico(origen, destino) == "copia"
+    assert destino.read_bytes() == origen.read_bytes()
+    assert os.stat(destino).st_ino != os.stat(origen).st_ino
+    assert _sin_temporales(destino.parent)
+
+
+def test_distribuir_informa_cada_destino(origen, tmp_path):
+    bloqueado = tmp_path / "no_es_carpeta"
+    bloqueado.write_text("")
+    destinos = [tmp_path / "a" / "reporte.csv", tmp_path / "b" / "reporte.csv", bloqueado / "reporte.csv"]
+
+    resultado = distribuir_archivo(origen, destinos)
+
+    assert resultado[destinos[0]] is None and resultado[destinos[1]] is None
+    assert isinstance(resultado[destinos[2]], OSError)
+    assert destinos[0].read_bytes() == destinos[1].read_bytes() == origen.read_bytes()
+    assert origen.exists()
+
+
+def test_distribuir_sin_destinos(origen):
+    assert distribuir_archivo(origen, []) == {}
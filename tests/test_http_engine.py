@@ -0,0 +1,33 @@
+from scrapers.sites.salesys.core.http_engine import SalesysHttpEngine
+
+
+def _sin_datos(html):
+    return SalesysHttpEngine._es_sin_datos(SalesysHttpEngine._parsear(html))
+
+
+def test_link_de_descarga_con_no_data_en_script_no_es_sin_datos():
+    html = """
+    <html><head><script>var MENSAJES = {vacio: "No data found"};</script></head>
+    <body>
+      <div id="MGSJE" style="display: none">No data</div>
+      <a class="btn download" href="/export?id=1">Descargar</a>
+    </body></html>
+    """
+    assert not _sin_datos(html)
+
+
+def test_mensaje_visible_sin_link_es_sin_datos():
+    assert _sin_datos('<html><body><div id="MGSJE"><p>No Data Found</p></div></body></html>')
+    assert _sin_datos("<html><body><table><tr><td>Sin datos para el rango</td></tr></table></body></html>")
+
+
+def test_texto_oculto_o_en_plantillas_no_cuenta():
+    html = """
+    <html><body>
+      <template><div>no data</div></template>
+      <div hidden><span>sin datos</span><div>anidado</div></div>
+      <style>.no-data::after { content: "no data"; }</style>
+      <p>Generando reporte...</p>
+    </body></html>
+    """
+    assert not _sin_datos(html)
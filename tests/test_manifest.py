@@ -0,0 +1,72 @@
+from scrapers.base.resultado import ResultadoItem, ESTADO_OK, ESTADO_SIN_DATOS, ESTADO_ERROR
+from utils.manifest import ManifiestoEjecucion, clave_item, item_desde_clave
+
+
+def test_clave_item_ida_y_vuelta():
+    assert clave_item("2026-03-01") == ("2026-03-01", '')
+    assert clave_item(("2026-03-01", "FIBRA")) == ("2026-03-01", "FIBRA")
+    assert item_desde_clave("2026-03-01", '') == "2026-03-01"
+    assert item_desde_clave("2026-03-01", "FIBRA") == ("2026-03-01", "FIBRA")
+
+
+def test_filtrar_completados(tmp_path):
+    manifiesto = ManifiestoEjecucion(tmp_path / "m.sqlite3", run_id="r1")
+    items = [("2026-03-01", "A"), ("2026-03-01", "B"), ("2026-03-02", "A")]
+    manifiesto.registrar_items("rga", items)
+
+    manifiesto.marcar("rga", items[0], ResultadoItem(ESTADO_OK, destinos=["x.csv"], hash="abc"))
+    manifiesto.marcar("rga", items[1], ResultadoItem(ESTADO_ERROR, error="falló"))
+    manifiesto.marcar("rga", items[2], ResultadoItem(ESTADO_SIN_DATOS))
+
+    assert manifiesto.filtrar_completados("rga", items) == [("2026-03-01", "B")]
+    # Otro reporte de la misma ejecución no comparte estado
+    assert manifiesto.filtrar_completados("estado_agente_v2", items) == items
+    manifiesto.close()
+
+
+def test_reanuda_la_ultima_ejecucion_incompleta(tmp_path):
+    ruta = tmp_path / "m.sqlite3"
+    items = ["2026-03-01", "2026-03-02", "2026-03-03"]
+
+    primera = ManifiestoEjecucion(ruta, run_id="r1")
+    primera.registrar_items("rga", items)
+    primera.marcar("rga", items[0], ResultadoItem(ESTADO_OK))
+    primera.close()  # Interrumpida: sin finalizar()
+
+    reanudada = ManifiestoEjecucion(ruta, run_id="r2", reanudar=True)
+    assert reanudada.reanudando
+    assert reanudada.run_id == "r1"
+    assert reanudada.items_registrados("rga") == items
+    assert reanudada.items_registrados("estado_agente_v2") is None
+    assert reanudada.filtrar_completados("rga", items) == items[1:]
+    reanudada.close()
+
+
+def test_no_reanuda_una_ejecucion_terminada(tmp_path):
+    ruta = tmp_path / "m.sqlite3"
+
+    primera = ManifiestoEjecucion(ruta, run_id="r1")
+    primera.registrar_items("rga", ["2026-03-01"])
+    primera.marcar("rga", "2026-03-01", ResultadoItem(ESTADO_OK))
+    primera.finalizar()
+    primera.close()
+
+    nueva = ManifiestoEjecucion(ruta, run_id="r2", reanudar=True)
+    assert not nueva.reanudando
+    assert nueva.run_id == "r2"
+    assert nueva.items_registrados("rga") is None
+    nueva.close()
+
+
+def test_terminada_con_errores_se_reanuda(tmp_path):
+    ruta = tmp_path / "m.sqlite3"
+
+    primera = ManifiestoEjecucion(ruta, run_id="r1")
+    primera.registrar_items("rga", ["2026-03-01"])
+    primera.marcar("rga", "2026-03-01", ResultadoItem(ESTADO_ERROR, error="timeout"))
+    primera.finalizar()
+    primera.close()
+
+    reanudada = ManifiestoEjecucion(ruta, run_id="r2", reanudar=True)
+    assert reanudada.run_id == "r1"
+    reanudada.close()
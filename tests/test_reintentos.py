@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from config.settings import REINTENTOS_DEFAULT
+from utils.reintentos import CircuitoReporte, ColaReintentos, PoliticaReintentos, espera_backoff
+
+
+def test_backoff_con_tope_y_jitter():
+    for intento in range(1, 8):
+        for _ in range(50):
+            espera = espera_backoff(intento, base=1, maximo=10)
+            assert 0 <= espera <= min(10, 2 ** (intento - 1))
+
+
+def test_politica_desde_config():
+    default = PoliticaReintentos.desde_config(None)
+    assert default.intentos == REINTENTOS_DEFAULT['intentos']
+    assert default.fallos_circuito == REINTENTOS_DEFAULT['circuito']['fallos']
+
+    propia = PoliticaReintentos.desde_config({'intentos': 5, 'circuito': {'pausa': 10}})
+    assert propia.intentos == 5
+    assert propia.pausa_circuito == 10
+    assert propia.fallos_circuito == REINTENTOS_DEFAULT['circuito']['fallos']
+
+    apagada = PoliticaReintentos.desde_config(False)
+    assert apagada.intentos == 1 and apagada.fallos_circuito == 0
+
+
+def test_circuito_abre_y_queda_semiabierto():
+    circuito = CircuitoReporte(umbral=2, pausa=0.1)
+    circuito.registrar(False)
+    assert not circuito.abierto
+    circuito.registrar(False)
+    assert circuito.abierto
+    assert 0 < circuito.restante() <= 0.1
+
+    time.sleep(0.15)
+    assert not circuito.abierto  # Semiabierto: deja pasar un item de prueba
+    circuito.registrar(False)
+    assert circuito.abierto      # Falló la prueba: pausa completa otra vez
+
+    circuito.registrar(True)
+    assert not circuito.abierto and circuito.restante() == 0
+
+
+def test_circuito_sin_umbral_nunca_abre():
+    circuito = CircuitoReporte(umbral=0, pausa=60)
+    for _ in range(20):
+        circuito.registrar(False)
+    assert not circuito.abierto
+
+
+def test_cola_difiere_hasta_agotar_intentos():
+    cola = ColaReintentos(PoliticaReintentos(intentos=3, fallos_circuito=0), log_fn=lambda *_: None)
+    item = ("2026-03-01", "HFC")
+
+    assert cola.diferir(item, "error 1", exito=False)
+    assert cola.tomar_diferidos() == [item]
+    assert cola.diferir(item, "error 2", exito=False)
+    assert cola.ultimo_error(item) == "error 2"
+    assert cola.tomar_diferidos() == [item]
+    # Tercer intento fallido: resultado final, no se difiere más
+    assert not cola.diferir(item, "error 3", exito=False)
+    assert cola.tomar_diferidos() == []
+
+
+def test_cola_exito_no_difiere_y_cierra_el_circuito():
+    cola = ColaReintentos(PoliticaReintentos(intentos=3, fallos_circuito=1, pausa_circuito=60),
+                          log_fn=lambda *_: None)
+    cola.diferir("2026-03-01", "error", exito=False)
+    assert cola.circuito.abierto
+
+    assert not cola.diferir("2026-03-02", "ok", exito=True)
+    assert not cola.circuito.abierto
+
+
+def test_posponer_no_gasta_intentos():
+    cola = ColaReintentos(PoliticaReintentos(intentos=2, fallos_circuito=0), log_fn=lambda *_: None)
+    cola.posponer("2026-03-01")
+    cola.posponer("2026-03-01")
+    assert cola.tomar_diferidos() == ["2026-03-01", "2026-03-01"]
+    assert cola.diferir("2026-03-01", "error", exito=False)
+    assert cola.ultimo_error("2026-03-02") is None
+
+
+@pytest.mark.parametrize("ronda", [1, 2])
+def test_esperar_ronda_respeta_el_circuito(ronda):
+    cola = ColaReintentos(PoliticaReintentos(espera_base=0, espera_max=0, fallos_circuito=1, pausa_circuito=0.1),
+                          log_fn=lambda *_: None)
+    cola.diferir("2026-03-01", "error", exito=False)
+    inicio = time.monotonic()
+    cola.esperar_ronda(ronda)
+    assert time.monotonic() - inicio >= 0.09
@@ -0,0 +1,126 @@
+from datetime import datetime
+
+import pytest
+
+from config.settings import ROUTES
+from utils.route_builder import BASE_PATH, RoutesInvalidasError, compilar_routes
+
+FORM = "http://salesys.local/form"
+
+
+def test_routes_yaml_del_repo_es_valido():
+    planes = compilar_routes(ROUTES)
+    assert set(planes) == set(ROUTES)
+
+
+def test_reporte_simple():
+    plan = compilar_routes({
+        "estado": {
+            "form_url": FORM,
+            "rutas": ["{year}/Estado Agente/{month}", "copia/{year}"],
+            "filename": "EstadoAgente{day}",
+        }
+    })["estado"]
+
+    fecha = datetime(2026, 3, 5, 14, 30)
+    assert plan.plan_archivo().nombre_archivo(fecha) == "EstadoAgente05.csv"
+    assert plan.plan_archivo().destinos(fecha) == [
+        BASE_PATH / "2026" / "Estado Agente" / "Marzo" / "EstadoAgente05.csv",
+        BASE_PATH / "copia" / "2026" / "EstadoAgente05.csv",
+    ]
+    assert plan.date_fields == ("from", "to")
+    assert plan.motor == "selenium"
+
+
+def test_reporte_con_archivos_por_producto():
+    plan = compilar_routes({
+        "rga": {
+            "form_url": FORM,
+            "desplegable": {"id": "product_chosen", "tipo": "chosen"},
+            "archivos": {
+                "HFC": {"rutas": ["{year}/Activaciones/{month}/{product}"], "filename": "{product_lower}{day}"},
+            },
+        }
+    })["rga"]
+
+    plan_hfc = plan.plan_archivo(producto="HFC")
+    assert plan_hfc.destinos(datetime(2026, 12, 1), producto="HFC") == [
+        BASE_PATH / "2026" / "Activaciones" / "Diciembre" / "HFC" / "hfc01.csv"
+    ]
+    assert plan.plan_archivo(producto="LTE") is None
+    assert not plan.por_usuario
+
+
+def test_destinos_memorizados_por_item():
+    plan = compilar_routes({"r": {"form_url": FORM, "rutas": ["{year}"], "filename": "r{day}"}})["r"]
+    plan_archivo = plan.plan_archivo()
+    plan_archivo.destinos(datetime(2026, 3, 5, 8))
+    plan_archivo.destinos(datetime(2026, 3, 5, 20))
+    assert plan_archivo._construir.cache_info().hits >= 1
+
+
+def test_errores_se_acumulan():
+    with pytest.raises(RoutesInvalidasError) as error:
+        compilar_routes({
+            "roto": {
+                "form_url": FORM,
+                "motor": "curl",
+                "rutas": ["{year}/{product}"],
+                "filename": "x{dia}",
+                "pestanas": 0,
+                "clave_inventada": True,
+            },
+            "sin_rutas": {"form_url": FORM},
+        })
+
+    errores = "\n".join(error.value.errores)
+    assert "roto: claves desconocidas ['clave_inventada']" in errores
+    assert "roto.motor: 'curl' no es válido" in errores
+    assert "'{product}'" in errores
+    assert "'{dia}'" in errores
+    assert "roto.pestanas" in errores
+    assert "sin_rutas: debe definir 'rutas' o 'archivos'" in errores
+
+
+def test_usuarios_sin_archivo():
+    with pytest.raises(RoutesInvalidasError, match="sin entrada en 'archivos': \\['Juan'\\]"):
+        compilar_routes({
+            "rechazo": {
+                "form_url": FORM,
+                "usuarios": ["Todo", "Juan"],
+                "archivos": {"Todo": {"rutas": ["{year}/{usuario}"], "filename": "rechazo{day}"}},
+            }
+        })
+
+
+@pytest.mark.parametrize("opciones, mensaje", [
+    ({"rango": {"max_dias": 5}}, "rango: se esperaba un bloque con 'columna_fecha'"),
+    ({"reintentos": {"intentos": 0}}, "reintentos.intentos"),
+    ({"reintentos": {"circuito": {"fallos": -1}}}, "reintentos.circuito"),
+    ({"validacion": {"columnas": "Fecha"}}, "validacion.columnas"),
+    ({"frescura": {"dias_finales": -1}}, "frescura"),
+    ({"parquet": "si"}, "parquet: se esperaba true/false"),
+    ({"lean": {"ocultar": True}}, "lean: claves desconocidas \\['ocultar'\\]"),
+    ({"lean": {"bloquear": "*.css"}}, "lean.bloquear: se esperaba list"),
+    ({"lean": {"bloquear": ["*.css", 3]}}, "lean.bloquear: se esperaba una lista de patrones"),
+    ({"bd": {"tabla": 3}}, "bd.tabla: se esperaba str, no int"),
+    ({"bd": {"tamano_lote": True}}, "bd.tamano_lote: se esperaba int"),
+    ({"bd": {"tamano_lote": 0}}, "bd.tamano_lote: se esperaba un entero positivo"),
+    ({"bd": {"table": "rga"}}, "bd: claves desconocidas"),
+    ({"parquet": {"compresion": ["zstd"]}}, "parquet.compresion: se esperaba str, no list"),
+    ({"parquet": {"compresion": "xz"}}, "parquet.compresion: 'xz' no es válida"),
+    ({"parquet": {"columnas": {"Fecha": "fecha"}}}, "parquet.columnas: tipos desconocidos"),
+])
+def test_opciones_invalidas(opciones, mensaje):
+    config = {"form_url": FORM, "rutas": ["{year}"], **opciones}
+    with pytest.raises(RoutesInvalidasError, match=mensaje):
+        compilar_routes({"r": config})
+
+
+def test_bloques_opcionales_validos():
+    compilar_routes({"r": {
+        "form_url": FORM, "rutas": ["{year}"],
+        "lean": {"ocultar_resultados": True, "bloquear": ["*.css"]},
+        "bd": {"tabla": "rga", "esquema": "dbo", "tamano_lote": 5000, "requerido": False},
+        "parquet": {"columnas": {"Fecha": "date", "Valor": "int64"}, "compresion": "zstd", "formato_fecha": "%d/%m/%Y"},
+    }})
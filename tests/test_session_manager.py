@@ -0,0 +1,27 @@
+import pytest
+
+from utils.base_session_manager import BaseSessionManager
+from scrapers.sites.salesys.core.session_manager import get_salesys_session
+
+
+@pytest.fixture
+def sin_sesiones(monkeypatch):
+    monkeypatch.setattr(BaseSessionManager, "_instances", {})
+
+
+def test_misma_clave_devuelve_la_misma_sesion(sin_sesiones, tmp_path):
+    session = get_salesys_session(clave="worker-1", download_dir=tmp_path / "worker_1")
+
+    assert get_salesys_session(clave="worker-1", download_dir=tmp_path / "worker_1") is session
+    assert get_salesys_session(clave="worker-1") is session
+    assert get_salesys_session(clave="worker-2", download_dir=tmp_path / "worker_2") is not session
+
+
+def test_otro_directorio_de_descargas_para_la_misma_clave_falla(sin_sesiones, tmp_path):
+    get_salesys_session(clave="worker-1", download_dir=tmp_path / "worker_1")
+    get_salesys_session()
+
+    with pytest.raises(ValueError, match="directorio de descargas"):
+        get_salesys_session(clave="worker-1", download_dir=tmp_path / "worker_2")
+    with pytest.raises(ValueError, match="directorio de descargas"):
+        get_salesys_session(download_dir=tmp_path / "worker_1")
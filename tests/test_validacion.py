@@ -0,0 +1,70 @@
+import hashlib
+from datetime import date
+
+from utils.validacion import validar_descarga
+
+
+def _escribir(ruta, texto):
+    ruta.write_bytes(texto.encode('utf-8'))
+    return ruta
+
+
+def test_csv_valido_con_rango_de_fechas(tmp_path):
+    texto = (
+        "Fecha,Agente,Nota\n"
+        "05/03/2026,ana,\"línea 1\nlínea 2\"\n"
+        "05/03/2026,luis,ok\n"
+    )
+    archivo = _escribir(tmp_path / "reporte.csv", texto)
+
+    validacion = validar_descarga(archivo, columnas=["fecha", "Agente"], columna_fecha="Fecha",
+                                  desde=date(2026, 3, 5), hasta=date(2026, 3, 5))
+
+    assert validacion.valida, validacion.errores
+    assert validacion.filas == 2  # El salto de línea entre comillas no cuenta como fila
+    assert validacion.fecha_min == validacion.fecha_max == date(2026, 3, 5)
+    assert validacion.hash == hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def test_filas_fuera_de_rango(tmp_path):
+    archivo = _escribir(tmp_path / "reporte.csv", "Fecha,Valor\n05/03/2026,1\n06/03/2026,2\n")
+
+    validacion = validar_descarga(archivo, columna_fecha="Fecha", desde=date(2026, 3, 5), hasta=date(2026, 3, 5))
+
+    assert not validacion.valida
+    assert "1 filas fuera del rango pedido" in validacion.errores[0]
+
+
+def test_csv_cortado_sin_columna_fecha(tmp_path):
+    # El parseo estricto corre siempre, aunque el reporte no declare 'columna_fecha'
+    archivo = _escribir(tmp_path / "reporte.csv", "Fecha,Nota\n05/03/2026,\"sin cerrar\n")
+
+    validacion = validar_descarga(archivo)
+
+    assert not validacion.valida
+    assert "CSV incompleto" in validacion.errores[0]
+    assert validacion.hash == hashlib.sha256(archivo.read_bytes()).hexdigest()
+
+
+def test_vacio_html_y_columnas_faltantes(tmp_path):
+    vacio = validar_descarga(_escribir(tmp_path / "vacio.csv", ""))
+    html = validar_descarga(_escribir(tmp_path / "error.csv", "<!DOCTYPE html><html><body>Error</body></html>"))
+    sin_columna = validar_descarga(_escribir(tmp_path / "ok.csv", "Fecha,Valor\n05/03/2026,1\n"),
+                                   columnas=["Fecha", "Agente"])
+
+    assert vacio.errores == ["El archivo está vacío"]
+    assert html.errores == ["El servidor devolvió una página HTML en lugar del CSV"]
+    assert sin_columna.filas == 1
+    assert "['Agente']" in sin_columna.errores[0]
+
+
+def test_html_solo_al_principio_del_archivo(tmp_path):
+    con_bom = validar_descarga(_escribir(tmp_path / "error.csv", "\ufeff\r\n  <HTML><body>Login</body></HTML>"))
+    celda_html = validar_descarga(_escribir(tmp_path / "ok.csv", (
+        "Fecha,Comentario\n"
+        "05/03/2026,\"<html><b>cliente</b> conforme</html>\"\n"
+    )), columna_fecha="Fecha", desde=date(2026, 3, 5), hasta=date(2026, 3, 5))
+
+    assert con_bom.errores == ["El servidor devolvió una página HTML en lugar del CSV"]
+    assert celda_html.valida, celda_html.errores
+    assert celda_html.filas == 1
@@ -0,0 +1,92 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from scrapers.base.resultado import ResultadoItem, ESTADO_OK, ESTADO_ERROR
+from utils.reintentos import PoliticaReintentos
+
+
+class ScraperFalso:
+    """
+    Scraper sin navegador para el pool. Comportamiento por item (marcas en MARCAS_DIR):
+      "falla"  → error en el primer intento
+      "muere"  → el proceso worker termina en el primer intento
+      "nunca"  → error en todos los intentos
+    """
+
+    reporte_nombre = "falso"
+    politica_reintentos = PoliticaReintentos(intentos=3, espera_base=0, espera_max=0, fallos_circuito=0)
+    registrados = []
+
+    def __init__(self, session_manager=None, items=()):
+        self.items = list(items)
+
+    def _get_work_items(self, fechas):
+        return self.items
+
+    def planificar_items(self, work_items):
+        return list(work_items)
+
+    def registrar_resultado(self, item, resultado):
+        ScraperFalso.registrados.append((item, resultado.estado))
+
+    @staticmethod
+    def describir_item(item):
+        return str(item)
+
+    def configurar_driver(self):
+        pass
+
+    def login(self):
+        pass
+
+    def preparar_formulario(self):
+        pass
+
+    def procesar_con_sesion(self, item):
+        marca = Path(os.environ["MARCAS_DIR"]) / item
+        primera_vez = not marca.exists()
+        marca.touch()
+        if item == "muere" and primera_vez:
+            os._exit(1)
+        if item == "nunca" or (item == "falla" and primera_vez):
+            return ResultadoItem(ESTADO_ERROR, error=f"fallo en {item}")
+        return ResultadoItem(ESTADO_OK)
+
+    def entregar_resultado(self, item, resultado, destino):
+        destino(item, resultado)
+
+    def drenar_despacho(self):
+        pass
+
+    def cerrar(self):
+        pass
+
+
+@pytest.fixture
+def entorno(tmp_path, monkeypatch):
+    monkeypatch.setenv("MARCAS_DIR", str(tmp_path))
+    # Los workers (spawn) guardan sus métricas en el directorio temporal
+    monkeypatch.setenv("RPA_ESTADO_DIR", str(tmp_path / "estado"))
+    ScraperFalso.registrados = []
+    return tmp_path
+
+
+def test_pool_reintenta_diferidos_y_recupera_items_de_un_worker_caido(entorno):
+    from scrapers.sites.salesys.core.worker_pool import ejecutar_en_paralelo
+
+    items = ["a", "b", "falla", "muere", "c", "nunca"]
+    resultados = dict(ejecutar_en_paralelo(ScraperFalso, ["2026-03-01"], 2, {"items": items},
+                                           log_fn=lambda *_: None))
+
+    assert set(resultados) == set(items)
+    assert {item: r.estado for item, r in resultados.items()} == {
+        "a": ESTADO_OK, "b": ESTADO_OK, "c": ESTADO_OK,
+        "falla": ESTADO_OK,          # Falló, quedó diferido y salió bien en la ronda 1
+        "muere": ESTADO_OK,          # Su worker murió: error, diferido y reintentado en el otro
+        "nunca": ESTADO_ERROR,       # Sin intentos disponibles: último error
+    }
+    assert resultados["nunca"].error == "fallo en nunca"
+    # Cada item se registra una sola vez, con su resultado final
+    assert sorted(item for item, _ in ScraperFalso.registrados) == sorted(items)
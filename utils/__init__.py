@@ -1,5 +1,13 @@
 # Utilidades compartidas
-
-from .selenium_driver import SeleniumDriver
+#
+# SeleniumDriver se importa al primer acceso: los módulos de utils que no
+# usan el navegador (manifiesto, métricas, rutas...) no cargan Selenium.
 
 __all__ = ['SeleniumDriver']
+
+
+def __getattr__(nombre):
+    if nombre == 'SeleniumDriver':
+        from .selenium_driver import SeleniumDriver
+        return SeleniumDriver
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
@@ -6,16 +6,25 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
+import json
 import sys
 import shutil
 import os
 
+from config.settings import CHROME_PROFILE_DIR
+
+# Cookies de la última sesión válida, guardadas dentro del perfil persistente
+ARCHIVO_COOKIES = "sesion_cookies.json"
+
+# Campos de Network.getAllCookies aceptados por Network.setCookies
+_CAMPOS_COOKIE_CDP = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
 
 class BaseSessionManager(ABC):
     """
     Gestor de sesión base para cualquier plataforma web.
 
-    Patrón Singleton: Una instancia por plataforma
+    Patrón Singleton: Una instancia por plataforma (y por clave, si se indica)
 
     Ventajas:
     - Un solo login para múltiples scrapers de la misma plataforma
@@ -28,20 +37,42 @@ class BaseSessionManager(ABC):
         driver = session.get_driver()
         # ... usar driver con sesión activa
         session.cleanup()  # Al final de todos los scrapers
+
+    Sesiones independientes (ej. un worker por proceso):
+        session = PlataformaSessionManager(clave="worker-1", download_dir=ruta)
     """
 
-    _instance = None
+    _instances = {}
     _driver = None
     _logged_in = False
 
-    def __new__(cls):
+    def __new__(cls, clave=None, download_dir=None):
         """
         Implementación del patrón Singleton.
-        Garantiza una sola instancia por clase.
+        Garantiza una sola instancia por clase y clave.
+
+        Args:
+            clave: Identificador de la sesión. None = sesión compartida de la plataforma.
+            download_dir: Directorio de descargas propio de la sesión (default: DOWNLOADS_DIR)
+
+        Raises:
+            ValueError: Si la sesión de esa clave ya existe con otro directorio de descargas
         """
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+        llave = (cls, clave)
+        instancia = BaseSessionManager._instances.get(llave)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            instancia.clave = clave
+            instancia.download_dir = download_dir
+            instancia._pestanas = {}
+            BaseSessionManager._instances[llave] = instancia
+        elif download_dir is not None and (instancia.download_dir is None
+                                           or Path(download_dir) != Path(instancia.download_dir)):
+            raise ValueError(
+                f"La sesión '{clave or 'principal'}' de {cls.__name__} ya existe con el directorio de descargas "
+                f"{instancia.download_dir or 'DOWNLOADS_DIR'}; no puede usarse con {download_dir}"
+            )
+        return instancia
 
     def get_driver(self, log_fn=None):
         """
@@ -81,9 +112,10 @@ class BaseSessionManager(ABC):
         TODO en subclase: Implementar login específico de cada plataforma.
 
         Este método debe:
-        1. Crear self._driver usando SeleniumDriver
-        2. Hacer login en la plataforma
-        3. Establecer self._logged_in = True si exitoso
+        1. Crear self._driver (self._crear_driver() usa el perfil persistente si hay)
+        2. Si self._restaurar_sesion() es True, omitir el login
+        3. Hacer login en la plataforma
+        4. Establecer self._logged_in = True si exitoso (y llamar a self._guardar_sesion())
 
         Returns:
             bool: True si login exitoso, False en caso contrario
@@ -103,6 +135,174 @@ class BaseSessionManager(ABC):
         """
         pass
 
+    def sesion_activa(self) -> bool:
+        """
+        Verificación autenticada y barata de la sesión del driver actual.
+
+        Sobrescribir en subclase (ej. abrir una página que requiere login y
+        comprobar que no redirige al formulario de login). Por defecto no se
+        puede verificar y siempre se hace el login completo.
+        """
+        return False
+
+    # ====================================
+    # PERFIL PERSISTENTE DE CHROME
+    # ====================================
+
+    def _perfil_dir(self):
+        """Carpeta de perfil persistente de esta sesión, o None si está deshabilitado."""
+        if not CHROME_PROFILE_DIR:
+            return None
+        return Path(CHROME_PROFILE_DIR) / self.platform_name.lower() / (self.clave or "principal")
+
+    def _crear_driver(self):
+        """
+        Crea el SeleniumDriver de la sesión, con perfil persistente si está configurado.
+        Si el perfil no se puede abrir (ej. bloqueado por otro Chrome) usa uno temporal.
+        """
+        from utils.selenium_driver import SeleniumDriver
+
+        perfil = self._perfil_dir()
+        if perfil is not None:
+            try:
+                return SeleniumDriver(download_dir=self.download_dir, profile_dir=perfil)
+            except Exception as e:
+                self._log(f"[{self.platform_name}] ⚠ No se pudo abrir el perfil persistente ({e}), usando perfil temporal")
+        return SeleniumDriver(download_dir=self.download_dir)
+
+    def _restaurar_sesion(self) -> bool:
+        """
+        Carga las cookies guardadas en el perfil y verifica si la sesión sigue vigente.
+
+        Returns:
+            bool: True si la sesión guardada es válida (no hace falta login)
+        """
+        perfil = self._perfil_dir()
+        if perfil is None:
+            return False
+
+        archivo = perfil / ARCHIVO_COOKIES
+        if archivo.exists():
+            try:
+                cookies = json.loads(archivo.read_text(encoding='utf-8'))
+                cookies = [
+                    {k: v for k, v in cookie.items() if k in _CAMPOS_COOKIE_CDP and not (k == "expires" and v == -1)}
+                    for cookie in cookies
+                ]
+                self._driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            except Exception as e:
+                self._log(f"[{self.platform_name}] ⚠ No se pudieron cargar las cookies guardadas: {e}")
+
+        try:
+            return self.sesion_activa()
+        except Exception as e:
+            self._log(f"[{self.platform_name}] ⚠ Verificación de sesión guardada falló: {e}")
+            return False
+
+    def _guardar_sesion(self):
+        """
+        Guarda las cookies de la sesión activa en el perfil persistente (si hay).
+        Son credenciales de la plataforma: el archivo se crea legible solo por el usuario (0600).
+        """
+        perfil = self._perfil_dir()
+        if perfil is None or not self.is_logged_in():
+            return
+        try:
+            perfil.mkdir(parents=True, exist_ok=True)
+            temporal = perfil / (ARCHIVO_COOKIES + ".tmp")
+            # Un temporal previo conservaría sus permisos: se crea siempre de nuevo
+            temporal.unlink(missing_ok=True)
+            fd = os.open(temporal, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(self.exportar_cookies()))
+            temporal.replace(perfil / ARCHIVO_COOKIES)
+        except Exception as e:
+            self._log(f"[{self.platform_name}] ⚠ No se pudieron guardar las cookies de la sesión: {e}")
+
+    # ====================================
+    # POOL DE PESTAÑAS
+    # ====================================
+    # Pestañas tibias por clave (ej. form_url): el scraper que termina las
+    # devuelve abiertas y el siguiente que usa el mismo formulario las toma,
+    # sin abrir ni cerrar pestañas durante toda la sesión. En modo pestañas
+    # un mismo formulario puede tener varias.
+
+    def tomar_pestana(self, clave, excluir=()):
+        """
+        Saca del pool la pestaña de 'clave' si sigue abierta.
+
+        Args:
+            excluir: Handles que el solicitante ya tiene en uso (se descartan del pool)
+
+        Returns:
+            Handle de la pestaña, o None si hay que abrir una nueva
+        """
+        libres = self._pestanas.get(clave)
+        while libres:
+            handle = libres.pop()
+            if handle not in excluir and self._driver and handle in self._driver.window_handles:
+                return handle
+        return None
+
+    def devolver_pestana(self, clave, handle):
+        """Deja la pestaña abierta en el pool para el próximo que la pida (puede haber varias por clave)."""
+        self._pestanas.setdefault(clave, []).append(handle)
+
+    # ====================================
+    # SALUD DE LA SESIÓN
+    # ====================================
+    # Entre items se verifica que el navegador responda y que la sesión siga
+    # vigente; si se cayó, se renueva sin cortar la ejecución.
+
+    def driver_responde(self) -> bool:
+        """True si el navegador sigue vivo (un crash deja el driver sin responder)."""
+        if self._driver is None:
+            return False
+        try:
+            self._driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def sesion_sana(self, profunda=False) -> bool:
+        """
+        Sonda de la sesión: navegador vivo y sesión establecida.
+
+        Sobrescribir en subclase para agregar la verificación de la plataforma.
+        Con profunda=True puede hacer una consulta autenticada (más cara).
+        """
+        return self.is_logged_in() and self.driver_responde()
+
+    def renovar_sesion(self, log_fn=None):
+        """
+        Rehace la sesión a mitad de ejecución: login de nuevo en el mismo
+        navegador o, si el navegador murió, uno nuevo desde cero.
+
+        Returns:
+            SeleniumDriver con sesión activa
+
+        Raises:
+            Exception: Si no se puede establecer la sesión
+        """
+        self.log_fn = log_fn or print
+        self._logged_in = False
+
+        if self.driver_responde():
+            self._log(f"[{self.platform_name}] Renovando sesión en el mismo navegador...")
+            if self._relogin():
+                return self._driver
+
+        self._log(f"[{self.platform_name}] Reiniciando navegador...")
+        self.cleanup()
+        return self.get_driver(log_fn=log_fn)
+
+    def _relogin(self) -> bool:
+        """
+        TODO en subclase: login de nuevo sobre self._driver (ya creado).
+        Por defecto no se puede y renovar_sesion reinicia el navegador.
+        """
+        return False
+
     def is_logged_in(self) -> bool:
         """
         Verifica si hay una sesión activa.
@@ -112,6 +312,24 @@ class BaseSessionManager(ABC):
         """
         return self._logged_in and self._driver is not None
 
+    def exportar_cookies(self) -> list:
+        """
+        Exporta todas las cookies del navegador con sesión activa.
+
+        Usa CDP (Network.getAllCookies) para obtener las cookies de todos los
+        dominios, sin depender de la pestaña activa.
+
+        Returns:
+            list: Cookies en formato Selenium (name, value, domain, path, ...)
+        """
+        if not self.is_logged_in():
+            raise Exception(f"No hay sesión activa de {self.platform_name} para exportar cookies")
+
+        try:
+            return self._driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        except Exception:
+            return self._driver.get_cookies()
+
     def cleanup(self):
         """
         Cierra la sesión y limpia recursos.
@@ -119,6 +337,10 @@ class BaseSessionManager(ABC):
         Debe llamarse al final de todos los scrapers de esta plataforma.
         """
         if self._driver:
+            # Las cookies pueden haberse renovado durante la ejecución
+            self._guardar_sesion()
+            # PIDs antes del quit: si chromedriver muere, sus hijos quedan sin padre
+            pids = self._pids_navegador()
             try:
                 self._log(f"[{self.platform_name}] Cerrando sesión...")
 
@@ -138,8 +360,8 @@ class BaseSessionManager(ABC):
 
                 if quit_thread.is_alive():
                     self._log(f"[{self.platform_name}] ⚠ Timeout cerrando navegador (5s), forzando cierre...")
-                    # Matar procesos Chrome zombies
-                    self._kill_chrome_processes()
+                    # Matar solo los procesos de este navegador (otros workers siguen usando Chrome)
+                    self._kill_chrome_processes(pids)
                 else:
                     self._log(f"[{self.platform_name}] ✓ Sesión cerrada correctamente")
 
@@ -148,28 +370,66 @@ class BaseSessionManager(ABC):
             finally:
                 self._driver = None
                 self._logged_in = False
+                self._pestanas = {}
 
-    def _kill_chrome_processes(self):
+    def _pids_navegador(self) -> list:
+        """
+        PIDs del chromedriver de esta sesión y de todos sus descendientes
+        (Chrome y sus procesos de renderizado), chromedriver primero.
         """
-        Mata procesos Chrome/ChromeDriver zombies.
+        try:
+            raiz = self._driver.service.process.pid
+        except Exception:
+            return []
+
+        pids, pendientes = [], [raiz]
+        while pendientes:
+            pid = pendientes.pop()
+            if pid not in pids:
+                pids.append(pid)
+                pendientes.extend(self._procesos_hijos(pid))
+        return pids
+
+    @staticmethod
+    def _procesos_hijos(pid) -> list:
+        """PIDs de los hijos directos de 'pid' (POSIX, pgrep -P). En Windows, lista vacía."""
+        if sys.platform == 'win32':
+            return []
+        try:
+            import subprocess
+            salida = subprocess.run(['pgrep', '-P', str(pid)], capture_output=True, text=True, timeout=3).stdout
+            return [int(hijo) for hijo in salida.split()]
+        except Exception:
+            return []
+
+    def _kill_chrome_processes(self, pids):
+        """
+        Mata los procesos Chrome/ChromeDriver zombies de esta sesión.
         Útil cuando el navegador crashea y no responde al quit().
+
+        Nunca mata por nombre de proceso: con varios workers en paralelo,
+        los navegadores de las otras sesiones siguen trabajando.
+
+        Args:
+            pids: PIDs de _pids_navegador(), chromedriver primero
         """
+        if not pids:
+            return
         try:
             import subprocess
-            import platform
-
-            if platform.system() == 'Windows':
-                # Windows: taskkill
-                subprocess.run(['taskkill', '/F', '/IM', 'chrome.exe'],
-                             capture_output=True, timeout=3)
-                subprocess.run(['taskkill', '/F', '/IM', 'chromedriver.exe'],
-                             capture_output=True, timeout=3)
+            import signal
+
+            if sys.platform == 'win32':
+                # Windows: taskkill del árbol de procesos de este chromedriver
+                subprocess.run(['taskkill', '/F', '/T', '/PID', str(pids[0])],
+                               capture_output=True, timeout=3)
             else:
-                # Linux/Mac: pkill
-                subprocess.run(['pkill', '-9', 'chrome'],
-                             capture_output=True, timeout=3)
-                subprocess.run(['pkill', '-9', 'chromedriver'],
-                             capture_output=True, timeout=3)
+                # Linux/Mac: SIGKILL a cada PID del árbol
+                for pid in pids:
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except OSError:
+                        pass  # Ya terminó
         except Exception:
             pass  # Ignorar errores al matar procesos
 
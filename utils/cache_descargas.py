@@ -0,0 +1,117 @@
+# ====================================
+# CACHÉ DE DESCARGAS (DÍAS CERRADOS)
+# ====================================
+# Índice durable (SQLite) de lo que ya se descargó, entre ejecuciones:
+# (reporte, fecha, producto/usuario) → ok (hash, destinos) | sin_datos
+#
+# Los datos de un día dejan de cambiar pasados unos días ('frescura' en
+# routes.yaml). Un item de un día cerrado que ya está en todos sus destinos,
+# o que ya respondió "sin datos", no se vuelve a pedir al servidor, siempre
+# que se haya registrado con el día ya cerrado ('actualizado'): lo bajado
+# mientras el día seguía abierto puede estar incompleto.
+# A diferencia del manifiesto, no depende del id de ejecución.
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from config.settings import CACHE_PATH
+from utils.manifest import clave_item
+
+# Mismos valores que ResultadoItem.estado (scrapers/base/resultado.py)
+ESTADOS_CACHEABLES = ("ok", "sin_datos")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS descargas (
+    reporte     TEXT NOT NULL,
+    fecha       TEXT NOT NULL,
+    clave       TEXT NOT NULL DEFAULT '',
+    estado      TEXT NOT NULL,
+    hash        TEXT,
+    destinos    TEXT,
+    filas       INTEGER,
+    actualizado TEXT NOT NULL,
+    PRIMARY KEY (reporte, fecha, clave)
+);
+"""
+
+
+class CacheDescargas:
+    """
+    Índice SQLite de descargas terminadas.
+
+    Uso:
+        cache = CacheDescargas()
+        cache.registrar("rga", item, resultado)
+        conocidos = cache.consultar("rga", work_items)   # {clave_item: (estado, destinos, actualizado)}
+    """
+
+    def __init__(self, ruta=CACHE_PATH):
+        self.ruta = Path(ruta)
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.ruta), check_same_thread=False)
+        self._conn.executescript(_ESQUEMA)
+
+    def registrar(self, reporte, work_item, resultado):
+        """Guarda un resultado terminado (ok o sin datos); los errores no se guardan."""
+        if resultado.estado not in ESTADOS_CACHEABLES:
+            return
+        destinos = json.dumps([str(d) for d in resultado.destinos]) if resultado.destinos else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO descargas (reporte, fecha, clave, estado, hash, destinos, filas, actualizado)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (reporte, fecha, clave) DO UPDATE SET
+                    estado = excluded.estado, hash = excluded.hash, destinos = excluded.destinos,
+                    filas = excluded.filas, actualizado = excluded.actualizado
+                """,
+                (reporte, *clave_item(work_item), resultado.estado, resultado.hash, destinos,
+                 resultado.filas, datetime.now().isoformat(timespec='seconds')),
+            )
+
+    def consultar(self, reporte, work_items) -> dict:
+        """
+        Registros de los work items en la caché.
+
+        Returns:
+            dict {clave_item: (estado, lista de Path destino, datetime del registro)}
+            solo de los items conocidos
+        """
+        claves = {clave_item(item) for item in work_items}
+        if not claves:
+            return {}
+        fechas = sorted({fecha for fecha, _ in claves})
+        with self._lock:
+            filas = self._conn.execute(
+                "SELECT fecha, clave, estado, destinos, actualizado FROM descargas WHERE reporte = ? AND fecha BETWEEN ? AND ?",
+                (reporte, fechas[0], fechas[-1]),
+            ).fetchall()
+        return {
+            (fecha, clave): (estado, [Path(d) for d in json.loads(destinos)] if destinos else [],
+                             datetime.fromisoformat(actualizado))
+            for fecha, clave, estado, destinos, actualizado in filas
+            if (fecha, clave) in claves
+        }
+
+    def close(self):
+        self._conn.close()
+
+
+# ====================================
+# HELPER FUNCTION
+# ====================================
+_cache = None
+_lock_cache = threading.Lock()
+
+
+def get_cache() -> CacheDescargas:
+    """Devuelve la caché de descargas (una por proceso)."""
+    global _cache
+    with _lock_cache:
+        if _cache is None:
+            _cache = CacheDescargas()
+    return _cache
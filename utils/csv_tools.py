@@ -0,0 +1,128 @@
+# ====================================
+# HELPERS PARA ARCHIVOS CSV
+# ====================================
+import csv
+from datetime import datetime
+from pathlib import Path
+
+# Formatos de fecha probados cuando el reporte no declara 'formato_fecha'
+FORMATOS_FECHA = ("%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%d-%m-%Y")
+
+# latin-1 mapea cada byte a un carácter y vuelve al mismo byte al escribir:
+# permite procesar el CSV como texto sin conocer su codificación real
+# y sin alterar el contenido de las filas.
+_ENCODING_TRANSPARENTE = "latin-1"
+
+
+def _lineas_con_copia(f, crudas: list):
+    """
+    Entrega las líneas de f al csv.reader y guarda cada una, tal cual, en 'crudas'.
+    El reader no lee por adelantado: tras cada fila, 'crudas' tiene exactamente
+    sus líneas (varias si un campo entre comillas tiene saltos de línea).
+    """
+    for linea in f:
+        crudas.append(linea)
+        yield linea
+
+
+def _normalizar_columna(nombre: str) -> str:
+    """Quita BOM (UTF-8 leído como latin-1), comillas y espacios de un nombre de columna."""
+    return nombre.replace('\xef\xbb\xbf', '').lstrip('\ufeff').strip().strip('"').lower()
+
+
+def parsear_fecha(valor: str, formato: str = None):
+    """
+    Convierte el valor de una celda de fecha (con o sin hora) a date.
+
+    Returns:
+        date, o None si no se reconoce el formato
+    """
+    valor = valor.strip()
+    if not valor:
+        return None
+
+    candidatos = (valor, valor.split()[0]) if formato else (valor.split()[0],)
+    formatos = (formato,) if formato else FORMATOS_FECHA
+    for texto in candidatos:
+        for fmt in formatos:
+            try:
+                return datetime.strptime(texto, fmt).date()
+            except ValueError:
+                continue
+    return None
+
+
+def dividir_csv_por_fecha(archivo, columna_fecha, fechas, destino_dir=None, separador=',', formato_fecha=None):
+    """
+    Divide un CSV con varios días en un archivo por día, leyendo en streaming.
+
+    Cada archivo diario conserva el encabezado original y las filas se copian
+    byte a byte (comillas y fin de línea del origen). Las filas cuya fecha no
+    está en 'fechas' (o no se puede leer) se descartan y se informan.
+
+    Args:
+        archivo: CSV descargado con el rango completo
+        columna_fecha: Nombre de la columna que contiene la fecha de cada fila
+        fechas: Fechas (date) esperadas en el rango
+        destino_dir: Carpeta de salida (default: la del archivo original)
+        separador: Separador de columnas del CSV
+        formato_fecha: Formato strptime de la columna (default: autodetección)
+
+    Returns:
+        dict {date: Path} solo con los días que tienen filas
+    """
+    archivo = Path(archivo)
+    destino_dir = Path(destino_dir) if destino_dir else archivo.parent
+    esperadas = set(fechas)
+
+    salidas = {}
+    handles = {}
+    cache_fechas = {}
+    descartadas = 0
+
+    try:
+        with open(archivo, 'r', encoding=_ENCODING_TRANSPARENTE, newline='') as f:
+            crudas = []
+            lector = csv.reader(_lineas_con_copia(f, crudas), delimiter=separador)
+            encabezado = next(lector, None)
+            if encabezado is None:
+                return {}
+            encabezado_crudo = ''.join(crudas)
+            crudas.clear()
+
+            columnas = [_normalizar_columna(c) for c in encabezado]
+            try:
+                indice = columnas.index(_normalizar_columna(columna_fecha))
+            except ValueError:
+                raise ValueError(f"El CSV no tiene la columna de fecha '{columna_fecha}' (columnas: {encabezado})")
+
+            for fila in lector:
+                linea = ''.join(crudas)
+                crudas.clear()
+                if not fila:
+                    continue
+                valor = fila[indice] if indice < len(fila) else ''
+                if valor not in cache_fechas:
+                    cache_fechas[valor] = parsear_fecha(valor, formato_fecha)
+                fecha = cache_fechas[valor]
+
+                if fecha not in esperadas:
+                    descartadas += 1
+                    continue
+
+                if fecha not in handles:
+                    ruta = destino_dir / f"{archivo.stem}_{fecha:%Y%m%d}{archivo.suffix}"
+                    handle = open(ruta, 'w', encoding=_ENCODING_TRANSPARENTE, newline='')
+                    handle.write(encabezado_crudo)
+                    handles[fecha] = handle
+                    salidas[fecha] = ruta
+
+                handles[fecha].write(linea)
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+    if descartadas:
+        print(f"  ⚠ {descartadas} filas fuera del rango o con fecha ilegible en '{archivo.name}'")
+
+    return salidas
@@ -0,0 +1,204 @@
+# ====================================
+# CARGA MASIVA DE CSV A BASE DE DATOS
+# ====================================
+# Etapa opcional posterior a la descarga: carga cada CSV en la tabla del
+# reporte (routes.yaml: bd). El archivo se lee por lotes (memoria acotada)
+# y cada lote se inserta con un solo executemany; en SQL Server se usa
+# pyodbc con fast_executemany. Con DB_URL se puede apuntar a un SQLite
+# local como reemplazo para pruebas.
+
+import csv
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import (
+    create_engine, MetaData, Table, Column, Integer, Unicode, DateTime, inspect, delete,
+)
+from sqlalchemy.engine import URL
+
+from config.settings import DB_URL, DB_SERVER, DB_NAME, DB_USER, DB_PASS, DB_DRIVER, DB_BATCH_SIZE
+
+# Columnas de control agregadas a cada tabla de reporte
+COLUMNA_ARCHIVO = "_archivo"
+COLUMNA_FECHA = "_fecha_reporte"
+COLUMNA_CLAVE = "_clave"
+COLUMNA_CARGADO = "_cargado"
+
+LONGITUD_TEXTO_DEFAULT = 4000
+
+
+def crear_engine(url=None):
+    """
+    Engine de SQLAlchemy: DB_URL si está definida (ej. 'sqlite:///estado/bd_local.sqlite3'),
+    si no SQL Server vía pyodbc con fast_executemany.
+    """
+    url = url or DB_URL
+    if url:
+        return create_engine(url)
+
+    if not DB_SERVER or not DB_NAME:
+        raise ValueError("Base de datos no configurada: definir DB_URL o DB_SERVER/DB_NAME en el .env")
+
+    query = {"driver": DB_DRIVER, "TrustServerCertificate": "yes"}
+    if not DB_USER:
+        query["Trusted_Connection"] = "yes"
+    url_mssql = URL.create(
+        "mssql+pyodbc", username=DB_USER or None, password=DB_PASS or None,
+        host=DB_SERVER, database=DB_NAME, query=query,
+    )
+    return create_engine(url_mssql, fast_executemany=True)
+
+
+def normalizar_columna(nombre):
+    """Nombre de columna SQL seguro a partir del encabezado del CSV."""
+    limpio = re.sub(r"\W+", "_", nombre.strip().lstrip("\ufeff"), flags=re.UNICODE).strip("_").lower()
+    return limpio or "columna"
+
+
+class CargadorCSV:
+    """
+    Carga CSV en tablas por reporte con inserts por lotes.
+
+    Uso:
+        cargador = CargadorCSV(crear_engine())
+        stats = cargador.cargar(Path("rga.csv"), "rga", fecha_reporte=fecha_dt, clave="HFC")
+        print(stats["filas_por_segundo"])
+    """
+
+    def __init__(self, engine, tamano_lote=DB_BATCH_SIZE):
+        self.engine = engine
+        self.tamano_lote = tamano_lote
+        self._tablas = {}
+        self._lock_tablas = threading.Lock()  # Varios hilos de despacho pueden crear la misma tabla
+
+    def cargar(self, archivo: Path, tabla: str, fecha_reporte=None, clave='', separador=',',
+               encoding='utf-8-sig', esquema=None, longitud_texto=LONGITUD_TEXTO_DEFAULT, tamano_lote=None) -> dict:
+        """
+        Carga el CSV completo en una transacción. Las filas cargadas antes para la
+        misma fecha y clave (o, sin fecha, desde el mismo archivo) se reemplazan:
+        recargar es idempotente.
+
+        Returns:
+            Dict con filas, lotes, tamano_lote, segundos y filas_por_segundo
+        """
+        tamano_lote = tamano_lote or self.tamano_lote
+        archivo = Path(archivo)
+        inicio = time.perf_counter()
+        filas = lotes = 0
+
+        with open(archivo, 'r', encoding=encoding, errors='replace', newline='') as f:
+            lector = csv.reader(f, delimiter=separador)
+            encabezado = next(lector, None)
+            if not encabezado:
+                return self._estadisticas(0, 0, tamano_lote, inicio)
+
+            columnas = self._columnas_unicas([normalizar_columna(c) for c in encabezado])
+            tabla_sql = self._obtener_tabla(tabla, columnas, esquema, longitud_texto)
+            conocidas = set(tabla_sql.columns.keys())
+            indices = [(i, c) for i, c in enumerate(columnas) if c in conocidas]
+
+            control = {
+                COLUMNA_ARCHIVO: archivo.name,
+                COLUMNA_FECHA: fecha_reporte,
+                COLUMNA_CLAVE: clave or '',
+                COLUMNA_CARGADO: datetime.now(),
+            }
+
+            with self.engine.begin() as conn:
+                # Los nombres de archivo se repiten entre meses (ej. hfc01.csv): se reemplaza por fecha
+                if fecha_reporte is not None:
+                    condicion = (tabla_sql.c[COLUMNA_FECHA] == fecha_reporte) & (tabla_sql.c[COLUMNA_CLAVE] == (clave or ''))
+                else:
+                    condicion = tabla_sql.c[COLUMNA_ARCHIVO] == archivo.name
+                conn.execute(delete(tabla_sql).where(condicion))
+
+                lote = []
+                for fila in lector:
+                    if not fila:
+                        continue
+                    registro = dict(control)
+                    for i, columna in indices:
+                        registro[columna] = fila[i] if i < len(fila) else None
+                    lote.append(registro)
+                    if len(lote) >= tamano_lote:
+                        conn.execute(tabla_sql.insert(), lote)  # executemany
+                        filas += len(lote)
+                        lotes += 1
+                        lote = []
+                if lote:
+                    conn.execute(tabla_sql.insert(), lote)
+                    filas += len(lote)
+                    lotes += 1
+
+        return self._estadisticas(filas, lotes, tamano_lote, inicio)
+
+    @staticmethod
+    def _estadisticas(filas, lotes, tamano_lote, inicio):
+        segundos = time.perf_counter() - inicio
+        return {
+            'filas': filas,
+            'lotes': lotes,
+            'tamano_lote': tamano_lote,
+            'segundos': segundos,
+            'filas_por_segundo': filas / segundos if segundos > 0 else 0.0,
+        }
+
+    @staticmethod
+    def _columnas_unicas(columnas):
+        vistas = {}
+        unicas = []
+        for columna in columnas:
+            conteo = vistas.get(columna, 0)
+            vistas[columna] = conteo + 1
+            unicas.append(columna if conteo == 0 else f"{columna}_{conteo + 1}")
+        return unicas
+
+    def _obtener_tabla(self, nombre, columnas, esquema, longitud_texto):
+        """Tabla existente (reflejada) o nueva con una columna de texto por encabezado."""
+        with self._lock_tablas:
+            return self._obtener_tabla_sin_lock(nombre, columnas, esquema, longitud_texto)
+
+    def _obtener_tabla_sin_lock(self, nombre, columnas, esquema, longitud_texto):
+        llave = (esquema, nombre)
+        if llave in self._tablas:
+            return self._tablas[llave]
+
+        metadata = MetaData(schema=esquema)
+        if inspect(self.engine).has_table(nombre, schema=esquema):
+            tabla = Table(nombre, metadata, autoload_with=self.engine)
+            faltantes = [c for c in columnas if c not in tabla.columns]
+            if faltantes:
+                print(f"  ⚠ BD {nombre}: columnas del CSV que no están en la tabla (se ignoran): {faltantes}")
+        else:
+            tabla = Table(
+                nombre, metadata,
+                Column("_id", Integer, primary_key=True, autoincrement=True),
+                Column(COLUMNA_ARCHIVO, Unicode(255), nullable=False, index=True),
+                Column(COLUMNA_FECHA, DateTime, index=True),
+                Column(COLUMNA_CLAVE, Unicode(100)),
+                Column(COLUMNA_CARGADO, DateTime),
+                *(Column(c, Unicode(longitud_texto)) for c in columnas),
+            )
+            metadata.create_all(self.engine)
+
+        self._tablas[llave] = tabla
+        return tabla
+
+
+# ====================================
+# HELPER FUNCTION
+# ====================================
+_cargador = None
+_lock_cargador = threading.Lock()
+
+
+def get_cargador_bd() -> CargadorCSV:
+    """Devuelve el cargador de la ejecución actual (un engine por proceso)."""
+    global _cargador
+    with _lock_cargador:
+        if _cargador is None:
+            _cargador = CargadorCSV(crear_engine())
+    return _cargador
@@ -0,0 +1,76 @@
+# ====================================
+# DESPACHO DE ARCHIVOS EN SEGUNDO PLANO
+# ====================================
+# Pool acotado de hilos para el trabajo posterior a la descarga (renombrar,
+# carga en BD, Parquet, copia a las carpetas de red). El navegador entrega
+# el archivo y sigue con el próximo item; el resultado final del item se
+# conoce cuando su despacho termina.
+#
+# La cola tiene tope: si el despacho va más lento que las descargas,
+# 'enviar' bloquea hasta que se libere un lugar (contrapresión) en vez de
+# acumular archivos sin límite en la carpeta local.
+#
+# Uso:
+#     despacho = DespachoArchivos(hilos=2, max_pendientes=4)
+#     futuro = despacho.enviar(procesar, archivo)
+#     futuro.add_done_callback(lambda f: registrar(f.result()))
+#     despacho.drenar()   # antes de terminar la ejecución
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+class DespachoArchivos:
+    """
+    Pool de hilos con cola acotada.
+
+    Args:
+        hilos: Hilos de despacho
+        max_pendientes: Tope de trabajos en curso + en cola (default: 2 por hilo)
+        log_fn: Función de logging
+    """
+
+    def __init__(self, hilos=2, max_pendientes=None, log_fn=print):
+        self.log_fn = log_fn
+        self._executor = ThreadPoolExecutor(max_workers=max(1, hilos), thread_name_prefix="despacho")
+        self._cupos = threading.BoundedSemaphore(max(1, max_pendientes or hilos * 2))
+        self._futuros = set()
+        self._lock = threading.Lock()
+
+    @property
+    def pendientes(self) -> int:
+        with self._lock:
+            return len(self._futuros)
+
+    def enviar(self, funcion, *args, **kwargs):
+        """Encola funcion(*args, **kwargs); bloquea mientras la cola esté llena. Devuelve un Future."""
+        self._cupos.acquire()
+        try:
+            futuro = self._executor.submit(funcion, *args, **kwargs)
+        except Exception:
+            self._cupos.release()
+            raise
+        with self._lock:
+            self._futuros.add(futuro)
+        futuro.add_done_callback(self._liberar)
+        return futuro
+
+    def _liberar(self, futuro):
+        with self._lock:
+            self._futuros.discard(futuro)
+        self._cupos.release()
+
+    def drenar(self):
+        """
+        Espera a que termine todo lo encolado y cierra el pool.
+
+        shutdown(wait=True) también espera los callbacks de cada Future, que
+        corren en el hilo de despacho: al volver, todos los resultados ya
+        fueron entregados.
+        """
+        with self._lock:
+            pendientes = list(self._futuros)
+        if pendientes:
+            self.log_fn(f"[Despacho] Esperando {len(pendientes)} archivos en cola...")
+            wait(pendientes)
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,223 @@
+# ====================================
+# SEGUIMIENTO DE DESCARGAS POR EVENTOS
+# ====================================
+# Detecta el final de una descarga a partir de eventos en lugar de
+# re-escanear la carpeta cada 1.5s:
+#   1. Eventos CDP Page.downloadWillBegin y Page.downloadProgress, leídos
+#      del performance log de ChromeDriver. No es una suscripción: el log se
+#      consulta cada INTERVALO_EVENTOS (polling corto, solo trae lo nuevo).
+#      Los Browser.download* no llegan al performance log.
+#   2. Fallback en Linux: inotify sobre la carpeta de descargas (sin polling)
+# Una descarga que deja de crecer falla en 'timeout_estancado' segundos.
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+EVENTO_INICIO = "Page.downloadWillBegin"
+EVENTO_PROGRESO = "Page.downloadProgress"
+
+# Intervalo entre lecturas del performance log (solo trae eventos nuevos)
+INTERVALO_EVENTOS = 0.1
+
+# Prefijo común de los dos eventos: las entradas sin él no se parsean
+_MARCA_EVENTOS = '"Page.download'
+
+
+class DescargaEstancadaError(TimeoutError):
+    """La descarga empezó pero dejó de recibir datos."""
+
+
+class RastreadorCDP:
+    """
+    Sigue descargas con los eventos CDP registrados en el performance log,
+    consultándolo cada INTERVALO_EVENTOS segundos.
+
+    Requiere que el driver se cree con la capability
+    goog:loggingPrefs = {"performance": "ALL"}. El log acumula todos los
+    eventos Page entre descargas: solo se decodifican los de descarga.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.disponible = self._probar_disponibilidad()
+
+    def _probar_disponibilidad(self) -> bool:
+        try:
+            self.driver.get_log("performance")
+            return True
+        except Exception:
+            return False
+
+    def descartar_eventos(self):
+        """Vacía el buffer de eventos para que solo cuenten las descargas siguientes."""
+        try:
+            self.driver.get_log("performance")
+        except Exception:
+            pass
+
+    def _leer_eventos(self):
+        for entrada in self.driver.get_log("performance"):
+            if _MARCA_EVENTOS not in entrada.get("message", ""):
+                continue
+            try:
+                mensaje = json.loads(entrada["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            metodo = mensaje.get("method")
+            if metodo in (EVENTO_INICIO, EVENTO_PROGRESO):
+                yield metodo, mensaje.get("params", {})
+
+    def esperar(self, directorio: Path, timeout: float, timeout_estancado: float, extension: str = None) -> Path:
+        """
+        Espera a que la primera descarga iniciada llegue a 'completed'.
+
+        Returns:
+            Path exacto del archivo descargado
+        """
+        inicio = time.time()
+        guid = None
+        nombre = None
+        recibidos = -1
+        ultimo_avance = inicio
+
+        while time.time() - inicio < timeout:
+            for metodo, params in self._leer_eventos():
+                if metodo == EVENTO_INICIO and guid is None:
+                    sugerido = params.get("suggestedFilename", "")
+                    if extension and not sugerido.endswith(extension):
+                        continue
+                    guid, nombre = params.get("guid"), sugerido
+                    ultimo_avance = time.time()
+
+                elif metodo == EVENTO_PROGRESO and params.get("guid") == guid:
+                    estado = params.get("state")
+                    if estado == "completed":
+                        return self._resolver_archivo(directorio, nombre, guid)
+                    if estado == "canceled":
+                        raise Exception(f"Descarga cancelada por el navegador: {nombre}")
+                    if params.get("receivedBytes", 0) != recibidos:
+                        recibidos = params.get("receivedBytes", 0)
+                        ultimo_avance = time.time()
+
+            if guid and time.time() - ultimo_avance > timeout_estancado:
+                raise DescargaEstancadaError(
+                    f"Descarga detenida: '{nombre}' sin avance en {timeout_estancado}s ({max(recibidos, 0)} bytes)"
+                )
+            time.sleep(INTERVALO_EVENTOS)
+
+        raise TimeoutError(f"Descarga no completada en {timeout} segundos")
+
+    @staticmethod
+    def _resolver_archivo(directorio: Path, nombre: str, guid: str) -> Path:
+        """
+        Ubica el archivo completado. Chrome guarda con el nombre sugerido
+        (o con el guid si el comportamiento es 'allowAndName'), y añade
+        ' (n)' si ya existe un archivo con ese nombre.
+        """
+        for candidato in (directorio / nombre, directorio / guid):
+            if candidato.is_file():
+                return candidato
+
+        base, ext = os.path.splitext(nombre)
+        variantes = [f for f in directorio.glob(f"{base} (*){ext}") if f.is_file()]
+        if variantes:
+            return max(variantes, key=lambda f: f.stat().st_mtime)
+
+        raise FileNotFoundError(f"Descarga completada pero no se encontró '{nombre}' en {directorio}")
+
+
+class VigilanteInotify:
+    """
+    Fallback para Linux: observa la carpeta de descargas con inotify.
+
+    Chrome escribe en '<nombre>.crdownload' y al terminar lo renombra al
+    nombre final, lo que produce un evento IN_MOVED_TO.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    _CABECERA = struct.Struct("iIII")
+
+    def __init__(self, directorio: Path):
+        self.directorio = Path(directorio)
+        self._fd = None
+
+        nombre_libc = ctypes.util.find_library("c")
+        if not nombre_libc or not hasattr(select, "select"):
+            raise OSError("inotify no disponible en esta plataforma")
+
+        libc = ctypes.CDLL(nombre_libc, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify no disponible en esta plataforma")
+
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falló")
+
+        mascara = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self._fd, str(self.directorio).encode(), mascara) < 0:
+            self.cerrar()
+            raise OSError(ctypes.get_errno(), "inotify_add_watch falló")
+
+    def esperar(self, timeout: float, timeout_estancado: float, extension: str = None) -> Path:
+        """Bloquea hasta que aparece un archivo terminado (sin polling fijo)."""
+        inicio = time.time()
+        ultimo_avance = None
+
+        try:
+            while True:
+                restante = timeout - (time.time() - inicio)
+                if restante <= 0:
+                    raise TimeoutError(f"Descarga no completada en {timeout} segundos")
+
+                espera = restante
+                if ultimo_avance is not None:
+                    limite_estancado = timeout_estancado - (time.time() - ultimo_avance)
+                    if limite_estancado <= 0:
+                        raise DescargaEstancadaError(f"Descarga detenida: sin avance en {timeout_estancado}s")
+                    espera = min(espera, limite_estancado)
+
+                listos, _, _ = select.select([self._fd], [], [], espera)
+                if not listos:
+                    continue
+
+                for mascara, nombre in self._leer_eventos():
+                    if nombre.endswith((".crdownload", ".tmp")):
+                        ultimo_avance = time.time()
+                        continue
+                    if extension and not nombre.endswith(extension):
+                        continue
+                    if mascara & (self.IN_MOVED_TO | self.IN_CLOSE_WRITE):
+                        ruta = self.directorio / nombre
+                        if ruta.is_file():
+                            return ruta
+        finally:
+            self.cerrar()
+
+    def _leer_eventos(self):
+        try:
+            datos = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + self._CABECERA.size <= len(datos):
+            _, mascara, _, largo = self._CABECERA.unpack_from(datos, offset)
+            offset += self._CABECERA.size
+            nombre = datos[offset:offset + largo].rstrip(b"\0").decode(errors="replace")
+            offset += largo
+            yield mascara, nombre
+
+    def cerrar(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,111 @@
+# ====================================
+# ESPERAS POR CONDICIÓN (CON MEDICIÓN)
+# ====================================
+# Reemplazo de los time.sleep fijos: cada espera termina apenas se cumple
+# su condición, tiene un límite superior configurable (settings.ESPERAS)
+# y su duración se acumula para poder medir el tiempo total en esperas.
+
+import threading
+import time
+
+from selenium.common.exceptions import NoAlertPresentException, NoSuchElementException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config.settings import ESPERAS
+
+ESPERA_DEFAULT = 10
+INTERVALO_CONSULTA = 0.1
+
+
+class RegistroEsperas:
+    """Acumula cantidad y segundos de espera por nombre de espera."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._datos = {}
+
+    def registrar(self, nombre, segundos, agotada=False):
+        with self._lock:
+            conteo, total, agotadas = self._datos.get(nombre, (0, 0.0, 0))
+            self._datos[nombre] = (conteo + 1, total + segundos, agotadas + int(agotada))
+
+    @property
+    def total_segundos(self) -> float:
+        with self._lock:
+            return sum(total for _, total, _ in self._datos.values())
+
+    def resumen(self) -> str:
+        """Texto con el tiempo total y el detalle por espera."""
+        with self._lock:
+            datos = dict(self._datos)
+        if not datos:
+            return "Tiempo en esperas: 0.0s"
+
+        lineas = [f"Tiempo en esperas: {sum(t for _, t, _ in datos.values()):.1f}s"]
+        for nombre, (conteo, total, agotadas) in sorted(datos.items(), key=lambda kv: -kv[1][1]):
+            extra = f", {agotadas} al límite" if agotadas else ""
+            lineas.append(f"  - {nombre}: {total:.1f}s en {conteo} esperas{extra}")
+        return "\n".join(lineas)
+
+
+REGISTRO_ESPERAS = RegistroEsperas()
+
+
+def esperar_condicion(driver, condicion, nombre, timeout=None, ignorar_timeout=False):
+    """
+    Espera hasta que 'condicion(driver)' devuelva un valor verdadero.
+
+    Args:
+        driver: WebDriver
+        condicion: Callable(driver) -> valor (falsy = seguir esperando)
+        nombre: Nombre de la espera (clave en settings.ESPERAS y en el registro)
+        timeout: Límite en segundos (default: settings.ESPERAS[nombre])
+        ignorar_timeout: Si True, devuelve None al agotar el límite en vez de lanzar
+
+    Returns:
+        El valor devuelto por la condición
+    """
+    limite = timeout if timeout is not None else ESPERAS.get(nombre, ESPERA_DEFAULT)
+    inicio = time.perf_counter()
+    agotada = False
+    try:
+        return WebDriverWait(driver, limite, poll_frequency=INTERVALO_CONSULTA).until(condicion)
+    except TimeoutException:
+        agotada = True
+        if ignorar_timeout:
+            return None
+        raise
+    finally:
+        REGISTRO_ESPERAS.registrar(nombre, time.perf_counter() - inicio, agotada)
+
+
+# ====================================
+# CONDICIONES REUTILIZABLES
+# ====================================
+
+def documento_listo(driver) -> bool:
+    """DOM completamente cargado."""
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def alguno_presente(*localizadores):
+    """
+    Condición: devuelve (localizador, elemento) del primero presente, o False.
+    """
+    def _condicion(driver):
+        for localizador in localizadores:
+            try:
+                return localizador, driver.find_element(*localizador)
+            except NoSuchElementException:
+                continue
+        return False
+    return _condicion
+
+
+def alerta_presente(driver) -> bool:
+    """Hay un alert() de JavaScript abierto."""
+    try:
+        driver.switch_to.alert
+        return True
+    except NoAlertPresentException:
+        return False
@@ -3,10 +3,16 @@
 # ====================================
 import time
 import shutil
+import hashlib
 import tempfile
+import threading
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import os
 
+from utils.reintentos import espera_backoff
+
 def renombrar_archivo(old_path, new_path, log_fn=print):
     """
     Renombra un archivo de old_path a new_path, con reintentos.
@@ -23,9 +29,31 @@ def renombrar_archivo(old_path, new_path, log_fn=print):
         except Exception as e:
             if attempt == 2:  # Solo mostrar error en el último intento
                 log_fn(f"[ERROR] No se pudo renombrar archivo: {e}")
-            time.sleep(1)
+            else:
+                # Archivo tomado (antivirus, indexador): backoff corto en vez de 1s fijo
+                time.sleep(espera_backoff(attempt + 1, base=0.5, maximo=4))
     return False
 
+def calcular_hash(ruta, algoritmo="sha256", bloque=1024 * 1024):
+    """
+    Calcula el hash del contenido de un archivo leyéndolo por bloques.
+    """
+    h = hashlib.new(algoritmo)
+    with open(ruta, 'rb') as f:
+        for chunk in iter(lambda: f.read(bloque), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def eliminar_directorio_si_vacio(directorio):
+    """
+    Elimina 'directorio' solo si está vacío. Retorna True si lo eliminó.
+    """
+    try:
+        os.rmdir(directorio)
+        return True
+    except OSError:
+        return False
+
 def limpiar_sesiones_antiguas(dias: int = 7):
     """
     Limpia directorios de sesiones de descarga ('rpa_downloads', x días) 
@@ -49,4 +77,71 @@ def limpiar_sesiones_antiguas(dias: int = 7):
                 # Ignorar errores si el archivo fue eliminado por otro proceso
                 pass
 
-    return eliminados
\ No newline at end of file
+    return eliminados
+
+# ====================================
+# ESCRITURA ATÓMICA Y DISTRIBUCIÓN A VARIOS DESTINOS
+# ====================================
+FICLONE = 0x40049409  # ioctl de reflink en Linux (btrfs, XFS, ...)
+
+
+def _reflink(origen, destino):
+    """Clona 'origen' en 'destino' compartiendo bloques (copy-on-write). Lanza OSError si no se puede."""
+    import fcntl  # Solo existe en POSIX
+    with open(origen, 'rb') as f_origen, open(destino, 'wb') as f_destino:
+        fcntl.ioctl(f_destino.fileno(), FICLONE, f_origen.fileno())
+
+
+def escribir_atomico(origen, destino) -> str:
+    """
+    Escribe 'destino' con el contenido de 'origen' sin que nunca se vea un archivo parcial:
+    se escribe un temporal en la carpeta de destino y se renombra con os.replace.
+
+    En el mismo filesystem se usa un hardlink (sin copiar datos); si no, un reflink
+    cuando el filesystem lo soporta y, como último recurso, una copia.
+
+    Returns:
+        Método usado: "hardlink", "reflink" o "copia"
+    """
+    origen, destino = Path(origen), Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporal = destino.with_name(f".{destino.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        metodo = None
+        if os.stat(origen).st_dev == os.stat(destino.parent).st_dev:
+            try:
+                os.link(origen, temporal)
+                metodo = "hardlink"
+            except OSError:
+                pass
+        if metodo is None and sys.platform.startswith("linux"):
+            try:
+                _reflink(origen, temporal)
+                shutil.copystat(origen, temporal)
+                metodo = "reflink"
+            except OSError:
+                temporal.unlink(missing_ok=True)
+        if metodo is None:
+            shutil.copy2(origen, temporal)
+            metodo = "copia"
+        os.replace(temporal, destino)
+        return metodo
+    finally:
+        temporal.unlink(missing_ok=True)
+
+
+def distribuir_archivo(origen, destinos, max_hilos=4) -> dict:
+    """
+    Escribe el archivo local 'origen' en todos los 'destinos' en paralelo
+    (cada uno con escribir_atomico). No borra el origen.
+
+    Returns:
+        Dict {destino: None si se escribió, o la excepción si falló}
+    """
+    destinos = [Path(d) for d in destinos]
+    if not destinos:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_hilos, len(destinos)), thread_name_prefix="distribuir") as pool:
+        futuros = {destino: pool.submit(escribir_atomico, origen, destino) for destino in destinos}
+    return {destino: futuro.exception() for destino, futuro in futuros.items()}
@@ -0,0 +1,172 @@
+# ====================================
+# MANIFIESTO DE EJECUCIÓN (CHECKPOINT / RESUME)
+# ====================================
+# Registro durable (SQLite) del estado de cada work item:
+# (reporte, fecha, producto/usuario) → pendiente | ok | sin_datos | error
+# Permite que una ejecución interrumpida (crash de Chrome, Task Scheduler
+# detenido) se reanude con --resume sin repetir lo ya descargado.
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from config.settings import MANIFEST_PATH, SESSION_ID
+
+# Mismos valores que ResultadoItem.estado (scrapers/base/resultado.py)
+ESTADO_PENDIENTE = "pendiente"
+ESTADOS_COMPLETOS = ("ok", "sin_datos")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS ejecuciones (
+    run_id      TEXT PRIMARY KEY,
+    inicio      TEXT NOT NULL,
+    fin         TEXT
+);
+CREATE TABLE IF NOT EXISTS items (
+    run_id      TEXT NOT NULL,
+    reporte     TEXT NOT NULL,
+    fecha       TEXT NOT NULL,
+    clave       TEXT NOT NULL DEFAULT '',
+    estado      TEXT NOT NULL,
+    hash        TEXT,
+    destinos    TEXT,
+    error       TEXT,
+    filas       INTEGER,
+    actualizado TEXT NOT NULL,
+    PRIMARY KEY (run_id, reporte, fecha, clave)
+);
+"""
+
+def clave_item(work_item):
+    """Convierte un work item en la tupla (fecha 'YYYY-MM-DD', producto/usuario o '')."""
+    if isinstance(work_item, tuple):
+        return str(work_item[0])[:10], str(work_item[1])
+    return str(work_item)[:10], ''
+
+
+def item_desde_clave(fecha, clave):
+    """Operación inversa de clave_item."""
+    return (fecha, clave) if clave else fecha
+
+
+class ManifiestoEjecucion:
+    """
+    Manifiesto SQLite de los work items de una ejecución.
+
+    Uso:
+        manifiesto = ManifiestoEjecucion(reanudar=True)
+        manifiesto.registrar_items("rga", work_items)
+        pendientes = manifiesto.filtrar_completados("rga", work_items)
+        manifiesto.marcar("rga", item, resultado)
+        manifiesto.finalizar()
+    """
+
+    def __init__(self, ruta=MANIFEST_PATH, run_id=None, reanudar=False):
+        self.ruta = Path(ruta)
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.ruta), check_same_thread=False)
+        self._conn.executescript(_ESQUEMA)
+
+        anterior = self.ultima_ejecucion_incompleta() if reanudar else None
+        self.reanudando = anterior is not None
+        self.run_id = anterior or run_id or SESSION_ID
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO ejecuciones (run_id, inicio) VALUES (?, ?)",
+                (self.run_id, datetime.now().isoformat(timespec='seconds')),
+            )
+            self._conn.execute("UPDATE ejecuciones SET fin = NULL WHERE run_id = ?", (self.run_id,))
+
+    def ultima_ejecucion_incompleta(self):
+        """run_id de la ejecución más reciente con items sin completar (o None)."""
+        marcadores = ",".join("?" for _ in ESTADOS_COMPLETOS)
+        fila = self._conn.execute(
+            f"""
+            SELECT e.run_id FROM ejecuciones e
+            WHERE e.fin IS NULL
+               OR EXISTS (SELECT 1 FROM items i WHERE i.run_id = e.run_id AND i.estado NOT IN ({marcadores}))
+            ORDER BY e.inicio DESC LIMIT 1
+            """,
+            ESTADOS_COMPLETOS,
+        ).fetchone()
+        return fila[0] if fila else None
+
+    def items_registrados(self, reporte):
+        """
+        Work items que la ejecución ya tenía registrados para el reporte,
+        o None si el reporte aún no se había iniciado en esta ejecución.
+        """
+        filas = self._conn.execute(
+            "SELECT fecha, clave FROM items WHERE run_id = ? AND reporte = ? ORDER BY fecha, clave",
+            (self.run_id, reporte),
+        ).fetchall()
+        return [item_desde_clave(fecha, clave) for fecha, clave in filas] or None
+
+    def registrar_items(self, reporte, work_items):
+        """Registra los work items como pendientes (los ya registrados no cambian)."""
+        ahora = datetime.now().isoformat(timespec='seconds')
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO items (run_id, reporte, fecha, clave, estado, actualizado) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(self.run_id, reporte, *clave_item(item), ESTADO_PENDIENTE, ahora) for item in work_items],
+            )
+
+    def filtrar_completados(self, reporte, work_items):
+        """Devuelve solo los work items que aún no terminaron (ok o sin datos)."""
+        marcadores = ",".join("?" for _ in ESTADOS_COMPLETOS)
+        completos = set(self._conn.execute(
+            f"SELECT fecha, clave FROM items WHERE run_id = ? AND reporte = ? AND estado IN ({marcadores})",
+            (self.run_id, reporte, *ESTADOS_COMPLETOS),
+        ).fetchall())
+        return [item for item in work_items if clave_item(item) not in completos]
+
+    def marcar(self, reporte, work_item, resultado):
+        """Guarda el estado final de un work item (con hash, filas y destinos si los hay)."""
+        destinos = json.dumps([str(d) for d in resultado.destinos]) if resultado.destinos else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO items (run_id, reporte, fecha, clave, estado, hash, destinos, error, filas, actualizado)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (run_id, reporte, fecha, clave) DO UPDATE SET
+                    estado = excluded.estado, hash = excluded.hash, destinos = excluded.destinos,
+                    error = excluded.error, filas = excluded.filas, actualizado = excluded.actualizado
+                """,
+                (self.run_id, reporte, *clave_item(work_item), resultado.estado, resultado.hash,
+                 destinos, resultado.error, resultado.filas, datetime.now().isoformat(timespec='seconds')),
+            )
+
+    def finalizar(self):
+        """Marca la ejecución como terminada."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE ejecuciones SET fin = ? WHERE run_id = ?",
+                (datetime.now().isoformat(timespec='seconds'), self.run_id),
+            )
+
+    def close(self):
+        self._conn.close()
+
+
+# ====================================
+# HELPER FUNCTION
+# ====================================
+_manifiesto = None
+
+
+def get_manifiesto(reanudar=False) -> ManifiestoEjecucion:
+    """
+    Devuelve el manifiesto de la ejecución actual (uno por proceso).
+    'reanudar' solo tiene efecto en la primera llamada.
+    """
+    global _manifiesto
+    if _manifiesto is None:
+        _manifiesto = ManifiestoEjecucion(reanudar=reanudar)
+        if _manifiesto.reanudando:
+            print(f"[Manifiesto] Reanudando ejecución {_manifiesto.run_id}")
+    return _manifiesto
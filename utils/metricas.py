@@ -0,0 +1,201 @@
+# ====================================
+# MÉTRICAS DE TIEMPO POR FASE
+# ====================================
+# Mide cada fase del flujo (login, navegar_a_reporte, fill_dates, submit_form,
+# esperar_descarga, _process_file, ...) y la guarda en un SQLite local,
+# por ejecución, reporte e item. Al final se imprime p50/p95 por fase,
+# items por minuto y la comparación con la ejecución anterior.
+
+import math
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from config.settings import METRICAS_PATH, SESSION_ID
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS ejecuciones (
+    run_id  TEXT PRIMARY KEY,
+    inicio  TEXT NOT NULL,
+    fin     TEXT
+);
+CREATE TABLE IF NOT EXISTS fases (
+    run_id   TEXT NOT NULL,
+    reporte  TEXT,
+    item     TEXT,
+    fase     TEXT NOT NULL,
+    inicio   REAL NOT NULL,
+    segundos REAL NOT NULL,
+    ok       INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fases_run ON fases (run_id, fase);
+"""
+
+# Fase que representa un work item completo (base del cálculo de items/min)
+FASE_ITEM = "item"
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano (p entre 0 y 100)."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = max(0, math.ceil(p / 100 * len(ordenados)) - 1)
+    return ordenados[indice]
+
+
+class MetricasEjecucion:
+    """
+    Almacén SQLite de tiempos por fase.
+
+    Uso:
+        metricas = MetricasEjecucion()
+        with metricas.fase("fill_dates", reporte="rga", item="2025-01-01 - HFC"):
+            ...
+        print(metricas.resumen())
+    """
+
+    # Filas acumuladas en memoria antes de escribir a disco
+    TAMANO_LOTE = 50
+
+    def __init__(self, ruta=METRICAS_PATH, run_id=SESSION_ID):
+        self.ruta = Path(ruta)
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        self.run_id = run_id
+        self._lock = threading.Lock()
+        self._pendientes = []
+        # timeout: los workers en paralelo escriben en el mismo archivo
+        self._conn = sqlite3.connect(str(self.ruta), timeout=30, check_same_thread=False)
+        self._conn.executescript(_ESQUEMA)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO ejecuciones (run_id, inicio) VALUES (?, ?)",
+                (self.run_id, datetime.now().isoformat(timespec='seconds')),
+            )
+
+    @contextmanager
+    def fase(self, nombre, reporte=None, item=None):
+        """Mide la duración del bloque y la registra (ok=0 si lanzó excepción)."""
+        inicio = time.time()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self.registrar(nombre, time.time() - inicio, reporte=reporte, item=item, ok=ok, inicio=inicio)
+
+    def registrar(self, nombre, segundos, reporte=None, item=None, ok=True, inicio=None):
+        with self._lock:
+            self._pendientes.append(
+                (self.run_id, reporte, item, nombre, inicio or time.time() - segundos, segundos, int(ok))
+            )
+            if len(self._pendientes) >= self.TAMANO_LOTE:
+                self._volcar()
+
+    def _volcar(self):
+        """Escribe las filas pendientes (llamar con el lock tomado)."""
+        if not self._pendientes:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO fases (run_id, reporte, item, fase, inicio, segundos, ok) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._pendientes,
+            )
+        self._pendientes = []
+
+    def flush(self):
+        with self._lock:
+            self._volcar()
+
+    # ====================================
+    # RESÚMENES
+    # ====================================
+    # Las lecturas también toman el lock: los hilos de despacho escriben
+    # por la misma conexión.
+
+    def _duraciones_por_fase(self, run_id):
+        with self._lock:
+            filas = self._conn.execute(
+                "SELECT fase, segundos FROM fases WHERE run_id = ? AND ok = 1", (run_id,)
+            ).fetchall()
+        por_fase = {}
+        for fase, segundos in filas:
+            por_fase.setdefault(fase, []).append(segundos)
+        return por_fase
+
+    def _ejecucion_anterior(self):
+        with self._lock:
+            fila = self._conn.execute(
+                """
+                SELECT e.run_id FROM ejecuciones e
+                WHERE e.run_id != ? AND EXISTS (SELECT 1 FROM fases f WHERE f.run_id = e.run_id)
+                ORDER BY e.inicio DESC LIMIT 1
+                """,
+                (self.run_id,),
+            ).fetchone()
+        return fila[0] if fila else None
+
+    def items_por_minuto(self, run_id=None):
+        run_id = run_id or self.run_id
+        with self._lock:
+            conteo, primero, ultimo = self._conn.execute(
+                "SELECT COUNT(*), MIN(inicio), MAX(inicio + segundos) FROM fases WHERE run_id = ? AND fase = ?",
+                (run_id, FASE_ITEM),
+            ).fetchone()
+        if not conteo or not ultimo or ultimo <= primero:
+            return 0.0
+        return conteo / ((ultimo - primero) / 60)
+
+    def resumen(self) -> str:
+        """Tabla p50/p95 por fase, items/min y p50 de la ejecución anterior."""
+        self.flush()
+        actual = self._duraciones_por_fase(self.run_id)
+        if not actual:
+            return "[Métricas] Sin fases registradas"
+
+        anterior_id = self._ejecucion_anterior()
+        anterior = self._duraciones_por_fase(anterior_id) if anterior_id else {}
+
+        lineas = [
+            "[Métricas] Tiempos por fase (segundos)",
+            f"  {'fase':<28}{'n':>6}{'p50':>9}{'p95':>9}{'total':>10}{'p50 ant.':>10}",
+        ]
+        for fase, duraciones in sorted(actual.items(), key=lambda kv: -sum(kv[1])):
+            previo = f"{percentil(anterior[fase], 50):>10.2f}" if fase in anterior else f"{'-':>10}"
+            lineas.append(
+                f"  {fase:<28}{len(duraciones):>6}{percentil(duraciones, 50):>9.2f}"
+                f"{percentil(duraciones, 95):>9.2f}{sum(duraciones):>10.1f}{previo}"
+            )
+
+        lineas.append(f"  Items por minuto: {self.items_por_minuto():.1f}"
+                      + (f" (anterior: {self.items_por_minuto(anterior_id):.1f})" if anterior_id else ""))
+        return "\n".join(lineas)
+
+    def finalizar(self):
+        """Vuelca lo pendiente y cierra la ejecución."""
+        with self._lock:
+            self._volcar()
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE ejecuciones SET fin = ? WHERE run_id = ?",
+                    (datetime.now().isoformat(timespec='seconds'), self.run_id),
+                )
+
+
+# ====================================
+# HELPER FUNCTION
+# ====================================
+_metricas = None
+
+
+def get_metricas() -> MetricasEjecucion:
+    """Devuelve el almacén de métricas de la ejecución actual (uno por proceso)."""
+    global _metricas
+    if _metricas is None:
+        _metricas = MetricasEjecucion()
+    return _metricas
@@ -0,0 +1,206 @@
+# ====================================
+# ORQUESTADOR ASYNCIO DE PLATAFORMAS Y REPORTES
+# ====================================
+# Declara plataformas y reportes como tareas con dependencias y las ejecuta
+# concurrentemente: el trabajo bloqueante (Selenium, descargas) corre en
+# hilos del executor y asyncio solo coordina. Las tareas que comparten una
+# sesión (mismo navegador) se serializan con un lock por sesión; plataformas
+# y sesiones independientes avanzan en paralelo.
+#
+# Uso:
+#     orquestador = Orquestador()
+#     orquestador.agregar("salesys.login", session.get_driver, plataforma="SalesYs")
+#     orquestador.agregar("salesys.rga", ejecutar_rga, plataforma="SalesYs", depende_de=["salesys.login"])
+#     orquestador.al_finalizar("SalesYs", session.cleanup)
+#     orquestador.ejecutar()
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+TAREA_OK = "ok"
+TAREA_ERROR = "error"
+TAREA_OMITIDA = "omitida"
+
+
+@dataclass
+class Tarea:
+    """Unidad de trabajo del orquestador."""
+    nombre: str
+    funcion: Callable
+    plataforma: str
+    depende_de: tuple = ()
+    # Tareas con la misma sesión nunca corren a la vez (default: la plataforma)
+    sesion: Optional[str] = None
+    # True: corre en un proceso aparte (la función y su resultado deben ser picklables)
+    en_proceso: bool = False
+    estado: Optional[str] = None
+    resultado: object = None
+    error: Optional[str] = None
+    inicio: Optional[float] = None
+    fin: Optional[float] = None
+
+    @property
+    def duracion(self) -> float:
+        return (self.fin - self.inicio) if self.inicio and self.fin else 0.0
+
+
+class Orquestador:
+    """
+    Ejecuta tareas con dependencias sobre asyncio.
+
+    Args:
+        max_hilos: Hilos del executor para trabajo bloqueante (default: uno por sesión)
+        log_fn: Función de logging
+    """
+
+    def __init__(self, max_hilos=None, log_fn=print):
+        self.max_hilos = max_hilos
+        self.log_fn = log_fn
+        self.tareas = {}
+        self._cierres = {}
+
+    def agregar(self, nombre, funcion, plataforma, depende_de=(), sesion=None, en_proceso=False) -> Tarea:
+        """Declara una tarea. 'funcion' se llama sin argumentos (usar functools.partial)."""
+        if nombre in self.tareas:
+            raise ValueError(f"Tarea duplicada: {nombre}")
+        tarea = Tarea(nombre, funcion, plataforma, tuple(depende_de), sesion or plataforma, en_proceso)
+        self.tareas[nombre] = tarea
+        return tarea
+
+    def al_finalizar(self, plataforma, funcion):
+        """Registra una función de cierre que corre cuando terminan todas las tareas de la plataforma."""
+        self._cierres.setdefault(plataforma, []).append(funcion)
+
+    # ====================================
+    # EJECUCIÓN
+    # ====================================
+
+    def ejecutar(self) -> dict:
+        """
+        Ejecuta todas las tareas respetando dependencias y sesiones.
+
+        Returns:
+            Dict {nombre: Tarea} con estado, resultado y tiempos
+        """
+        self._validar()
+        if not self.tareas:
+            return {}
+
+        inicio = time.time()
+        asyncio.run(self._ejecutar_todas())
+        self._imprimir_resumen(time.time() - inicio)
+        return self.tareas
+
+    def _validar(self):
+        """Dependencias existentes y sin ciclos (antes de lanzar nada)."""
+        for tarea in self.tareas.values():
+            faltantes = [d for d in tarea.depende_de if d not in self.tareas]
+            if faltantes:
+                raise ValueError(f"La tarea '{tarea.nombre}' depende de tareas inexistentes: {faltantes}")
+
+        visitadas, en_curso = set(), set()
+
+        def visitar(nombre, camino):
+            if nombre in en_curso:
+                raise ValueError(f"Dependencia circular: {' → '.join(camino + [nombre])}")
+            if nombre in visitadas:
+                return
+            en_curso.add(nombre)
+            for dependencia in self.tareas[nombre].depende_de:
+                visitar(dependencia, camino + [nombre])
+            en_curso.discard(nombre)
+            visitadas.add(nombre)
+
+        for nombre in self.tareas:
+            visitar(nombre, [])
+
+    async def _ejecutar_todas(self):
+        loop = asyncio.get_running_loop()
+        sesiones = {t.sesion for t in self.tareas.values()}
+        hilos = ThreadPoolExecutor(max_workers=self.max_hilos or max(1, len(sesiones)),
+                                   thread_name_prefix="orquestador")
+        procesos = ProcessPoolExecutor() if any(t.en_proceso for t in self.tareas.values()) else None
+
+        self._locks = {sesion: asyncio.Lock() for sesion in sesiones}
+        self._terminadas = {nombre: asyncio.Event() for nombre in self.tareas}
+        self._pendientes_por_plataforma = {}
+        for tarea in self.tareas.values():
+            self._pendientes_por_plataforma[tarea.plataforma] = self._pendientes_por_plataforma.get(tarea.plataforma, 0) + 1
+
+        try:
+            await asyncio.gather(*(
+                self._ejecutar_tarea(tarea, loop, procesos if tarea.en_proceso else hilos)
+                for tarea in self.tareas.values()
+            ))
+        finally:
+            hilos.shutdown(wait=True)
+            if procesos is not None:
+                procesos.shutdown(wait=True)
+
+    async def _ejecutar_tarea(self, tarea, loop, executor):
+        try:
+            for dependencia in tarea.depende_de:
+                await self._terminadas[dependencia].wait()
+
+            fallidas = [d for d in tarea.depende_de if self.tareas[d].estado != TAREA_OK]
+            if fallidas:
+                tarea.estado = TAREA_OMITIDA
+                tarea.error = f"Dependencias sin completar: {fallidas}"
+                self.log_fn(f"[Orquestador] ⚠ {tarea.nombre} omitida ({tarea.error})")
+                return
+
+            async with self._locks[tarea.sesion]:
+                tarea.inicio = time.time()
+                try:
+                    tarea.resultado = await loop.run_in_executor(executor, tarea.funcion)
+                    tarea.estado = TAREA_OK
+                except Exception as e:
+                    tarea.estado = TAREA_ERROR
+                    tarea.error = str(e)
+                    self.log_fn(f"[Orquestador] ✗ {tarea.nombre}: {e}")
+                finally:
+                    tarea.fin = time.time()
+        finally:
+            self._terminadas[tarea.nombre].set()
+            await self._tarea_terminada(tarea.plataforma, loop)
+
+    async def _tarea_terminada(self, plataforma, loop):
+        """Al terminar la última tarea de la plataforma, corre sus funciones de cierre."""
+        self._pendientes_por_plataforma[plataforma] -= 1
+        if self._pendientes_por_plataforma[plataforma] > 0:
+            return
+        for cierre in self._cierres.pop(plataforma, []):
+            try:
+                await loop.run_in_executor(None, cierre)
+            except Exception as e:
+                self.log_fn(f"[Orquestador] ⚠ Error en cierre de {plataforma}: {e}")
+
+    # ====================================
+    # RESUMEN
+    # ====================================
+
+    def _imprimir_resumen(self, duracion_total):
+        """Tiempo de pared por plataforma y por tarea."""
+        self.log_fn("\n" + "=" * 60)
+        self.log_fn("RESUMEN DEL ORQUESTADOR")
+        self.log_fn("=" * 60)
+
+        por_plataforma = {}
+        for tarea in self.tareas.values():
+            por_plataforma.setdefault(tarea.plataforma, []).append(tarea)
+
+        suma_secuencial = 0.0
+        for plataforma, tareas in por_plataforma.items():
+            ejecutadas = [t for t in tareas if t.inicio and t.fin]
+            pared = (max(t.fin for t in ejecutadas) - min(t.inicio for t in ejecutadas)) if ejecutadas else 0.0
+            suma_secuencial += pared
+            self.log_fn(f"  {plataforma}: {pared:.1f}s de pared")
+            for tarea in tareas:
+                marca = {TAREA_OK: "✓", TAREA_ERROR: "✗"}.get(tarea.estado, "⚠")
+                self.log_fn(f"    {marca} {tarea.nombre}: {tarea.duracion:.1f}s ({tarea.estado})")
+
+        self.log_fn(f"  Total: {duracion_total:.1f}s de pared "
+                    f"(suma por plataforma: {suma_secuencial:.1f}s)")
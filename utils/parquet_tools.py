@@ -0,0 +1,132 @@
+# ====================================
+# CONVERSIÓN CSV → PARQUET (STREAMING)
+# ====================================
+# Copia columnar, tipada y comprimida de cada CSV descargado para el
+# análisis posterior. El CSV se lee por bloques con el lector streaming
+# de pyarrow y cada bloque se escribe como un row group: la memoria queda
+# acotada al tamaño de bloque, sin importar el tamaño del archivo.
+
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# Tipos admitidos en routes.yaml (parquet.columnas)
+TIPOS = {
+    "string": pa.string(),
+    "int": pa.int64(),
+    "int64": pa.int64(),
+    "float": pa.float64(),
+    "float64": pa.float64(),
+    "bool": pa.bool_(),
+    "date": pa.date32(),
+    "timestamp": pa.timestamp("s"),
+}
+
+TAMANO_BLOQUE = 8 * 1024 * 1024  # Bytes de CSV por bloque (≈ un row group)
+
+
+def _tipo(nombre):
+    try:
+        return TIPOS[str(nombre).lower()]
+    except KeyError:
+        raise ValueError(f"Tipo de columna desconocido '{nombre}'. Opciones: {sorted(TIPOS)}")
+
+
+def csv_a_parquet(archivo, destino, columnas=None, separador=',', formato_fecha=None,
+                  compresion="zstd", encoding="utf8", tamano_bloque=TAMANO_BLOQUE) -> dict:
+    """
+    Convierte un CSV a Parquet por bloques.
+
+    Args:
+        archivo: CSV de origen
+        destino: Archivo .parquet a escribir (se escribe a '.part' y se renombra)
+        columnas: Dict {columna: tipo} (routes.yaml). Columnas no declaradas se infieren.
+                  None = inferir todo el esquema del primer bloque.
+        separador: Separador del CSV
+        formato_fecha: Formato strptime de fechas/timestamps (ej. "%d/%m/%Y")
+        compresion: Códec Parquet (zstd, snappy, gzip, none)
+        encoding: Encoding del CSV
+
+    Returns:
+        Dict con filas, row_groups, bytes y segundos
+    """
+    archivo, destino = Path(archivo), Path(destino)
+    inicio = time.perf_counter()
+
+    try:
+        filas, grupos = _convertir(archivo, destino, columnas or {}, separador, formato_fecha,
+                                   compresion, encoding, tamano_bloque, todo_texto=False)
+    except pa.ArrowInvalid as e:
+        if columnas:
+            raise
+        # Esquema inferido del primer bloque que no sirve para el resto del archivo
+        print(f"  ⚠ Parquet: tipos inferidos inconsistentes ({e}), se escribe todo como texto")
+        filas, grupos = _convertir(archivo, destino, {}, separador, formato_fecha,
+                                   compresion, encoding, tamano_bloque, todo_texto=True)
+
+    return {
+        'filas': filas,
+        'row_groups': grupos,
+        'bytes': destino.stat().st_size,
+        'segundos': time.perf_counter() - inicio,
+    }
+
+
+def _convertir(archivo, destino, columnas, separador, formato_fecha, compresion, encoding, tamano_bloque, todo_texto):
+    # Las fechas con formato propio se leen como timestamp y se convierten a date por bloque
+    tipos_lectura = {}
+    a_fecha = []
+    for columna, tipo in columnas.items():
+        tipo_arrow = _tipo(tipo)
+        if tipo_arrow == pa.date32() and formato_fecha:
+            tipos_lectura[columna] = pa.timestamp("s")
+            a_fecha.append(columna)
+        else:
+            tipos_lectura[columna] = tipo_arrow
+
+    opciones_conversion = pa_csv.ConvertOptions(
+        column_types=tipos_lectura,
+        timestamp_parsers=[formato_fecha] if formato_fecha else None,
+        strings_can_be_null=True,
+    )
+    opciones_lectura = pa_csv.ReadOptions(block_size=tamano_bloque, encoding=encoding)
+
+    if todo_texto:
+        # Leer solo el encabezado para declarar todas las columnas como string
+        with pa_csv.open_csv(archivo, read_options=opciones_lectura,
+                             parse_options=pa_csv.ParseOptions(delimiter=separador)) as lector:
+            opciones_conversion.column_types = {n: pa.string() for n in lector.schema.names}
+
+    lector = pa_csv.open_csv(
+        archivo,
+        read_options=opciones_lectura,
+        parse_options=pa_csv.ParseOptions(delimiter=separador),
+        convert_options=opciones_conversion,
+    )
+
+    esquema = lector.schema
+    for columna in a_fecha:
+        if columna in esquema.names:
+            esquema = esquema.set(esquema.get_field_index(columna), pa.field(columna, pa.date32()))
+
+    temporal = destino.with_name(destino.name + ".part")
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    filas = grupos = 0
+    try:
+        with lector, pq.ParquetWriter(temporal, esquema, compression=compresion) as escritor:
+            for lote in lector:
+                for columna in a_fecha:
+                    if columna in lote.schema.names:
+                        indice = lote.schema.get_field_index(columna)
+                        lote = lote.set_column(indice, columna, lote.column(indice).cast(pa.date32()))
+                escritor.write_batch(lote)
+                filas += lote.num_rows
+                grupos += 1
+        temporal.replace(destino)
+    finally:
+        if temporal.exists():
+            temporal.unlink()
+    return filas, grupos
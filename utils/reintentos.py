@@ -0,0 +1,184 @@
+# ====================================
+# POLÍTICA DE REINTENTOS
+# ====================================
+# Backoff exponencial con jitter, circuit breaker y cola de items diferidos.
+#
+# Un item que falla no se reintenta en el momento: queda diferido y se
+# vuelve a intentar después de la pasada principal, en rondas separadas por
+# un backoff creciente. Así un error puntual no frena al resto de los items
+# y el servidor tiene tiempo de recuperarse entre intentos.
+#
+# El circuit breaker cuenta fallos consecutivos del reporte: al llegar al
+# umbral se abre y los items siguientes se difieren sin intentarlos (en vez
+# de gastar un timeout tras otro contra un servidor caído). Pasada la pausa
+# deja pasar un item de prueba: si sale bien se cierra, si falla se reabre.
+#
+# Uso:
+#     politica = PoliticaReintentos.desde_config(routes['rga'].get('reintentos'))
+#     time.sleep(espera_backoff(intento, base=1, maximo=10))
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+# Claves admitidas en 'reintentos' de routes.yaml (default: REINTENTOS_DEFAULT en settings)
+CLAVES_REINTENTOS = frozenset({'intentos', 'espera_base', 'espera_max', 'circuito'})
+CLAVES_CIRCUITO = frozenset({'fallos', 'pausa'})
+
+
+def espera_backoff(intento, base=1.0, maximo=60.0) -> float:
+    """
+    Segundos a esperar antes del reintento 'intento' (1, 2, 3...).
+
+    Backoff exponencial con jitter completo: un valor al azar entre 0 y
+    base * 2^(intento-1), con tope 'maximo'. El azar evita que varios
+    workers reintenten contra el servidor en el mismo instante.
+    """
+    return random.uniform(0, min(maximo, base * 2 ** max(0, intento - 1)))
+
+
+@dataclass(frozen=True)
+class PoliticaReintentos:
+    """
+    Reintentos de un reporte.
+
+    Args:
+        intentos: Intentos totales por item (1 = sin reintentos)
+        espera_base: Segundos base del backoff entre rondas
+        espera_max: Tope de segundos de una espera
+        fallos_circuito: Fallos consecutivos que abren el circuito (0 = sin circuito)
+        pausa_circuito: Segundos que el circuito queda abierto antes del item de prueba
+    """
+    intentos: int = 3
+    espera_base: float = 5.0
+    espera_max: float = 60.0
+    fallos_circuito: int = 5
+    pausa_circuito: float = 60.0
+
+    @classmethod
+    def desde_config(cls, config):
+        """
+        Política desde la opción 'reintentos' de routes.yaml, sobre REINTENTOS_DEFAULT.
+        'reintentos: false' = un solo intento y sin circuito.
+        """
+        from config.settings import REINTENTOS_DEFAULT
+
+        if config is False:
+            return cls(intentos=1, fallos_circuito=0)
+        opciones = {**REINTENTOS_DEFAULT, **(config if isinstance(config, dict) else {})}
+        circuito = {**REINTENTOS_DEFAULT['circuito'], **(opciones.get('circuito') or {})}
+        return cls(
+            intentos=int(opciones['intentos']),
+            espera_base=float(opciones['espera_base']),
+            espera_max=float(opciones['espera_max']),
+            fallos_circuito=int(circuito['fallos']),
+            pausa_circuito=float(circuito['pausa']),
+        )
+
+    def espera(self, ronda) -> float:
+        return espera_backoff(ronda, self.espera_base, self.espera_max)
+
+
+class CircuitoReporte:
+    """
+    Circuit breaker de un reporte (cerrado → abierto → semiabierto).
+
+    Seguro entre hilos: los resultados del despacho en segundo plano
+    también cuentan como éxito o fallo.
+    """
+
+    def __init__(self, umbral, pausa):
+        self.umbral = umbral
+        self.pausa = pausa
+        self._fallos = 0
+        self._abierto_desde = None
+        self._lock = threading.Lock()
+
+    def registrar(self, exito):
+        with self._lock:
+            if exito:
+                self._fallos, self._abierto_desde = 0, None
+                return
+            self._fallos += 1
+            if self.umbral and self._fallos >= self.umbral:
+                # Un fallo en semiabierto vuelve a abrir con la pausa completa
+                self._abierto_desde = time.monotonic()
+
+    @property
+    def abierto(self) -> bool:
+        """True mientras dura la pausa. Al vencer queda semiabierto (deja pasar un item)."""
+        with self._lock:
+            return self._abierto_desde is not None and self._restante() > 0
+
+    def restante(self) -> float:
+        """Segundos hasta que el circuito deje pasar el próximo item."""
+        with self._lock:
+            return self._restante() if self._abierto_desde is not None else 0.0
+
+    def _restante(self) -> float:
+        return max(0.0, self.pausa - (time.monotonic() - self._abierto_desde))
+
+
+class ColaReintentos:
+    """
+    Items diferidos de un reporte con su cuenta de intentos.
+
+    Uso en el flujo:
+        if not cola.diferir(item, resultado, exito):   # True = quedó diferido
+            registrar(item, resultado)                 # resultado final
+        ...
+        for ronda in range(1, politica.intentos + 1):  # después de la pasada principal
+            cola.esperar_ronda(ronda)
+            for item in cola.tomar_diferidos(): ...
+    """
+
+    def __init__(self, politica: PoliticaReintentos, log_fn=print):
+        self.politica = politica
+        self.log_fn = log_fn
+        self.circuito = CircuitoReporte(politica.fallos_circuito, politica.pausa_circuito)
+        self._intentos = {}
+        self._diferidos = []
+        self._ultimo_error = {}
+        self._lock = threading.Lock()
+
+    def diferir(self, work_item, resultado, exito) -> bool:
+        """
+        Cuenta el intento del item. Si falló y le quedan intentos, lo difiere.
+
+        Returns:
+            True si el item quedó diferido (su resultado todavía no es final)
+        """
+        self.circuito.registrar(exito)
+        if exito:
+            return False
+        clave = repr(work_item)
+        with self._lock:
+            self._intentos[clave] = self._intentos.get(clave, 0) + 1
+            if self._intentos[clave] >= self.politica.intentos:
+                return False
+            self._diferidos.append(work_item)
+            self._ultimo_error[clave] = resultado
+            return True
+
+    def posponer(self, work_item):
+        """Difiere el item sin intentarlo (circuito abierto): no gasta intentos."""
+        with self._lock:
+            self._diferidos.append(work_item)
+
+    def tomar_diferidos(self) -> list:
+        with self._lock:
+            diferidos, self._diferidos = self._diferidos, []
+        return diferidos
+
+    def ultimo_error(self, work_item):
+        """Último resultado con error del item (el que se entrega si ya no se reintenta)."""
+        with self._lock:
+            return self._ultimo_error.get(repr(work_item))
+
+    def esperar_ronda(self, ronda):
+        """Backoff antes de la ronda; si el circuito está abierto, además espera su pausa."""
+        espera = max(self.politica.espera(ronda), self.circuito.restante())
+        if espera > 0:
+            self.log_fn(f"  ⏳ Ronda de reintentos {ronda}: esperando {espera:.1f}s")
+            time.sleep(espera)
@@ -1,89 +1,416 @@
 # ====================================
 # CONSTRUCTOR DE RUTAS DESDE YAML
 # ====================================
+# routes.yaml se compila una sola vez en un plan inmutable por reporte:
+# esquema validado y plantillas ya parseadas. Un error de configuración
+# (placeholder desconocido, reporte sin 'rutas' ni 'archivos', usuario sin
+# entrada en 'archivos'...) se informa al arrancar, antes de abrir el
+# navegador, y no a mitad de la ejecución con la descarga ya hecha.
+#
+# Las rutas y nombres de archivo se memorizan por (fecha, producto/usuario):
+# en un backfill largo cada combinación se arma una sola vez.
+
+import string
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import Optional
+
 from config.settings import ROUTES, MESES_ES, BASE_OUTPUT_PATH
 
 # Usar BASE_PATH desde settings (configurado en .env)
 BASE_PATH = Path(BASE_OUTPUT_PATH)
 
+VARIABLES_FECHA = frozenset({'year', 'month', 'day'})
+VARIABLES_PRODUCTO = frozenset({'product', 'product_lower'})
+VARIABLES_USUARIO = frozenset({'usuario', 'usuario_lower'})
 
-def build_destination_paths(reporte_nombre, fecha_dt, producto=None, usuario=None, **kwargs):
-    """
-    Construye rutas de destino desde configuración YAML (file_routes.yaml).
+# Claves admitidas por reporte en routes.yaml (una clave desconocida suele ser un error de tipeo)
+CLAVES_REPORTE = frozenset({
+    'form_url', 'date_fields', 'motor', 'rutas', 'filename', 'extension', 'desplegable',
+    'archivos', 'usuarios', 'rango', 'lean', 'bd', 'parquet', 'pestanas', 'reintentos',
+    'validacion', 'frescura',
+})
+MOTORES = ("selenium", "http")
+TIPOS_DESPLEGABLE = ("chosen", "select")
 
-    Args:
-        reporte_nombre: Nombre del reporte (ej: "estado_agente_v2", "rga")
-        fecha_dt: datetime object
-        producto: Producto (solo para RGA y reportes con múltiples productos)
-        usuario: Usuario (solo para reportes con múltiples usuarios)
+# Claves admitidas (y su tipo) en los bloques opcionales 'lean', 'bd' y 'parquet'
+OPCIONES_BLOQUES = {
+    'lean': {'ocultar_resultados': bool, 'bloquear': list},
+    'bd': {'tabla': str, 'esquema': str, 'separador': str, 'encoding': str, 'tamano_lote': int, 'requerido': bool},
+    'parquet': {'columnas': dict, 'formato_fecha': str, 'compresion': str, 'separador': str, 'encoding': str},
+}
+# Mismos nombres que utils/parquet_tools.TIPOS (no se importa: requiere pyarrow)
+TIPOS_PARQUET = frozenset({'string', 'int', 'int64', 'float', 'float64', 'bool', 'date', 'timestamp'})
+COMPRESIONES_PARQUET = ("zstd", "snappy", "gzip", "brotli", "lz4", "none")
 
-    Returns:
-        Lista de Path objects con las rutas completas de destino
-    """
-    # Obtener configuración del reporte
-    config = ROUTES.get(reporte_nombre)
 
-    if not config:
-        print(f"[WARNING] No hay configuración YAML para '{reporte_nombre}'")
-        # Fallback a ruta genérica
-        return [BASE_PATH / reporte_nombre / f"{fecha_dt.year}" / f"{fecha_dt.month:02d}"]
+class RoutesInvalidasError(ValueError):
+    """routes.yaml no pasó la validación. 'errores' lista cada problema encontrado."""
+
+    def __init__(self, errores):
+        self.errores = list(errores)
+        super().__init__("routes.yaml inválido:\n" + "\n".join(f"  - {e}" for e in self.errores))
+
+
+# ====================================
+# PLAN COMPILADO
+# ====================================
+
+@dataclass(frozen=True)
+class Plantilla:
+    """Plantilla str.format ya parseada: tupla de (literal, campo, formato)."""
+    texto: str
+    partes: tuple
+
+    @classmethod
+    def compilar(cls, texto, permitidas, contexto, errores) -> "Plantilla":
+        if not isinstance(texto, str):
+            errores.append(f"{contexto}: se esperaba texto, no {type(texto).__name__}")
+            return cls("", ())
+        try:
+            partes = tuple(
+                (literal, campo, formato or '')
+                for literal, campo, formato, _ in string.Formatter().parse(texto)
+            )
+        except ValueError as e:
+            errores.append(f"{contexto}: plantilla mal formada '{texto}' ({e})")
+            return cls(texto, ())
+
+        for _, campo, _ in partes:
+            if campo is not None and campo not in permitidas:
+                errores.append(
+                    f"{contexto}: placeholder desconocido '{{{campo}}}' en '{texto}'. "
+                    f"Disponibles: {sorted(permitidas)}"
+                )
+        return cls(texto, partes)
+
+    def render(self, variables) -> str:
+        return "".join(
+            literal + (format(variables[campo], formato) if campo is not None else "")
+            for literal, campo, formato in self.partes
+        )
+
+
+@dataclass(frozen=True)
+class PlanArchivo:
+    """Nombre y carpetas de destino de un reporte simple o de una opción de 'archivos'."""
+    filename: Plantilla
+    rutas: tuple
+    extension: str
+
+    @lru_cache(maxsize=8192)
+    def _construir(self, fecha, producto, usuario):
+        variables = _variables(fecha, producto, usuario)
+        nombre = self.filename.render(variables) + self.extension
+        return nombre, tuple(BASE_PATH / ruta.render(variables) / nombre for ruta in self.rutas)
+
+    def nombre_archivo(self, fecha_dt, producto=None, usuario=None) -> str:
+        return self._construir(_como_fecha(fecha_dt), producto, usuario)[0]
 
-    # Variables disponibles para reemplazo
+    def destinos(self, fecha_dt, producto=None, usuario=None) -> list:
+        return list(self._construir(_como_fecha(fecha_dt), producto, usuario)[1])
+
+
+@dataclass(frozen=True)
+class PlanReporte:
+    """Configuración validada de un reporte de routes.yaml."""
+    nombre: str
+    form_url: str
+    date_fields: tuple
+    motor: str
+    extension: str
+    simple: Optional[PlanArchivo]       # Reportes con 'rutas'
+    archivos: MappingProxyType          # Reportes con 'archivos': {opción: PlanArchivo}
+    por_usuario: bool                   # Las opciones de 'archivos' son usuarios (no productos)
+
+    def plan_archivo(self, producto=None, usuario=None) -> Optional[PlanArchivo]:
+        """Plan del item (None si la opción no está en 'archivos')."""
+        if self.simple is not None:
+            return self.simple
+        return self.archivos.get(producto or usuario)
+
+
+def _como_fecha(fecha_dt):
+    return fecha_dt.date() if hasattr(fecha_dt, 'date') else fecha_dt
+
+
+def _variables(fecha, producto, usuario):
     variables = {
-        'year': str(fecha_dt.year),
-        'month': MESES_ES[fecha_dt.month],  # Nombre del mes en español
-        'day': fecha_dt.strftime('%d'),
+        'year': str(fecha.year),
+        'month': MESES_ES[fecha.month],  # Nombre del mes en español
+        'day': f"{fecha.day:02d}",
     }
-
-    # Variables específicas para productos
     if producto:
         variables['product'] = producto.upper()
         variables['product_lower'] = producto.lower()
-
-    # Variables específicas para usuarios
     if usuario:
         variables['usuario'] = usuario
         variables['usuario_lower'] = usuario.lower()
+    return variables
 
-    # Construir rutas de destino
-    rutas_destino = []
 
-    # Caso 1: Reporte simple con lista 'rutas' (ej: estado_agente_v2)
-    if 'rutas' in config:
-        filename_template = config.get('filename', 'archivo')
-        extension = config.get('extension', '.csv')
-        filename = filename_template.format(**variables) + extension
+# ====================================
+# COMPILACIÓN Y VALIDACIÓN
+# ====================================
 
-        for ruta_template in config['rutas']:
-            ruta_relativa = ruta_template.format(**variables)
-            ruta_completa = BASE_PATH / ruta_relativa / filename
-            rutas_destino.append(ruta_completa)
+def compilar_routes(routes) -> dict:
+    """
+    Valida routes.yaml completo y devuelve {reporte: PlanReporte}.
 
-    # Caso 2: Reporte con archivos por producto o usuario (ej: rga, rechazo_delivery)
-    elif 'archivos' in config:
-        # Determinar la clave a buscar (producto o usuario)
-        clave = producto or usuario
-        tipo = "producto" if producto else "usuario"
+    Raises:
+        RoutesInvalidasError: con todos los problemas encontrados (no solo el primero)
+    """
+    errores = []
+    planes = {}
+    for nombre, config in (routes or {}).items():
+        plan = _compilar_reporte(str(nombre), config, errores)
+        if plan is not None:
+            planes[nombre] = plan
+    if errores:
+        raise RoutesInvalidasError(errores)
+    return planes
+
+
+def _compilar_reporte(nombre, config, errores):
+    if not isinstance(config, dict):
+        errores.append(f"{nombre}: se esperaba un bloque de opciones")
+        return None
+
+    desconocidas = sorted(set(config) - CLAVES_REPORTE)
+    if desconocidas:
+        errores.append(f"{nombre}: claves desconocidas {desconocidas}")
+
+    form_url = config.get('form_url')
+    if not isinstance(form_url, str) or not form_url:
+        errores.append(f"{nombre}.form_url: obligatorio")
+
+    date_fields = config.get('date_fields', ['from', 'to'])
+    if not (isinstance(date_fields, list) and len(date_fields) == 2 and all(isinstance(c, str) for c in date_fields)):
+        errores.append(f"{nombre}.date_fields: se esperaba una lista de dos ids, ej. [\"from\", \"to\"]")
+
+    motor = config.get('motor', 'selenium')
+    if motor not in MOTORES:
+        errores.append(f"{nombre}.motor: '{motor}' no es válido. Opciones: {list(MOTORES)}")
+
+    extension = config.get('extension', '.csv')
+    if not isinstance(extension, str):
+        errores.append(f"{nombre}.extension: se esperaba texto")
+        extension = '.csv'
+
+    _validar_opciones(nombre, config, errores)
+
+    por_usuario = 'usuarios' in config
+    simple = None
+    archivos = {}
+
+    if ('rutas' in config) == ('archivos' in config):
+        errores.append(f"{nombre}: debe definir 'rutas' o 'archivos' (uno de los dos)")
+
+    elif 'rutas' in config:
+        simple = _compilar_archivo(f"{nombre}", config.get('filename', 'archivo'), config['rutas'],
+                                   extension, VARIABLES_FECHA, errores)
+
+    else:
+        opciones = config['archivos']
+        if not isinstance(opciones, dict) or not opciones:
+            errores.append(f"{nombre}.archivos: se esperaba un bloque con al menos una opción")
+            opciones = {}
+        permitidas = VARIABLES_FECHA | (VARIABLES_USUARIO if por_usuario else VARIABLES_PRODUCTO)
+        for clave, item_config in opciones.items():
+            contexto = f"{nombre}.archivos.{clave}"
+            if not isinstance(item_config, dict):
+                errores.append(f"{contexto}: se esperaba un bloque con 'rutas' y 'filename'")
+                continue
+            archivos[str(clave)] = _compilar_archivo(
+                contexto, item_config.get('filename', str(clave).lower()), item_config.get('rutas'),
+                extension, permitidas, errores,
+            )
 
-        if clave and clave in config['archivos']:
-            item_config = config['archivos'][clave]
+        usuarios = config.get('usuarios')
+        if por_usuario:
+            if not isinstance(usuarios, list) or not usuarios:
+                errores.append(f"{nombre}.usuarios: se esperaba una lista no vacía")
+            else:
+                sin_archivo = [u for u in usuarios if str(u) not in archivos]
+                if sin_archivo:
+                    errores.append(f"{nombre}.usuarios: sin entrada en 'archivos': {sin_archivo}")
 
-            # Leer filename específico del producto/usuario
-            filename_template = item_config.get('filename', clave.lower())
-            extension = config.get('extension', '.csv')
-            filename = filename_template.format(**variables) + extension
+    return PlanReporte(
+        nombre=nombre,
+        form_url=form_url if isinstance(form_url, str) else '',
+        date_fields=tuple(date_fields) if isinstance(date_fields, list) else (),
+        motor=motor,
+        extension=extension,
+        simple=simple,
+        archivos=MappingProxyType(archivos),
+        por_usuario=por_usuario,
+    )
 
-            # Leer rutas del producto/usuario
-            rutas_item = item_config.get('rutas', [])
-            for ruta_template in rutas_item:
-                ruta_relativa = ruta_template.format(**variables)
-                ruta_completa = BASE_PATH / ruta_relativa / filename
-                rutas_destino.append(ruta_completa)
-        else:
-            print(f"[WARNING] No hay configuración para {tipo} '{clave}' en '{reporte_nombre}'")
 
-    return rutas_destino
+def _compilar_archivo(contexto, filename, rutas, extension, permitidas, errores):
+    if not isinstance(rutas, list) or not rutas:
+        errores.append(f"{contexto}.rutas: se esperaba una lista no vacía")
+        rutas = []
+    return PlanArchivo(
+        filename=Plantilla.compilar(filename, permitidas, f"{contexto}.filename", errores),
+        rutas=tuple(
+            Plantilla.compilar(ruta, permitidas, f"{contexto}.rutas[{i}]", errores)
+            for i, ruta in enumerate(rutas)
+        ),
+        extension=extension,
+    )
+
+
+def _validar_opciones(nombre, config, errores):
+    """Forma de las opciones que se leen recién durante la ejecución."""
+    desplegable = config.get('desplegable')
+    if desplegable is not None:
+        if not isinstance(desplegable, dict) or not desplegable.get('id'):
+            errores.append(f"{nombre}.desplegable: se esperaba un bloque con 'id'")
+        elif desplegable.get('tipo', 'select') not in TIPOS_DESPLEGABLE:
+            errores.append(f"{nombre}.desplegable.tipo: '{desplegable.get('tipo')}' no es válido. "
+                           f"Opciones: {list(TIPOS_DESPLEGABLE)}")
+        if 'archivos' not in config:
+            errores.append(f"{nombre}.desplegable: requiere 'archivos' con las opciones a descargar")
+
+    rango = config.get('rango')
+    if rango is not None:
+        if not isinstance(rango, dict) or not rango.get('columna_fecha'):
+            errores.append(f"{nombre}.rango: se esperaba un bloque con 'columna_fecha'")
+        elif not isinstance(rango.get('max_dias', 31), int) or rango.get('max_dias', 31) < 1:
+            errores.append(f"{nombre}.rango.max_dias: se esperaba un entero positivo")
+
+    pestanas = config.get('pestanas')
+    if pestanas is not None and (not isinstance(pestanas, int) or isinstance(pestanas, bool) or pestanas < 1):
+        errores.append(f"{nombre}.pestanas: se esperaba un entero positivo")
+
+    _validar_reintentos(nombre, config.get('reintentos'), errores)
+    _validar_validacion(nombre, config.get('validacion'), errores)
+
+    frescura = config.get('frescura')
+    if frescura is not None and not isinstance(frescura, bool):
+        dias = frescura.get('dias_finales') if isinstance(frescura, dict) else None
+        if set(frescura if isinstance(frescura, dict) else ()) != {'dias_finales'} \
+                or not isinstance(dias, int) or isinstance(dias, bool) or dias < 0:
+            errores.append(f"{nombre}.frescura: se esperaba true/false o {{dias_finales: N}} (N >= 0)")
+
+    for clave in OPCIONES_BLOQUES:
+        _validar_bloque(nombre, clave, config.get(clave), errores)
+
+
+def _validar_bloque(nombre, clave, bloque, errores):
+    """Claves y tipos de un bloque 'lean', 'bd' o 'parquet'."""
+    if bloque is None or isinstance(bloque, bool):
+        return
+    if not isinstance(bloque, dict):
+        errores.append(f"{nombre}.{clave}: se esperaba true/false o un bloque de opciones")
+        return
+
+    tipos = OPCIONES_BLOQUES[clave]
+    desconocidas = sorted(set(bloque) - set(tipos))
+    if desconocidas:
+        errores.append(f"{nombre}.{clave}: claves desconocidas {desconocidas}")
+    for opcion, valor in bloque.items():
+        tipo = tipos.get(opcion)
+        # bool es subclase de int: 'tamano_lote: true' no es un entero
+        if tipo is not None and (not isinstance(valor, tipo) or (tipo is int and isinstance(valor, bool))):
+            errores.append(f"{nombre}.{clave}.{opcion}: se esperaba {tipo.__name__}, no {type(valor).__name__}")
+
+    tamano_lote = bloque.get('tamano_lote')
+    if isinstance(tamano_lote, int) and tamano_lote < 1:
+        errores.append(f"{nombre}.{clave}.tamano_lote: se esperaba un entero positivo")
+    bloquear = bloque.get('bloquear')
+    if isinstance(bloquear, list) and not all(isinstance(p, str) for p in bloquear):
+        errores.append(f"{nombre}.{clave}.bloquear: se esperaba una lista de patrones de URL")
+    columnas = bloque.get('columnas')
+    if clave == 'parquet' and isinstance(columnas, dict):
+        invalidas = {c: t for c, t in columnas.items() if str(t).lower() not in TIPOS_PARQUET}
+        if invalidas:
+            errores.append(f"{nombre}.parquet.columnas: tipos desconocidos {invalidas}. Opciones: {sorted(TIPOS_PARQUET)}")
+    compresion = bloque.get('compresion')
+    if isinstance(compresion, str) and compresion.lower() not in COMPRESIONES_PARQUET:
+        errores.append(f"{nombre}.parquet.compresion: '{compresion}' no es válida. Opciones: {list(COMPRESIONES_PARQUET)}")
+
+
+def _validar_reintentos(nombre, reintentos, errores):
+    from utils.reintentos import CLAVES_REINTENTOS, CLAVES_CIRCUITO
+
+    if reintentos is None or isinstance(reintentos, bool):
+        return
+    if not isinstance(reintentos, dict):
+        errores.append(f"{nombre}.reintentos: se esperaba true/false o un bloque de opciones")
+        return
+
+    desconocidas = sorted(set(reintentos) - CLAVES_REINTENTOS)
+    if desconocidas:
+        errores.append(f"{nombre}.reintentos: claves desconocidas {desconocidas}")
+    if 'intentos' in reintentos and not (isinstance(reintentos['intentos'], int) and reintentos['intentos'] >= 1):
+        errores.append(f"{nombre}.reintentos.intentos: se esperaba un entero positivo")
+    for clave in ('espera_base', 'espera_max'):
+        if clave in reintentos and not (isinstance(reintentos[clave], (int, float)) and reintentos[clave] >= 0):
+            errores.append(f"{nombre}.reintentos.{clave}: se esperaban segundos (número >= 0)")
+
+    circuito = reintentos.get('circuito')
+    if circuito is None:
+        return
+    if not isinstance(circuito, dict) or set(circuito) - CLAVES_CIRCUITO:
+        errores.append(f"{nombre}.reintentos.circuito: se esperaba un bloque con 'fallos' y/o 'pausa'")
+    elif not all(isinstance(v, (int, float)) and v >= 0 for v in circuito.values()):
+        errores.append(f"{nombre}.reintentos.circuito: 'fallos' y 'pausa' deben ser números >= 0")
+
+
+def _validar_validacion(nombre, validacion, errores):
+    from utils.validacion import CLAVES_VALIDACION
+
+    if validacion is None or isinstance(validacion, bool):
+        return
+    if not isinstance(validacion, dict):
+        errores.append(f"{nombre}.validacion: se esperaba true/false o un bloque de opciones")
+        return
+
+    desconocidas = sorted(set(validacion) - CLAVES_VALIDACION)
+    if desconocidas:
+        errores.append(f"{nombre}.validacion: claves desconocidas {desconocidas}")
+    columnas = validacion.get('columnas')
+    if columnas is not None and not (isinstance(columnas, list) and all(isinstance(c, str) for c in columnas)):
+        errores.append(f"{nombre}.validacion.columnas: se esperaba una lista de nombres de columna")
+    reintentos = validacion.get('reintentos', 1)
+    if not isinstance(reintentos, int) or isinstance(reintentos, bool) or reintentos < 0:
+        errores.append(f"{nombre}.validacion.reintentos: se esperaba un entero >= 0")
+
+
+# ====================================
+# API DE RUTAS
+# ====================================
+
+def build_destination_paths(reporte_nombre, fecha_dt, producto=None, usuario=None, **kwargs):
+    """
+    Construye rutas de destino desde configuración YAML (routes.yaml).
+
+    Args:
+        reporte_nombre: Nombre del reporte (ej: "estado_agente_v2", "rga")
+        fecha_dt: datetime object
+        producto: Producto (solo para RGA y reportes con múltiples productos)
+        usuario: Usuario (solo para reportes con múltiples usuarios)
+
+    Returns:
+        Lista de Path objects con las rutas completas de destino
+    """
+    plan = get_plan(reporte_nombre)
+
+    if plan is None:
+        print(f"[WARNING] No hay configuración YAML para '{reporte_nombre}'")
+        # Fallback a ruta genérica
+        return [BASE_PATH / reporte_nombre / f"{fecha_dt.year}" / f"{fecha_dt.month:02d}"]
+
+    plan_archivo = plan.plan_archivo(producto, usuario)
+    if plan_archivo is None:
+        tipo = "producto" if producto else "usuario"
+        print(f"[WARNING] No hay configuración para {tipo} '{producto or usuario}' en '{reporte_nombre}'")
+        return []
+    return plan_archivo.destinos(fecha_dt, producto, usuario)
 
 
 def build_filename(reporte_nombre, fecha_dt, producto=None, usuario=None, **kwargs):
@@ -99,29 +426,28 @@ def build_filename(reporte_nombre, fecha_dt, producto=None, usuario=None, **kwar
     Returns:
         String con el nombre del archivo incluyendo extensión
     """
-    config = ROUTES.get(reporte_nombre, {})
+    plan = get_plan(reporte_nombre)
+    plan_archivo = plan.plan_archivo(producto, usuario) if plan is not None else None
+    if plan_archivo is None:
+        # Opción sin entrada en 'archivos': nombre genérico (el item no tendrá destinos)
+        return 'archivo' + (plan.extension if plan is not None else '.csv')
+    return plan_archivo.nombre_archivo(fecha_dt, producto, usuario)
 
-    variables = {
-        'day': fecha_dt.strftime('%d'),
-        'month': MESES_ES[fecha_dt.month],
-        'year': str(fecha_dt.year),
-    }
 
-    if producto:
-        variables['product_lower'] = producto.lower()
-        variables['product'] = producto.upper()
+# ====================================
+# HELPER FUNCTION
+# ====================================
+_planes = None
 
-    if usuario:
-        variables['usuario'] = usuario
-        variables['usuario_lower'] = usuario.lower()
 
-    # Si hay archivos por producto o usuario, leer filename específico
-    clave = producto or usuario
-    if 'archivos' in config and clave and clave in config['archivos']:
-        filename_template = config['archivos'][clave].get('filename', clave.lower())
-    else:
-        filename_template = config.get('filename', 'archivo')
+def get_plan_routes() -> dict:
+    """Plan compilado de routes.yaml ({reporte: PlanReporte}); se valida una sola vez por proceso."""
+    global _planes
+    if _planes is None:
+        _planes = MappingProxyType(compilar_routes(ROUTES))
+    return _planes
 
-    extension = config.get('extension', '.csv')
 
-    return filename_template.format(**variables) + extension
+def get_plan(reporte_nombre) -> Optional[PlanReporte]:
+    """Plan compilado de un reporte, o None si no está en routes.yaml."""
+    return get_plan_routes().get(reporte_nombre)
@@ -12,8 +12,10 @@ from pathlib import Path
 from typing import Optional
 import logging
 import os
+import tempfile
 import time
 from config.settings import DOWNLOADS_DIR, CHROME_OPTIONS
+from utils.download_tracker import RastreadorCDP, VigilanteInotify
 
 
 # User-Agent realista para evitar detección de bots
@@ -30,13 +32,15 @@ class SeleniumDriver(webdriver.Chrome):
     Hereda de webdriver.Chrome y agrega métodos útiles para web scraping:
     - Configuración automática de descargas
     - Esperas inteligentes
-    - Gestión de descargas con CDP
+    - Gestión de descargas con CDP (eventos downloadWillBegin/downloadProgress)
     - Anti-detección
 
     Uso:
         driver = SeleniumDriver(headless=True)
         driver.get("https://example.com")
         driver.click(By.ID, "btn-login")
+        driver.preparar_descarga()
+        driver.click(By.ID, "btn-export")
         archivo = driver.esperar_descarga(extension=".xlsx")
         driver.quit()
     """
@@ -46,14 +50,23 @@ class SeleniumDriver(webdriver.Chrome):
         headless: Optional[bool] = None,
         download_dir: Optional[str] = None,
         chrome_driver_path: Optional[str] = None,
-        user_agent: Optional[str] = None
+        user_agent: Optional[str] = None,
+        profile_dir: Optional[str] = None,
+        lean: Optional[bool] = None
     ):
         """
         Inicializa el driver de Chrome con configuración optimizada para scraping.
+
+        Args:
+            profile_dir: Carpeta de perfil persistente (--user-data-dir). None = perfil temporal.
+            lean: Perfil mínimo (headless, sin imágenes ni tareas en segundo plano).
+                  Default: CHROME_OPTIONS["lean"]
         """
         # Configuración
-        self.headless = headless if headless is not None else CHROME_OPTIONS.get("headless", False)
+        self.lean = lean if lean is not None else CHROME_OPTIONS.get("lean", False)
+        self.headless = True if self.lean else (headless if headless is not None else CHROME_OPTIONS.get("headless", False))
         self.download_dir = Path(download_dir) if download_dir else DOWNLOADS_DIR
+        self.profile_dir = Path(profile_dir) if profile_dir else None
         self.chrome_driver_path = chrome_driver_path
         self.user_agent = user_agent if user_agent else DEFAULT_USER_AGENT
 
@@ -99,19 +112,49 @@ class SeleniumDriver(webdriver.Chrome):
             "profile.content_settings.exceptions.automatic_downloads.*.setting": 1,
             "download_restrictions": 0,
         }
+        if self.lean:
+            prefs["profile.managed_default_content_settings.images"] = 2  # Sin imágenes
         options.add_experimental_option("prefs", prefs)
 
+        # Performance log con eventos de Page (incluye downloadWillBegin/downloadProgress)
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": False, "enablePage": True})
+
         # Silenciar logs de Chrome
         options.add_experimental_option('excludeSwitches', ['enable-logging', 'enable-automation'])
         options.add_argument('--log-level=3')
         options.add_argument('--silent')
         options.add_argument('--disable-logging')
 
+        # Perfil persistente: conserva cookies y caché de disco entre ejecuciones
+        if self.profile_dir:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            options.add_argument(f"--user-data-dir={self.profile_dir.absolute()}")
+            options.add_argument("--profile-directory=Default")
+            options.add_argument("--no-first-run")
+            options.add_argument("--no-default-browser-check")
+            options.add_argument("--hide-crash-restore-bubble")
+
         # Modo headless
         if self.headless:
             options.add_argument("--headless=new")
             options.add_argument("--disable-gpu")
 
+        # Perfil lean: nada que no haga falta para llenar formularios y descargar
+        if self.lean:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_argument("--disable-background-networking")
+            options.add_argument("--disable-extensions")
+            options.add_argument("--disable-component-update")
+            options.add_argument("--disable-sync")
+            options.add_argument("--disable-default-apps")
+            options.add_argument("--mute-audio")
+            # La pestaña del formulario queda en segundo plano mientras se descarga
+            options.add_argument("--disable-background-timer-throttling")
+            options.add_argument("--disable-renderer-backgrounding")
+            # No esperar imágenes/hojas de estilo: el DOM listo alcanza para operar
+            options.page_load_strategy = "eager"
+
         # User agent y opciones de estabilidad
         options.add_argument(f"user-agent={self.user_agent}")
         options.add_argument("--no-sandbox")
@@ -137,10 +180,12 @@ class SeleniumDriver(webdriver.Chrome):
         self.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
 
         # Habilitar Chrome DevTools Protocol (CDP) para gestión de descargas
-        self.execute_cdp_cmd("Page.setDownloadBehavior", {
-            "behavior": "allow",
-            "downloadPath": str(self.download_dir.absolute())
-        })
+        self._directorio_actual = None
+        self.usar_directorio_descarga(self.download_dir)
+
+        self._rastreador = RastreadorCDP(self)
+        self._vigilante = None
+        self._inicio_descarga = None
 
     # ====================================
     # CONTEXT MANAGER (with statement)
@@ -174,17 +219,62 @@ class SeleniumDriver(webdriver.Chrome):
         elemento = self.esperar(by, value, timeout)
         elemento.click()
 
+    def bloquear_urls(self, patrones):
+        """
+        Bloquea en la pestaña actual las peticiones que coinciden con los patrones
+        (Network.setBlockedURLs, comodín '*'). Aplica a las cargas siguientes.
+        """
+        if not patrones:
+            return
+        try:
+            self.execute_cdp_cmd("Network.enable", {})
+            self.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patrones)})
+        except Exception as e:
+            # Sin bloqueo la página funciona igual, solo más lenta (modo lean apagado en esta pestaña)
+            print(f"[WARNING] No se pudo activar el bloqueo de URLs (Network.setBlockedURLs): {e}")
+
+    def detener_carga(self, ocultar_selector: Optional[str] = None):
+        """
+        Detiene la carga de la página actual (window.stop) y opcionalmente oculta
+        los elementos del selector, para no seguir renderizando contenido que no se usa.
+        """
+        self.execute_script(
+            "window.stop();"
+            "if (arguments[0]) { document.querySelectorAll(arguments[0]).forEach("
+            "function (e) { e.style.display = 'none'; }); }",
+            ocultar_selector,
+        )
+
     def _obtener_directorio_descargas(self) -> Path:
-        """Obtiene el directorio de descargas configurado usando CDP."""
+        """Obtiene el directorio de descargas configurado actualmente por CDP."""
+        return self._directorio_actual or self.download_dir
+
+    def usar_directorio_descarga(self, directorio) -> Path:
+        """
+        Envía las próximas descargas a 'directorio' (Page/Browser.setDownloadBehavior).
+
+        Chrome fija la ruta de cada descarga al iniciarla: cambiar el directorio
+        después de downloadWillBegin no afecta a las descargas en curso.
+        """
+        directorio = Path(directorio)
+        directorio.mkdir(parents=True, exist_ok=True)
+        ruta = str(directorio.absolute())
+
+        self.execute_cdp_cmd("Page.setDownloadBehavior", {"behavior": "allow", "downloadPath": ruta})
+
+        # Directorio a nivel navegador (cubre también pestañas nuevas). Sus eventos
+        # Browser.download* no llegan al performance log: se siguen los de Page
         try:
-            behavior = self.execute_cdp_cmd("Page.getDownloadBehavior", {})
-            download_path = behavior.get("downloadPath")
-            if download_path:
-                return Path(download_path)
-        except:
+            self.execute_cdp_cmd("Browser.setDownloadBehavior", {"behavior": "allow", "downloadPath": ruta})
+        except Exception:
             pass
 
-        return self.download_dir
+        self._directorio_actual = directorio
+        return directorio
+
+    def nuevo_directorio_descarga(self, prefijo: str = "item_") -> Path:
+        """Crea un subdirectorio único dentro de download_dir para una sola descarga."""
+        return Path(tempfile.mkdtemp(prefix=prefijo, dir=self.download_dir))
 
     def limpiar_descargas(self):
         """
@@ -201,25 +291,85 @@ class SeleniumDriver(webdriver.Chrome):
                 except Exception:
                     pass  # Ignorar archivos en uso
 
-    def esperar_descarga(self, timeout: int = 60, extension: str = None, limpiar_antes: bool = True) -> Path:
+    def preparar_descarga(self, directorio=None) -> Path:
+        """
+        Debe llamarse justo antes de hacer click en el link de descarga.
+
+        Si se indica 'directorio', la descarga irá ahí (aislada de cualquier
+        otra). Descarta eventos de descarga anteriores y, si no hay eventos
+        CDP, arma el vigilante inotify para no perder el evento de fin.
+
+        Returns:
+            Directorio donde se guardará la descarga
+        """
+        if directorio is not None:
+            self.usar_directorio_descarga(directorio)
+        self._inicio_descarga = time.time()
+
+        if self._rastreador.disponible:
+            self._rastreador.descartar_eventos()
+            return self._obtener_directorio_descargas()
+
+        self._cerrar_vigilante()
+        try:
+            self._vigilante = VigilanteInotify(self._obtener_directorio_descargas())
+        except OSError:
+            self._vigilante = None
+        return self._obtener_directorio_descargas()
+
+    def _cerrar_vigilante(self):
+        if self._vigilante is not None:
+            self._vigilante.cerrar()
+            self._vigilante = None
+
+    def esperar_descarga(self, timeout: int = 60, extension: str = None, limpiar_antes: bool = False,
+                         timeout_estancado: int = 15, directorio=None) -> Path:
         """
         Espera a que se complete una descarga.
 
+        Orden de estrategias:
+            1. Eventos CDP downloadWillBegin/downloadProgress (ruta exacta)
+            2. inotify sobre la carpeta de descargas (Linux, si se llamó a preparar_descarga)
+            3. Escaneo periódico de la carpeta
+
         Args:
             timeout: Tiempo máximo de espera en segundos
             extension: Extensión esperada del archivo (ej: '.csv')
-            limpiar_antes: Si True, limpia la carpeta antes de esperar
+            limpiar_antes: Si True, limpia la carpeta antes de esperar (solo escaneo periódico)
+            timeout_estancado: Segundos sin avance tras los que la descarga se da por fallida
+            directorio: Directorio de la descarga (default: el configurado actualmente)
 
         Returns:
             Path del archivo descargado
         """
-        directorio = self._obtener_directorio_descargas()
+        directorio = Path(directorio) if directorio else self._obtener_directorio_descargas()
+
+        try:
+            if self._rastreador.disponible:
+                return self._rastreador.esperar(directorio, timeout, timeout_estancado, extension)
+
+            if self._vigilante is not None:
+                vigilante, self._vigilante = self._vigilante, None
+                return vigilante.esperar(timeout, timeout_estancado, extension)
+
+            return self._esperar_descarga_escaneo(directorio, timeout, extension, limpiar_antes)
+        finally:
+            self._inicio_descarga = None
+            # Volver al directorio general si la descarga usaba uno propio
+            if directorio != self.download_dir and self._directorio_actual == directorio:
+                try:
+                    self.usar_directorio_descarga(self.download_dir)
+                except Exception:
+                    pass
 
+    def _esperar_descarga_escaneo(self, directorio: Path, timeout: int, extension: str, limpiar_antes: bool) -> Path:
+        """Fallback: escanea la carpeta hasta encontrar un archivo nuevo sin temporales activos."""
         # Opcionalmente limpiar carpeta para detección confiable
         if limpiar_antes:
             self.limpiar_descargas()
-            time.sleep(0.5)  # Breve pausa para que se complete la limpieza
 
+        # Solo cuentan archivos escritos después de preparar_descarga (o de ahora)
+        desde = (self._inicio_descarga or time.time()) - 1
         tiempo_inicio = time.time()
 
         while time.time() - tiempo_inicio < timeout:
@@ -234,8 +384,8 @@ class SeleniumDriver(webdriver.Chrome):
                 if extension:
                     archivos = [f for f in archivos if f.suffix == extension]
 
-                # Filtrar solo archivos (no directorios)
-                archivos = [f for f in archivos if f.is_file()]
+                # Filtrar solo archivos (no directorios) nuevos
+                archivos = [f for f in archivos if f.is_file() and f.stat().st_mtime >= desde]
 
                 if archivos:
                     # Retornar el más reciente
@@ -244,4 +394,4 @@ class SeleniumDriver(webdriver.Chrome):
 
             time.sleep(1.5)
 
-        raise TimeoutError(f"Descarga no completada en {timeout} segundos")
\ No newline at end of file
+        raise TimeoutError(f"Descarga no completada en {timeout} segundos")
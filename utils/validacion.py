@@ -0,0 +1,175 @@
+# ====================================
+# VALIDACIÓN DE DESCARGAS
+# ====================================
+# Revisa cada CSV descargado antes de despacharlo a las carpetas de red:
+# que no esté vacío, que no sea una página HTML de error guardada como .csv,
+# que no esté cortado (comillas sin cerrar), que el encabezado tenga las
+# columnas esperadas y que las fechas de las filas caigan en el rango pedido.
+#
+# El archivo se recorre una sola vez con mmap (sin cargarlo en memoria):
+# en la misma pasada se calcula el hash del contenido y se parsean las filas
+# en modo estricto (cuenta exacta, detecta el archivo cortado) y, si el
+# reporte declara 'columna_fecha', se leen las fechas.
+#
+# Uso:
+#     validacion = validar_descarga(archivo, columnas=["Fecha", "Agente"],
+#                                   columna_fecha="Fecha", desde=fecha, hasta=fecha)
+#     if not validacion.valida:
+#         print(validacion.errores)
+
+import csv
+import hashlib
+import mmap
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from utils.csv_tools import parsear_fecha, _normalizar_columna, _ENCODING_TRANSPARENTE
+
+# Claves admitidas en 'validacion' de routes.yaml
+CLAVES_VALIDACION = frozenset({'columnas', 'columna_fecha', 'formato_fecha', 'separador', 'reintentos'})
+
+TAMANO_BLOQUE = 1024 * 1024
+
+# Inicios de una página HTML (error del servidor, login) guardada con extensión .csv:
+# solo cuentan al principio del archivo (tras BOM y espacios), no dentro de una celda
+_MARCAS_HTML = (b'<!doctype html', b'<html')
+_BOM_UTF8 = b'\xef\xbb\xbf'
+
+
+@dataclass
+class ValidacionDescarga:
+    """Resultado de validar un archivo descargado."""
+    hash: Optional[str] = None
+    filas: int = 0
+    bytes: int = 0
+    encabezado: list = field(default_factory=list)
+    fecha_min: Optional[object] = None
+    fecha_max: Optional[object] = None
+    errores: list = field(default_factory=list)
+
+    @property
+    def valida(self) -> bool:
+        return not self.errores
+
+    def resumen(self) -> str:
+        rango = f", fechas {self.fecha_min} → {self.fecha_max}" if self.fecha_min else ""
+        return f"{self.filas} filas, {self.bytes / 1024:.0f} KB{rango}"
+
+
+def validar_descarga(archivo, columnas=None, columna_fecha=None, desde=None, hasta=None,
+                     separador=',', formato_fecha=None, algoritmo="sha256") -> ValidacionDescarga:
+    """
+    Valida un CSV descargado en una sola pasada con mmap.
+
+    Args:
+        archivo: CSV descargado
+        columnas: Columnas que el encabezado debe tener (puede tener más)
+        columna_fecha: Columna con la fecha de cada fila (activa el control de rango)
+        desde, hasta: Rango de fechas (date) pedido al servidor
+        separador: Separador de columnas
+        formato_fecha: Formato strptime de la columna (default: autodetección)
+
+    Returns:
+        ValidacionDescarga (con 'errores' vacío si el archivo es válido)
+    """
+    archivo = Path(archivo)
+    resultado = ValidacionDescarga(bytes=archivo.stat().st_size)
+    if resultado.bytes == 0:
+        resultado.hash = hashlib.new(algoritmo).hexdigest()
+        resultado.errores.append("El archivo está vacío")
+        return resultado
+
+    with open(archivo, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+        inicio = datos[:1024]
+        if inicio.startswith(_BOM_UTF8):
+            inicio = inicio[len(_BOM_UTF8):]
+        if inicio.lstrip().lower().startswith(_MARCAS_HTML):
+            resultado.hash = _hash(datos, algoritmo)
+            resultado.errores.append("El servidor devolvió una página HTML en lugar del CSV")
+            return resultado
+
+        _recorrer_filas(datos, resultado, algoritmo, columna_fecha, separador, formato_fecha, desde, hasta)
+
+    if columnas:
+        presentes = {_normalizar_columna(c) for c in resultado.encabezado}
+        faltantes = [c for c in columnas if _normalizar_columna(c) not in presentes]
+        if faltantes:
+            resultado.errores.append(f"Faltan columnas en el encabezado: {faltantes} (encabezado: {resultado.encabezado})")
+    return resultado
+
+
+def _hash(datos, algoritmo) -> str:
+    h = hashlib.new(algoritmo)
+    vista = memoryview(datos)
+    try:
+        for inicio in range(0, len(datos), TAMANO_BLOQUE):
+            h.update(vista[inicio:inicio + TAMANO_BLOQUE])
+    finally:
+        vista.release()
+    return h.hexdigest()
+
+
+def _recorrer_filas(datos, resultado, algoritmo, columna_fecha, separador, formato_fecha, desde, hasta):
+    """
+    Hash + filas (+ rango de fechas si hay 'columna_fecha'), con el CSV parseado
+    en streaming desde el mmap.
+    """
+    h = hashlib.new(algoritmo)
+
+    def lineas():
+        # Cada bloque leído del mmap alimenta el hash y el parser a la vez
+        resto = b''
+        for inicio in range(0, len(datos), TAMANO_BLOQUE):
+            bloque = datos[inicio:inicio + TAMANO_BLOQUE]
+            h.update(bloque)
+            partes = (resto + bloque).split(b'\n')
+            resto = partes.pop()
+            for parte in partes:
+                yield parte.decode(_ENCODING_TRANSPARENTE) + '\n'
+        if resto:
+            yield resto.decode(_ENCODING_TRANSPARENTE)
+
+    flujo = lineas()
+    lector = csv.reader(flujo, delimiter=separador, strict=True)
+    cache_fechas = {}
+    fuera_de_rango = ilegibles = 0
+    try:
+        resultado.encabezado = next(lector, [])
+        indice = None
+        if columna_fecha:
+            columnas = [_normalizar_columna(c) for c in resultado.encabezado]
+            objetivo = _normalizar_columna(columna_fecha)
+            indice = columnas.index(objetivo) if objetivo in columnas else None
+            if indice is None:
+                resultado.errores.append(f"El CSV no tiene la columna de fecha '{columna_fecha}'")
+
+        for fila in lector:
+            if not fila:
+                continue
+            resultado.filas += 1
+            if indice is None:
+                continue
+            valor = fila[indice] if indice < len(fila) else ''
+            if valor not in cache_fechas:
+                cache_fechas[valor] = parsear_fecha(valor, formato_fecha)
+            fecha = cache_fechas[valor]
+            if fecha is None:
+                ilegibles += 1
+                continue
+            resultado.fecha_min = fecha if resultado.fecha_min is None else min(resultado.fecha_min, fecha)
+            resultado.fecha_max = fecha if resultado.fecha_max is None else max(resultado.fecha_max, fecha)
+            if (desde and fecha < desde) or (hasta and fecha > hasta):
+                fuera_de_rango += 1
+    except csv.Error as e:
+        # strict=True: comillas sin cerrar al final = archivo cortado
+        for _ in flujo:
+            pass  # El hash cubre el archivo completo
+        resultado.errores.append(f"CSV incompleto o mal formado (fila {lector.line_num}): {e}")
+
+    resultado.hash = h.hexdigest()
+    if fuera_de_rango:
+        resultado.errores.append(f"{fuera_de_rango} filas fuera del rango pedido "
+                                 f"({desde} → {hasta}; el archivo tiene {resultado.fecha_min} → {resultado.fecha_max})")
+    if columna_fecha and resultado.filas and ilegibles == resultado.filas:
+        resultado.errores.append(f"Ninguna fecha legible en la columna '{columna_fecha}'")